@@ -0,0 +1,133 @@
+"""已结束任务的归档：超过一定天数的完成/取消任务移出任务列表，追加到压缩的归档文件
+
+归档文件由多个 gzip 段首尾相接组成，每次归档追加一段，每段内每行一条 JSON 记录；
+已有的完整段从不改写，追加前截掉上次崩溃时写了一半的段。读取时逐段解压、逐行产出，可以只读前面几页。
+"""
+import gzip
+import json
+import os
+import time
+import zlib
+
+from file_lock import FileLock
+
+ARCHIVE_SUFFIX = '.archive.jsonl.gz'
+ARCHIVE_ENV = "GLASS_MEMO_ARCHIVE_DAYS"
+DEFAULT_ARCHIVE_DAYS = 30
+DAY_SECONDS = 24 * 60 * 60
+READ_SIZE = 1 << 16  # 校验归档末尾时每次读取的字节数
+
+
+def archive_path(data_file):
+    """数据文件对应的归档文件路径"""
+    return os.path.splitext(data_file)[0] + ARCHIVE_SUFFIX
+
+
+def archive_days():
+    """已结束多少天后归档（环境变量 GLASS_MEMO_ARCHIVE_DAYS），0 或负数表示不归档"""
+    try:
+        return float(os.environ.get(ARCHIVE_ENV, DEFAULT_ARCHIVE_DAYS))
+    except ValueError:
+        print(f"{ARCHIVE_ENV} 不是数字，使用默认值 {DEFAULT_ARCHIVE_DAYS}")
+        return DEFAULT_ARCHIVE_DAYS
+
+
+def expired_tasks(store, days, now=None):
+    """返回结束时间早于 days 天前的任务（按显示顺序）；由存储按列或按索引筛选，不逐条解码全部任务"""
+    return store.expired_tasks((time.time() if now is None else now) - days * DAY_SECONDS)
+
+
+class TaskArchive:
+    """只追加的压缩归档文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = FileLock(path)
+        self._checked = 0  # 已确认由完整的段组成的文件前缀长度（总在段的边界上）
+
+    def append(self, tasks, now=None):
+        """把任务追加为新的一段并刷到磁盘；记录中带归档时间 archived_at"""
+        archived_at = int(time.time() if now is None else now)
+        lines = []
+        for task in tasks:
+            record = task.to_dict()
+            record['archived_at'] = archived_at
+            lines.append(json.dumps(record, ensure_ascii=False) + "\n")
+        data = gzip.compress("".join(lines).encode('utf-8'))
+        with self.lock:
+            self._repair_tail()
+            with open(self.path, 'ab') as f:
+                f.write(data)
+                f.flush()
+                os.fsync(f.fileno())
+                self._checked = f.tell()
+
+    def _repair_tail(self):
+        """截掉末尾不完整的段（追加时崩溃留下的），否则新段接在它后面，读取时从这里起全部无法解压
+
+        只校验上次确认之后的部分：本进程第一次追加时校验整个文件，之后只校验其他程序追加的段。
+        """
+        if not os.path.exists(self.path):
+            self._checked = 0
+            return
+        with open(self.path, 'r+b') as f:
+            size = f.seek(0, os.SEEK_END)
+            if size < self._checked:
+                self._checked = 0  # 文件被替换过，从头校验
+            end = self._complete_end(f, self._checked)
+            if end < size:
+                print(f"归档末尾有 {size - end} 字节不完整的数据，已截掉")
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+        self._checked = end
+
+    @staticmethod
+    def _complete_end(f, start):
+        """从 start（段的开头）起逐段解压校验，返回最后一个完整段的结尾位置"""
+        f.seek(start)
+        end = pos = start
+        decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        while True:
+            chunk = f.read(READ_SIZE)
+            if not chunk:
+                return end
+            while chunk:
+                try:
+                    decompressor.decompress(chunk)  # 只校验（含 CRC 和长度），不保留解压结果
+                except zlib.error:
+                    return end
+                if not decompressor.eof:
+                    pos += len(chunk)
+                    break
+                pos += len(chunk) - len(decompressor.unused_data)
+                end = pos
+                chunk = decompressor.unused_data
+                decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+
+    def __iter__(self):
+        """按归档顺序逐条产出记录字典；遇到写了一半的段（追加时崩溃，下次追加前截掉）时停止"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        yield json.loads(line)
+        except (EOFError, zlib.error, gzip.BadGzipFile, UnicodeDecodeError, ValueError) as e:
+            print(f"读取归档出错: {e}")
+
+
+def archive_expired(store, archive, days, now=None):
+    """把过期的已结束任务写入归档并从 store 中删除，返回归档的任务数
+
+    先写归档再删除：中途崩溃时任务最多在两处各有一份，不会丢失。
+    """
+    if days <= 0:
+        return 0
+    expired = expired_tasks(store, days, now)
+    if not expired:
+        return 0
+    archive.append(expired, now)
+    store.remove_many([store.row_of(task.id) for task in expired])
+    return len(expired)
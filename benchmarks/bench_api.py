@@ -0,0 +1,173 @@
+"""本机接口压力测试：并发发送大量添加、批量添加、修改和查询请求，统计吞吐量、延迟和界面卡顿
+
+对正在运行的窗口（GLASS_MEMO_API=1 python main.py）测试：
+    python benchmarks/bench_api.py [--port 8765]
+或启动一个使用临时数据文件的隐藏窗口并测试（同时报告界面线程最长的停顿）：
+    python benchmarks/bench_api.py --spawn [--tasks 50000]
+
+注意：对正在运行的窗口测试会真的加入任务。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STALL_TICK = 5  # 界面线程心跳间隔（毫秒），两次心跳的间隔减去它即为停顿
+STATUSES = ["todo", "complete", "cancel"]
+
+
+async def request(conn, method, path, payload=None):
+    """在长连接上发送一个请求，返回 (状态码, 响应 JSON)"""
+    reader, writer = conn
+    body = b'' if payload is None else json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\n"
+                 f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while (line := await reader.readline()) not in (b'\r\n', b''):
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    return status, json.loads(await reader.readexactly(length))
+
+
+async def run_phase(name, port, connections, make_requests):
+    """用 connections 个长连接并发发送 make_requests() 产出的 (方法, 路径, 请求体)，打印统计"""
+    pending = list(make_requests())
+    latencies, errors = [], 0
+    results = []
+
+    async def worker():
+        nonlocal errors
+        conn = await asyncio.open_connection('127.0.0.1', port)
+        while pending:
+            method, path, payload = pending.pop()
+            start = time.perf_counter()
+            status, data = await request(conn, method, path, payload)
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors += 1
+            results.append(data)
+        conn[1].close()
+
+    total = len(pending)
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(min(connections, total))))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"  {name:<6} {total:>6} 个请求 {elapsed:6.2f} s, {total / elapsed:8.0f} 请求/s, "
+          f"延迟中位 {latencies[total // 2] * 1000:7.1f} ms, p99 {latencies[int(total * 0.99)] * 1000:7.1f} ms, "
+          f"错误 {errors}")
+    return results
+
+
+async def load_test(args):
+    rng = random.Random(0)
+    added = await run_phase("add", args.port, args.connections, lambda: (
+        ("POST", "/tasks", {'text': f"告警 {i}"}) for i in range(args.requests)))
+    ids = [data['id'] for data in added if 'id' in data]
+    bulk = await run_phase("bulk", args.port, args.connections, lambda: (
+        ("POST", "/tasks/bulk", {'tasks': [{'text': f"工单 {i}-{j}"} for j in range(args.bulk_size)]})
+        for i in range(args.bulk)))
+    ids += [task_id for data in bulk for task_id in data.get('ids', ())]
+    await run_phase("patch", args.port, args.connections, lambda: (
+        ("PATCH", f"/tasks/{rng.choice(ids)}", {'status': rng.choice(STATUSES)})
+        for _ in range(args.requests)))
+    await run_phase("list", args.port, args.connections, lambda: (
+        ("GET", "/tasks?status=todo&limit=100", None) for _ in range(args.requests // 10)))
+
+
+def serve(port, data_file, tasks):
+    """--spawn 启动的子进程：隐藏窗口，定时报告界面线程最长的停顿"""
+    sys.path.insert(0, ROOT)
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    from main import GlassMemo
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump([{'text': f"任务 {i}", 'status': "todo"} for i in range(tasks)], f, ensure_ascii=False)
+    app = QApplication([])
+    window = GlassMemo(data_file, api=port)
+    window.show()
+    last = [time.perf_counter()]
+    worst = [0.0]
+
+    def tick():
+        now = time.perf_counter()
+        worst[0] = max(worst[0], now - last[0] - STALL_TICK / 1000)
+        last[0] = now
+
+    def report():
+        if not window.is_loading():
+            print(f"stall {worst[0] * 1000:.1f} {window.task_model.rowCount()}", flush=True)
+        worst[0] = 0.0
+
+    heartbeat = QTimer()
+    heartbeat.timeout.connect(tick)
+    heartbeat.start(STALL_TICK)
+    reporter = QTimer()
+    reporter.timeout.connect(report)
+    reporter.start(500)
+    sys.exit(app.exec())
+
+
+def spawn(args, data_file):
+    """启动隐藏窗口并等待载入完成，返回 (子进程, 停顿记录)"""
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    child = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(args.port),
+                              data_file, str(args.tasks)],
+                             stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True, env=env)
+    stalls = []
+    loaded = threading.Event()
+
+    def read():
+        for line in child.stdout:
+            if line.startswith("stall "):
+                stalls.append(float(line.split()[1]))
+                loaded.set()
+
+    threading.Thread(target=read, daemon=True).start()
+    if not loaded.wait(120):
+        child.kill()
+        raise SystemExit("隐藏窗口启动超时")
+    stalls.clear()
+    return child, stalls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--spawn', action='store_true', help="启动使用临时数据文件的隐藏窗口")
+    parser.add_argument('--tasks', type=int, default=50000, help="隐藏窗口初始的任务数")
+    parser.add_argument('--requests', type=int, default=10000, help="添加和修改请求各发送的数量")
+    parser.add_argument('--bulk', type=int, default=20, help="批量添加请求的数量")
+    parser.add_argument('--bulk-size', type=int, default=500, help="每个批量添加请求的任务数")
+    parser.add_argument('--connections', type=int, default=100, help="并发连接数")
+    parser.add_argument('--serve', nargs=3, metavar=('PORT', 'FILE', 'TASKS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.serve:
+        serve(int(args.serve[0]), args.serve[1], int(args.serve[2]))
+        return
+    if not args.spawn:
+        asyncio.run(load_test(args))
+        return
+    with tempfile.TemporaryDirectory() as tmp:
+        child, stalls = spawn(args, os.path.join(tmp, 'memo_data.json'))
+        try:
+            print(f"隐藏窗口: {args.tasks} 条任务，端口 {args.port}")
+            asyncio.run(load_test(args))
+            time.sleep(1)  # 等最后一次停顿报告
+            print(f"  界面线程最长停顿 {max(stalls, default=0):.1f} ms")
+        finally:
+            child.kill()
+            child.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""后台模式基准：窗口展开、折叠但列表仍连接模型（改动前的行为）、折叠并断开列表时，
+连续到达的修改（添加、改状态、删除）每条占用的 CPU，以及折叠后重新展开时一次性重建列表的耗时
+
+每条修改后处理一次事件，让视图完成它对这条修改的全部响应（布局、重绘）。
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_background.py [任务数] [修改条数]
+"""
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from task_store import STORAGE_ENV  # noqa: E402
+
+MODES = ["展开", "折叠但不断开", "折叠"]
+
+
+def cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def settle(app, window):
+    """处理事件直到折叠/展开动画结束"""
+    animation = getattr(window, "resize_animation", None)
+    while animation is not None and animation.state() == animation.State.Running:
+        app.processEvents()
+    for _ in range(5):
+        app.processEvents()
+
+
+def edit(window, rng, i):
+    """模拟一条外部修改：添加、改状态或删除"""
+    model = window.task_model
+    kind = i % 3
+    if kind == 0:
+        window.input_field.setText(f"新任务 {i}")
+        window.add_memo()
+    elif kind == 1:
+        window.change_status(model.task(rng.randrange(model.rowCount())).id, rng.choice(["complete", "todo"]))
+    else:
+        window.delete_item(model.task(rng.randrange(model.rowCount())).id)
+
+
+def bench(app, tmp, count, edits, mode):
+    from main import GlassMemo
+    data_file = os.path.join(tmp, f"memo_{MODES.index(mode)}.json")
+    with open(data_file, 'w', encoding='utf-8') as f:
+        json.dump([{'text': f"任务 {i}", 'status': "todo"} for i in range(count)], f, ensure_ascii=False)
+    window = GlassMemo(data_file)
+    window.fade_animation.stop()
+    window.setWindowOpacity(1)
+    window.show()
+    window.finish_loading()
+    settle(app, window)
+    if mode != "展开":
+        window.toggle_content()
+        settle(app, window)
+        if mode == "折叠但不断开":
+            window.attach_list(True)  # 模拟改动前：折叠后列表仍跟踪模型的每次修改
+
+    rng = random.Random(0)
+    start_cpu, start = cpu_time(), time.perf_counter()
+    for i in range(edits):
+        edit(window, rng, i)
+        app.processEvents()
+    cpu = (cpu_time() - start_cpu) / edits * 1e6
+    wall = (time.perf_counter() - start) / edits * 1e6
+    line = f"  {mode:<8} 每条修改 CPU {cpu:7.1f} us，耗时 {wall:7.1f} us"
+    if mode != "展开":
+        start = time.perf_counter()
+        window.toggle_content()
+        app.processEvents()  # 重新连接模型并绘制第一帧
+        line += f"；展开时重建列表 {(time.perf_counter() - start) * 1000:.1f} ms"
+        settle(app, window)
+    print(line)
+    window.save_scheduler.flush()
+    window.hide()
+    window.deleteLater()
+    app.processEvents()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    os.environ.setdefault(STORAGE_ENV, "journal")  # 保存只追加日志，避免整体写文件的耗时掩盖列表的开销
+    app = QApplication([])
+    print(f"任务数: {count}，修改 {edits} 条，存储模式 {os.environ[STORAGE_ENV]}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in MODES:
+            bench(app, tmp, count, edits, mode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""内存基准：TaskList 中每条任务的内存占用
+
+运行：python benchmarks/bench_memory.py [任务数]
+"""
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_list import TaskList  # noqa: E402
+
+STATUSES = ["todo", "complete", "cancel"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(0)
+    # 模拟从 JSON 读入：每条任务的文本和状态都是独立的字符串对象
+    raw = [{'text': f"9点和李总吃饭 {i}", 'status': "".join(rng.choice(STATUSES))}
+           for i in range(count)]
+    text_bytes = sum(sys.getsizeof(t['text']) for t in raw)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    tasks = TaskList(raw)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # TaskList 与原始数据共享文本字符串，这里统计的是文本之外的开销
+    overhead = (after - before) / count
+    print(f"任务数: {count}")
+    print(f"  每条任务记录开销（不含文本）: {overhead:.0f} 字节")
+    print(f"  每条任务文本: {text_bytes / count:.0f} 字节")
+    print(f"  合计: {overhead + text_bytes / count:.0f} 字节/条")
+    return tasks
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""增量排序基准：在 5 万条任务上单次修改状态的模型耗时
+
+运行：python benchmarks/bench_ordering.py [任务数]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_model import TaskListModel  # noqa: E402
+from task_store import JsonTaskStore  # noqa: E402
+
+STATUSES = ["todo", "complete", "cancel"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rounds = 1000
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'memo_data.json')
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump([{'text': f"任务 {i}", 'status': rng.choice(STATUSES)} for i in range(count)],
+                      f, ensure_ascii=False)
+        model = TaskListModel(JsonTaskStore(data_file))
+        model.load()
+
+    samples = []
+    for _ in range(rounds):
+        row = rng.randrange(count)
+        status = rng.choice(STATUSES)
+        start = time.perf_counter()
+        model.set_status(row, status)
+        samples.append(time.perf_counter() - start)
+
+    samples.sort()
+    print(f"任务数: {count}, 状态修改 {rounds} 次")
+    print(f"  平均: {sum(samples) / rounds * 1e6:.1f} µs")
+    print(f"  中位: {samples[rounds // 2] * 1e6:.1f} µs")
+    print(f"  p99:  {samples[int(rounds * 0.99)] * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
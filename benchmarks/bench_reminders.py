@@ -0,0 +1,55 @@
+"""提醒调度基准：不同数量的已安排提醒下，安排、改期、取消的单次耗时，以及空闲时的 CPU 占用
+
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_reminders.py [空闲测量秒数]
+"""
+import os
+import random
+import resource
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QCoreApplication, QTimer  # noqa: E402
+
+from reminder import ReminderScheduler  # noqa: E402
+
+SIZES = [10000, 100000, 1000000]
+OPS = 50000
+DAY = 86400
+
+
+def per_op(func, ops):
+    start = time.perf_counter()
+    for _ in range(ops):
+        func()
+    return (time.perf_counter() - start) / ops * 1e6
+
+
+def cpu_time():
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main():
+    idle_seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    app = QCoreApplication([])
+    rng = random.Random(0)
+    base = time.time() + DAY  # 都在一天以后，测量期间不会到期
+    scheduler = ReminderScheduler()
+    for size in SIZES:
+        scheduler.reset((i, base + rng.randrange(30 * DAY)) for i in range(size))
+        schedule = per_op(lambda: scheduler.schedule(size + rng.randrange(size), base + rng.randrange(30 * DAY)),
+                          OPS)
+        reschedule = per_op(lambda: scheduler.schedule(rng.randrange(size), base + rng.randrange(30 * DAY)), OPS)
+        cancel = per_op(lambda: scheduler.cancel(rng.randrange(2 * size)), OPS)
+        print(f"  {size:>8} 条提醒: 安排 {schedule:5.2f} us, 改期 {reschedule:5.2f} us, 取消 {cancel:5.2f} us")
+    # 最后一组（100 万条）保持安排状态，测量空闲时的 CPU 占用
+    start = cpu_time()
+    QTimer.singleShot(int(idle_seconds * 1000), app.quit)
+    app.exec()
+    print(f"  {len(scheduler)} 条提醒空闲 {idle_seconds:.0f} s: CPU {(cpu_time() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
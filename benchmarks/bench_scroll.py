@@ -0,0 +1,85 @@
+"""绘制帧时间基准：长列表逐步滚动、悬停按钮和折叠动画时每帧的重绘耗时，对比两种阴影渲染方式
+
+每一帧改变滚动位置（或悬停位置、窗口大小）后处理事件，计量重绘和提交到窗口缓冲的时间。
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_scroll.py [任务数]
+"""
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import QSize  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from glass import RENDER_ENV, RENDER_MODES  # noqa: E402
+from task_model import ROW_HEIGHT  # noqa: E402
+
+SCROLL_FRAMES = 300
+SCROLL_STEP = ROW_HEIGHT // 3  # 每帧滚动的像素（约 60 帧滚过 20 行）
+RESIZE_FRAMES = 30
+FRAME_BUDGET = 1000 / 60
+
+
+def frame(app, change):
+    """执行一帧的改动并处理重绘，返回耗时（毫秒）"""
+    start = time.perf_counter()
+    change()
+    app.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def summary(name, samples):
+    samples = sorted(samples)
+    slow = sum(1 for s in samples if s > FRAME_BUDGET)
+    print(f"    {name:<8} 中位 {statistics.median(samples):6.2f} ms, p95 {samples[int(len(samples) * 0.95)]:6.2f} ms, "
+          f"最慢 {samples[-1]:6.2f} ms, 超过 16.7 ms 的帧 {slow}/{len(samples)}")
+
+
+def bench(app, data_file, mode):
+    os.environ[RENDER_ENV] = mode
+    from main import GlassMemo
+    window = GlassMemo(data_file)
+    window.fade_animation.stop()
+    window.setWindowOpacity(1)
+    window.show()
+    window.finish_loading()
+    for _ in range(10):
+        app.processEvents()
+    print(f"  {mode}:")
+
+    bar = window.memo_list.verticalScrollBar()
+    summary("滚动", [frame(app, lambda: bar.setValue(bar.value() + SCROLL_STEP)) for _ in range(SCROLL_FRAMES)])
+
+    # 悬停：在可见行的按钮之间移动，每帧只重绘两行的按钮区域
+    delegate = window.task_delegate
+    first = window.memo_list.indexAt(window.memo_list.viewport().rect().topLeft()).row()
+    keys = ["todo", "complete", "cancel", "delete"]
+    summary("悬停", [frame(app, lambda i=i: delegate._set_hover((first + i % 3, keys[i % 4])))
+                   for i in range(SCROLL_FRAMES)])
+
+    # 折叠动画：窗口高度从 800 逐帧缩到 60
+    heights = [800 - (800 - 60) * i // RESIZE_FRAMES for i in range(1, RESIZE_FRAMES + 1)]
+    summary("折叠", [frame(app, lambda h=h: window.resize(QSize(600, h))) for h in heights])
+    window.hide()
+    window.deleteLater()
+    app.processEvents()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    app = QApplication([])
+    print(f"任务数: {count}，每帧滚动 {SCROLL_STEP} 像素")
+    with tempfile.TemporaryDirectory() as tmp:
+        data_file = os.path.join(tmp, 'memo_data.json')
+        with open(data_file, 'w', encoding='utf-8') as f:
+            json.dump([{'text': f"任务 {i}", 'status': "todo"} for i in range(count)], f, ensure_ascii=False)
+        for mode in RENDER_MODES:
+            bench(app, data_file, mode)
+
+
+if __name__ == "__main__":
+    main()
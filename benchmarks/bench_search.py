@@ -0,0 +1,68 @@
+"""搜索基准：字符 n-gram 索引的建立耗时、内存和查询延迟
+
+查询耗时包括筛选统计（与界面输入搜索词时的工作相同），并与逐条比较文本对比。
+
+运行：python benchmarks/bench_search.py [任务数]
+"""
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from search_index import SearchIndex, matches  # noqa: E402
+from task_list import TaskList  # noqa: E402
+
+STATUSES = ["todo", "complete", "cancel"]
+PEOPLE = ["李总", "王经理", "张三", "小陈", "老刘", "Alice", "Bob"]
+ACTIONS = ["吃饭", "开会", "打电话给", "发邮件给", "review 代码", "交周报给", "约"]
+QUERIES = ["李", "吃饭", "李总吃饭", "9点", "review", "不存在的词"]
+
+
+def make_tasks(count, rng):
+    return [{'text': f"{rng.randint(1, 12)}点和{rng.choice(PEOPLE)}{rng.choice(ACTIONS)} #{i}",
+             'status': rng.choice(STATUSES)} for i in range(count)]
+
+
+def search(tasks, query):
+    """界面输入搜索词时的工作：查找匹配任务并只统计匹配项"""
+    found = tasks.search(query)
+    tasks.set_filter(lambda task: matches(query, task.text), found)
+    return found
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tasks = TaskList(make_tasks(count, random.Random(0)))
+
+    start = time.perf_counter()
+    tasks.search("李")  # 第一次搜索时建立索引
+    build = time.perf_counter() - start
+
+    tracemalloc.start()
+    SearchIndex((t, t.text) for t in tasks)
+    index_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"任务数: {count}")
+    print(f"  建立索引: {build * 1000:.0f} ms，{index_bytes / count:.0f} 字节/条")
+
+    for query in QUERIES:
+        start = time.perf_counter()
+        found = search(tasks, query)
+        indexed = time.perf_counter() - start
+        start = time.perf_counter()
+        scanned = [t for t in tasks if matches(query, t.text)]
+        scan = time.perf_counter() - start
+        assert found == scanned
+        print(f"  {query!r:>12}: {len(found):6d} 条  索引 {indexed * 1000:6.2f} ms  逐条比较 {scan * 1000:6.2f} ms")
+
+    start = time.perf_counter()
+    for i in range(1000):
+        tasks.remove(tasks.add(f"新任务 {i} 和李总吃饭"))
+    print(f"  增删一条任务（含索引更新）: {(time.perf_counter() - start) / 2000 * 1e6:.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""快照格式基准：同样的任务分别保存为 JSON 和二进制快照，比较打开、统计和读取第一屏的耗时
+
+不需要 Qt。运行：python benchmarks/bench_snapshot.py [--sizes 10000 100000 1000000]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_io import convert_snapshot  # noqa: E402
+from task_store import create_store  # noqa: E402
+
+SIZES = [10000, 100000, 1000000]
+STATUSES = ["todo", "complete", "cancel"]
+FIRST_SCREEN = 30  # 第一屏大约显示的行数
+
+
+def write_tasks(path, count):
+    rng = random.Random(count)
+    tasks = [{'id': i + 1, 'text': f"{rng.randint(1, 12)}点和李总吃饭 {i}", 'status': rng.choice(STATUSES)}
+             for i in range(count)]
+    tasks.sort(key=lambda t: t['status'] != "todo")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(tasks, f, ensure_ascii=False, indent=2)
+
+
+def open_store(data_file, mode):
+    """打开存储、统计各状态数量并读取第一屏，返回毫秒数"""
+    start = time.perf_counter()
+    store = create_store(data_file, mode)
+    store.load()
+    store.counts()
+    for row in range(min(FIRST_SCREEN, len(store))):
+        store[row].text
+    elapsed = (time.perf_counter() - start) * 1000
+    store.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.sizes:
+            data_file = os.path.join(tmp, f'memo_{count}.json')
+            write_tasks(data_file, count)
+            convert_snapshot(data_file, os.path.splitext(data_file)[0] + '.bin')
+            json_ms = open_store(data_file, "json")
+            binary_ms = open_store(data_file, "binary")
+            print(f"{count:>8} 条任务: JSON {json_ms:9.1f} ms, 二进制 {binary_ms:7.2f} ms, "
+                  f"文件 {os.path.getsize(data_file) >> 10} KB / "
+                  f"{os.path.getsize(os.path.splitext(data_file)[0] + '.bin') >> 10} KB")
+
+
+if __name__ == "__main__":
+    main()
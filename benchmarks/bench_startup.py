@@ -0,0 +1,51 @@
+"""启动基准：不同任务数下的首次绘制时间和全部载入时间
+
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_startup.py
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from main import GlassMemo  # noqa: E402
+
+SIZES = [1000, 10000, 100000]
+STATUSES = ["todo", "complete", "cancel"]
+
+
+def write_tasks(path, count):
+    rng = random.Random(count)
+    tasks = [{'text': f"任务 {i}", 'status': rng.choice(STATUSES)} for i in range(count)]
+    # 与程序保存的顺序一致：待办在前
+    tasks.sort(key=lambda t: t['status'] != "todo")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(tasks, f, ensure_ascii=False, indent=2)
+
+
+def main():
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in SIZES:
+            data_file = os.path.join(tmp, f'memo_{count}.json')
+            write_tasks(data_file, count)
+            window = GlassMemo(data_file)
+            window.show()
+            while window.first_paint_time is None:
+                app.processEvents()
+            while window.is_loading():
+                app.processEvents()
+            print(f"{count:>7} 条任务: 首次绘制 {window.first_paint_time * 1000:7.1f} ms, "
+                  f"全部载入 {window.load_time * 1000:8.1f} ms")
+            window.save_scheduler.flush()
+            window.store.close()
+            window.deleteLater()
+            app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
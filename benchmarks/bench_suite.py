@@ -0,0 +1,247 @@
+"""基准测试套件：在 offscreen 平台上驱动 GlassMemo，测量各常用操作的耗时和内存峰值
+
+每种任务数在单独的子进程中测量，内存峰值只包含该任务数。结果保存为 JSON，
+并与 benchmarks/baseline.json 比较，任何一项明显变慢时以非零状态退出。
+耗时与机器有关，基线只能和生成它的机器比较：换机器后先用 --update-baseline 在本机生成基线；
+平台、Python、Qt 或 CPU 与基线不同时跳过比较。
+
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_suite.py
+      [--sizes 1000 10000 100000] [--storage json|journal|sqlite|binary]
+      [--output benchmarks/results.json] [--tolerance 0.5] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+try:
+    import resource
+except ImportError:  # Windows 没有 resource 模块
+    resource = None
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtCore import qVersion  # noqa: E402
+from PySide6.QtWidgets import QApplication, QMessageBox  # noqa: E402
+
+from main import GlassMemo  # noqa: E402
+from task_store import STORAGE_MODES  # noqa: E402
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+BASELINE_FILE = os.path.join(BENCH_DIR, 'baseline.json')
+RESULTS_FILE = os.path.join(BENCH_DIR, 'results.json')
+SIZES = [1000, 10000, 100000]
+STATUSES = ["todo", "complete", "cancel"]
+REPEAT = 200       # 单条操作的重复次数
+SLOW_REPEAT = 3    # 整体操作（排序、保存）的重复次数
+MIN_REGRESSION_MS = 0.05  # 低于此差值视为计时误差
+ENVIRONMENT_KEYS = ('platform', 'python', 'qt', 'machine')  # 与基线不同时耗时不可比
+
+
+def write_tasks(path, count):
+    rng = random.Random(count)
+    tasks = [{'text': f"{rng.randint(1, 12)}点和李总吃饭 {i}", 'status': rng.choice(STATUSES)}
+             for i in range(count)]
+    tasks.sort(key=lambda t: t['status'] != "todo")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(tasks, f, ensure_ascii=False, indent=2)
+
+
+def peak_rss_mb():
+    """本进程的内存峰值（MB），无法获取时返回 None"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return round(peak / (1 << 20) if sys.platform == "darwin" else peak / 1024, 1)
+
+
+def median_ms(samples):
+    return round(statistics.median(samples) * 1000, 4)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def bench_size(app, tmp, count, rng):
+    """在 count 条任务上依次测量各项操作，返回 {指标: 毫秒}"""
+    data_file = os.path.join(tmp, f'memo_{count}.json')
+    write_tasks(data_file, count)
+    results = {}
+
+    window = GlassMemo(data_file)
+    window.show()
+    while window.first_paint_time is None:
+        app.processEvents()
+    while window.is_loading():
+        app.processEvents()
+    results['load_first_paint_ms'] = round(window.first_paint_time * 1000, 4)
+    results['load_data_ms'] = round(window.load_time * 1000, 4)
+
+    results['update_stats_ms'] = median_ms([timed(window.update_stats) for _ in range(REPEAT)])
+
+    samples = []
+    for i in range(REPEAT):
+        window.input_field.setText(f"新任务 {i}")
+        samples.append(timed(window.add_memo))
+    results['add_memo_ms'] = median_ms(samples)
+
+    model = window.task_model
+    samples = [timed(window.change_status, model.task(rng.randrange(model.rowCount())).id,
+                     rng.choice(STATUSES))
+               for _ in range(REPEAT)]
+    results['change_status_ms'] = median_ms(samples)
+
+    samples = [timed(window.delete_item, model.task(rng.randrange(model.rowCount())).id)
+               for _ in range(REPEAT)]
+    results['delete_item_ms'] = median_ms(samples)
+    app.processEvents()
+
+    # 批量操作：一次处理 REPEAT 条任务
+    rows = sorted(rng.sample(range(model.rowCount()), min(REPEAT, model.rowCount())))
+    results['batch_status_ms'] = round(
+        timed(window._run_batch, model.set_status_many, rows, "complete") * 1000, 4)
+    rows = sorted(rng.sample(range(model.rowCount()), min(REPEAT, model.rowCount())))
+    results['batch_delete_ms'] = round(timed(window._run_batch, model.remove_many, rows) * 1000, 4)
+
+    results['sort_memos_ms'] = median_ms([timed(window.sort_memos) for _ in range(SLOW_REPEAT)])
+
+    # 保存：调度一次并等待后台写入完成
+    samples = []
+    for _ in range(SLOW_REPEAT):
+        window.save_scheduler.flush()
+        window.change_status(model.task(0).id, rng.choice(STATUSES))
+        start = time.perf_counter()
+        window.save_data()
+        window.save_scheduler.flush()
+        samples.append(time.perf_counter() - start)
+    results['save_data_ms'] = median_ms(samples)
+
+    # clear_all 会弹出确认框，这里直接确认
+    question = QMessageBox.question
+    QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.Yes)
+    try:
+        results['clear_all_ms'] = round(timed(window.clear_all) * 1000, 4)
+    finally:
+        QMessageBox.question = question
+
+    window.save_scheduler.flush()
+    window.store.close()
+    window.deleteLater()
+    app.processEvents()
+    results['peak_rss_mb'] = peak_rss_mb()
+    return results
+
+
+def run_size(count, storage):
+    """在子进程中测量 count 条任务，返回 {指标: 毫秒}；ru_maxrss 只增不减，同一进程中无法分别得到各任务数的峰值"""
+    with tempfile.TemporaryDirectory() as tmp:
+        output = os.path.join(tmp, 'result.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), '--storage', storage,
+                        '--child', str(count), output], check=True)
+        with open(output, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def run_child(count, output):
+    """子进程：测量一种任务数，把结果写入 output"""
+    app = QApplication.instance() or QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = bench_size(app, tmp, count, random.Random(count))
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f)
+
+
+def machine():
+    """CPU 架构、型号和核数，与平台、Python、Qt 版本一起判断基线是否来自同一台机器"""
+    parts = (platform.machine(), platform.processor(), f"{os.cpu_count()} CPU")
+    return " ".join(part for part in parts if part)
+
+
+def compare(results, baseline, tolerance):
+    """与基线比较，返回变慢的项目列表 [(任务数, 指标, 基线, 当前)]"""
+    regressions = []
+    for size, metrics in baseline.get('results', {}).items():
+        current = results.get(size, {})
+        for name, base in metrics.items():
+            value = current.get(name)
+            if value is None or base is None:
+                continue
+            if value > base * (1 + tolerance) and value - base > MIN_REGRESSION_MS:
+                regressions.append((size, name, base, value))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="GlassMemo 基准测试套件")
+    parser.add_argument('--sizes', type=int, nargs='+', default=SIZES)
+    parser.add_argument('--storage', choices=STORAGE_MODES, default="json")
+    parser.add_argument('--output', default=RESULTS_FILE)
+    parser.add_argument('--baseline', default=BASELINE_FILE)
+    parser.add_argument('--tolerance', type=float, default=0.5, help="允许比基线慢的比例")
+    parser.add_argument('--update-baseline', action='store_true', help="用本次结果覆盖基线")
+    parser.add_argument('--child', nargs=2, metavar=('COUNT', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    os.environ["GLASS_MEMO_STORAGE"] = args.storage
+    if args.child:
+        run_child(int(args.child[0]), args.child[1])
+        return
+    results = {}
+    for count in args.sizes:
+        results[str(count)] = run_size(count, args.storage)
+        print(f"{count:>7} 条任务:")
+        for name, value in results[str(count)].items():
+            print(f"    {name:<22} {value}")
+
+    report = {
+        'python': platform.python_version(),
+        'qt': qVersion(),
+        'platform': platform.platform(),
+        'machine': machine(),
+        'storage': args.storage,
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存到 {args.output}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"基线已更新: {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print("没有基线，跳过比较（可用 --update-baseline 生成）")
+        return
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get('storage', "json") != args.storage:
+        print(f"基线的存储模式为 {baseline.get('storage')}，跳过比较")
+        return
+    different = [key for key in ENVIRONMENT_KEYS if baseline.get(key) != report[key]]
+    if different:
+        for key in different:
+            print(f"基线的 {key} 为 {baseline.get(key)}，本机为 {report[key]}")
+        print("基线来自其他机器或环境，耗时不可比，跳过比较（可用 --update-baseline 在本机生成基线）")
+        return
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n性能回归（比基线慢 {args.tolerance:.0%} 以上）:")
+        for size, name, base, value in regressions:
+            print(f"    {size:>7} 条 {name:<22} 基线 {base:>10}  当前 {value:>10}  ({value / base:.1f}x)")
+        sys.exit(1)
+    print("与基线相比没有性能回归")
+
+
+if __name__ == "__main__":
+    main()
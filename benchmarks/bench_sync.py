@@ -0,0 +1,54 @@
+"""多实例同步基准：两个存储打开同一数据文件，一方修改一条任务并保存，测量另一方合并的耗时
+
+不需要 Qt。运行：python benchmarks/bench_sync.py [任务数]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from task_store import STORAGE_MODES, create_store  # noqa: E402
+
+STATUSES = ["todo", "complete", "cancel"]
+ROUNDS = 20
+
+
+def bench(data_file, mode, count, rng):
+    mine, theirs = create_store(data_file, mode), create_store(data_file, mode)
+    mine.load()
+    theirs.load()
+    samples = []
+    for _ in range(ROUNDS):
+        row = theirs.row_of(rng.randrange(1, count + 1))
+        if row is not None:
+            theirs.set_status(row, rng.choice(STATUSES))
+        theirs.save()
+        start = time.perf_counter()
+        mine.sync()
+        samples.append(time.perf_counter() - start)
+    mine.close()
+    theirs.close()
+    samples.sort()
+    return samples
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    rng = random.Random(0)
+    print(f"任务数: {count}, 对方修改一条后合并 {ROUNDS} 次")
+    for mode in STORAGE_MODES:
+        with tempfile.TemporaryDirectory() as tmp:
+            data_file = os.path.join(tmp, 'memo_data.json')
+            with open(data_file, 'w', encoding='utf-8') as f:
+                json.dump([{'text': f"任务 {i}", 'status': rng.choice(STATUSES)} for i in range(count)],
+                          f, ensure_ascii=False)
+            samples = bench(data_file, mode, count, rng)
+        print(f"  {mode:<8} 中位 {samples[ROUNDS // 2] * 1000:8.2f} ms, 最慢 {samples[-1] * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""样式基准：逐控件 setStyleSheet 与共享样式表 + 动态属性的对比
+
+对比对象是旧版 TaskItemWidget 的行控件写法：
+- 之前：每个控件各自 setStyleSheet，切换状态时重新 setStyleSheet
+- 之后：窗口共用一份样式表，切换状态只改动态属性并 unpolish/polish
+- 委托：当前界面的做法，任务行由 TaskItemDelegate 绘制，不创建行控件
+
+运行：QT_QPA_PLATFORM=offscreen python benchmarks/bench_theme.py [行数]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PySide6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,  # noqa: E402
+                               QLineEdit, QPushButton, QLabel, QTableView)
+
+from task_model import TaskListModel, TaskItemDelegate, ROW_HEIGHT  # noqa: E402
+from task_store import JsonTaskStore  # noqa: E402
+from theme import set_style_property  # noqa: E402
+
+STATUSES = ["todo", "complete", "cancel"]
+STATUS_BACKGROUNDS = {
+    "todo": "rgba(255, 255, 0, 0.2)",
+    "complete": "rgba(0, 255, 0, 0.2)",
+    "cancel": "rgba(255, 0, 0, 0.2)",
+}
+TEXT_STYLE = """
+    QLineEdit {
+        border: none;
+        background: %s;
+        font-size: 18px;
+        padding: 5px;
+        margin-bottom: 10px;
+        border-radius: 5px;
+        color: white;
+    }
+"""
+BUTTON_STYLE = """
+    QPushButton { background: transparent; color: white; border: none; }
+    QPushButton:hover { background: rgba(255, 255, 255, 0.1); border-radius: 5px; }
+    QPushButton:pressed { background: rgba(255, 255, 255, 0.2); }
+"""
+SHARED_STYLESHEET = "".join(
+    f'#rowText[status="{status}"] {{ border: none; background: {background}; font-size: 18px;'
+    f' padding: 5px; margin-bottom: 10px; border-radius: 5px; color: white; }}\n'
+    for status, background in STATUS_BACKGROUNDS.items()) + BUTTON_STYLE.replace(
+        "QPushButton", "#rowButton")
+
+
+class InlineRow(QWidget):
+    """之前：每个控件单独设置样式表"""
+
+    def __init__(self, text):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        self.text_label = QLineEdit(text)
+        buttons = QHBoxLayout()
+        for label in ("代办", "完成", "取消", "删除"):
+            button = QPushButton(label)
+            button.setStyleSheet(BUTTON_STYLE)
+            buttons.addWidget(button)
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet("background: transparent; color: white;")
+        buttons.addWidget(self.status_label)
+        layout.addWidget(self.text_label)
+        layout.addLayout(buttons)
+        self.set_status("todo")
+
+    def set_status(self, status):
+        self.text_label.setStyleSheet(TEXT_STYLE % STATUS_BACKGROUNDS[status])
+        self.status_label.setText(status)
+
+
+class ThemedRow(QWidget):
+    """之后：只设置 objectName 和动态属性"""
+
+    def __init__(self, text):
+        super().__init__()
+        layout = QVBoxLayout(self)
+        self.text_label = QLineEdit(text)
+        self.text_label.setObjectName("rowText")
+        buttons = QHBoxLayout()
+        for label in ("代办", "完成", "取消", "删除"):
+            button = QPushButton(label)
+            button.setObjectName("rowButton")
+            buttons.addWidget(button)
+        self.status_label = QLabel()
+        buttons.addWidget(self.status_label)
+        layout.addWidget(self.text_label)
+        layout.addLayout(buttons)
+        self.text_label.setProperty("status", "todo")
+
+    def set_status(self, status):
+        set_style_property(self.text_label, "status", status)
+        self.status_label.setText(status)
+
+
+def run(app, row_class, count, stylesheet=""):
+    container = QWidget()
+    container.setStyleSheet(stylesheet)
+    layout = QVBoxLayout(container)
+    start = time.perf_counter()
+    rows = []
+    for i in range(count):
+        row = row_class(f"任务 {i}")
+        layout.addWidget(row)
+        rows.append(row)
+    container.show()
+    app.processEvents()
+    create = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i, row in enumerate(rows):
+        row.set_status(STATUSES[(i % 2) + 1])
+    app.processEvents()
+    toggle = time.perf_counter() - start
+    container.close()
+    container.deleteLater()
+    app.processEvents()
+    return create, toggle
+
+
+def run_delegate(app, count):
+    store = JsonTaskStore(os.devnull)
+    view = QTableView()
+    view.horizontalHeader().hide()
+    view.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+    model = TaskListModel(store)
+    view.setModel(model)
+    view.setItemDelegate(TaskItemDelegate(view))
+    start = time.perf_counter()
+    for i in range(count):
+        model.add_task(f"任务 {i}")
+    view.show()
+    app.processEvents()
+    create = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(count):
+        model.set_status(0, "complete")
+    app.processEvents()
+    toggle = time.perf_counter() - start
+    view.close()
+    return create, toggle
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = QApplication.instance() or QApplication(sys.argv)
+    before = run(app, InlineRow, count)
+    after = run(app, ThemedRow, count, SHARED_STYLESHEET)
+    delegate = run_delegate(app, count)
+    print(f"{count} 行")
+    for name, index in (("创建行", 0), ("切换状态", 1)):
+        print(f"  {name:<6}  之前 {before[index] / count * 1e6:8.1f} µs/行"
+              f"   之后 {after[index] / count * 1e6:8.1f} µs/行"
+              f"   委托 {delegate[index] / count * 1e6:8.1f} µs/行")
+
+
+if __name__ == "__main__":
+    main()
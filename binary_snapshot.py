@@ -0,0 +1,280 @@
+"""二进制快照：与 memo_data.json 内容相同的紧凑格式，通过 mmap 打开，只解码用到的行
+
+文件布局（小端，各段按 8 字节对齐，行号即显示顺序）：
+    文件头      魔数、版本、任务数、待办数、日志序号
+    偏移表      (任务数 + 1) 个 uint64，第 i 条任务的文本为 文本区[偏移[i]:偏移[i+1]]
+    id 列       int64
+    顺序键列    float64
+    完成时间列  int64（NO_TIME 表示没有）
+    提醒时间列  int64（NO_TIME 表示没有；版本 1 没有这一列）
+    id 排序表   uint32 行号，按 id 升序排列，用于按 id 二分查找
+    状态列      uint8，STATUSES 中的下标
+    文本区      UTF-8 文本首尾相接
+
+打开 100 万条任务的快照只需映射文件；统计各状态数量只扫描状态列，不解码文本。
+"""
+import bisect
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+
+from search_index import SearchIndex, matches
+from task_list import FINISHED_STATUSES, STATUSES, StatusCounter, Task, TaskCounts
+
+MAGIC = b'GMEMOBIN'
+VERSION = 2
+NO_TIME = -(1 << 63)
+_HEADER = struct.Struct('<8sIIIIq')  # 魔数、版本、保留、任务数、待办数、日志序号
+_STATUS_CODES = {status: i for i, status in enumerate(STATUSES)}
+
+
+def _align(n):
+    return (n + 7) & ~7
+
+
+def _layout(count, version=VERSION):
+    """各段的起始位置：(偏移表, id, 顺序键, 完成时间, 提醒时间, id 排序表, 状态, 文本区)；
+    版本 1 没有提醒时间列，其位置为 None
+    """
+    offsets = _HEADER.size
+    ids = offsets + 8 * (count + 1)
+    orders = ids + 8 * count
+    done = orders + 8 * count
+    due = done + 8 * count if version >= 2 else None
+    by_id = (done if due is None else due) + 8 * count
+    statuses = _align(by_id + 4 * count)
+    texts = _align(statuses + count)
+    return offsets, ids, orders, done, due, by_id, statuses, texts
+
+
+def is_binary_snapshot(path):
+    """文件是否为二进制快照（按魔数判断）"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def write_binary_temp(path, tasks, seq=0):
+    """把任务字典（按显示顺序，带 id 和 order）写成二进制快照并刷到 path 旁边的临时文件，
+    返回临时文件路径；调用方再用 os.replace 替换原文件。
+    """
+    offsets, ids, orders, done, due = array('Q', [0]), array('q'), array('d'), array('q'), array('q')
+    statuses = bytearray()
+    blobs = []
+    size = todo = 0
+    for task in tasks:
+        blob = task['text'].encode('utf-8')
+        blobs.append(blob)
+        size += len(blob)
+        offsets.append(size)
+        ids.append(task['id'])
+        orders.append(task['order'])
+        done_at = task.get('done_at')
+        done.append(NO_TIME if done_at is None else done_at)
+        due_at = task.get('due_at')
+        due.append(NO_TIME if due_at is None else due_at)
+        statuses.append(_STATUS_CODES[task['status']])
+        if task['status'] not in FINISHED_STATUSES:
+            todo += 1
+    count = len(ids)
+    by_id = array('I', sorted(range(count), key=ids.__getitem__))
+    columns = (offsets, ids, orders, done, due, by_id)
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+    starts = _layout(count)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, 0, count, todo, seq))
+        for start, column in zip(starts, columns + (statuses,)):
+            f.write(b'\0' * (start - f.tell()))
+            f.write(column)
+        f.write(b'\0' * (starts[-1] - f.tell()))
+        for blob in blobs:
+            f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+class _Column:
+    """映射文件中的定宽数值列，按下标解码，可直接用于 bisect"""
+
+    def __init__(self, buf, start, fmt, length):
+        self._buf = buf
+        self._start = start
+        self._unpack = struct.Struct('<' + fmt).unpack_from
+        self._width = struct.calcsize(fmt)
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def __getitem__(self, i):
+        return self._unpack(self._buf, self._start + i * self._width)[0]
+
+
+class BinarySnapshot:
+    """只读地映射二进制快照，提供与 TaskList 相同的读取接口（按行取任务、统计、按 id 查找、搜索）"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, _, count, todo, self.seq = _HEADER.unpack_from(self._mm)
+        if magic != MAGIC or version not in (1, VERSION):
+            self._mm.close()
+            raise ValueError(f"不是可识别的二进制快照: {path}")
+        self._count = count
+        self._todo = todo
+        self._layout = _layout(count, version)
+        offsets, ids, orders, done, due, by_id, self._statuses, self._texts = self._layout
+        self._offsets = _Column(self._mm, offsets, 'Q', count + 1)
+        self._ids = _Column(self._mm, ids, 'q', count)
+        self._orders = _Column(self._mm, orders, 'd', count)
+        self._done = _Column(self._mm, done, 'q', count)
+        self._due = None if due is None else _Column(self._mm, due, 'q', count)
+        self._by_id = _Column(self._mm, by_id, 'I', count)
+        self._counts = TaskCounts()
+        self._counts.reset((), self._status_counter())
+        self._index = None  # 行号的文本索引，第一次搜索时才建立
+
+    def close(self):
+        self._mm.close()
+
+    def _status_counter(self):
+        """只扫描状态列统计各状态数量"""
+        column = self._mm[self._statuses:self._statuses + self._count]
+        counter = StatusCounter()
+        for code, status in enumerate(STATUSES):
+            counter.add(status, column.count(code))
+        return counter
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        if not 0 <= row < self._count:
+            raise IndexError(row)
+        return Task(self._text(row), STATUSES[self._mm[self._statuses + row]],
+                    self._order(row), self._ids[row], self._done_at(row), self._due_at(row))
+
+    def __iter__(self):
+        """按行产出全部任务；整列解码，比逐行取任务快"""
+        offsets, ids, orders, done, due, _, statuses, texts = self._layout
+        offsets = self._unpack(offsets, 'Q', self._count + 1)
+        blob = self._mm[texts:texts + offsets[-1]]
+        due = [NO_TIME] * self._count if due is None else self._unpack(due, 'q', self._count)
+        for i, (task_id, order, done_at, due_at, code) in enumerate(zip(
+                self._unpack(ids, 'q', self._count), self._unpack(orders, 'd', self._count),
+                self._unpack(done, 'q', self._count), due, self._mm[statuses:statuses + self._count])):
+            yield Task(blob[offsets[i]:offsets[i + 1]].decode('utf-8'), STATUSES[code],
+                       int(order) if order.is_integer() else order, task_id,
+                       None if done_at == NO_TIME else done_at, None if due_at == NO_TIME else due_at)
+
+    def _unpack(self, start, fmt, length):
+        """整列解码为数组"""
+        column = array(fmt)
+        column.frombytes(self._mm[start:start + column.itemsize * length])
+        if sys.byteorder != 'little':
+            column.byteswap()
+        return column
+
+    def _text(self, row):
+        start = self._texts + self._offsets[row]
+        return self._mm[start:self._texts + self._offsets[row + 1]].decode('utf-8')
+
+    def _order(self, row):
+        order = self._orders[row]
+        return int(order) if order.is_integer() else order  # 整数键原样还原
+
+    def _done_at(self, row):
+        done_at = self._done[row]
+        return None if done_at == NO_TIME else done_at
+
+    def _due_at(self, row):
+        if self._due is None:
+            return None
+        due_at = self._due[row]
+        return None if due_at == NO_TIME else due_at
+
+    def position(self, status, order, task_id=None):
+        """在所在分组的顺序键列上二分查找；顺序键相同时再比较 id 列"""
+        lo, hi = (self._todo, self._count) if status in FINISHED_STATUSES else (0, self._todo)
+        if task_id is None:
+            return bisect.bisect_left(self._orders, order, lo, hi)
+        return bisect.bisect_left(range(self._count), (order, task_id), lo, hi,
+                                  key=lambda row: (self._orders[row], self._ids[row]))
+
+    def move_target(self, row, status):
+        """该行改为 status 后应处的行号（按删除该行后的列表计算）"""
+        target = self.position(status, self._order(row), self._ids[row])
+        return target - 1 if target > row else target
+
+    def row_of(self, task_id):
+        i = bisect.bisect_left(self._by_id, task_id, key=self._ids.__getitem__)
+        if i < self._count and self._ids[self._by_id[i]] == task_id:
+            return self._by_id[i]
+        return None
+
+    def get(self, task_id):
+        row = self.row_of(task_id)
+        return None if row is None else self[row]
+
+    def counts(self, filtered=False):
+        return self._counts.counts(filtered)
+
+    def set_filter(self, predicate, matched=None):
+        self._counts.set_filter(predicate, self if matched is None else matched)
+
+    def prepare_search(self, limit=None):
+        if self._index is None:
+            self._index = SearchIndex(((row, self._text(row)) for row in range(self._count)), build=False)
+        return self._index.build(limit)
+
+    def search(self, query):
+        self.prepare_search()
+        candidates, exact = self._index.candidates(query)
+        found = [self[row] for row in sorted(candidates)]
+        if exact:
+            return found
+        return [t for t in found if matches(query, t.text)]
+
+    def due_tasks(self):
+        """有提醒时间的待办任务 [(id, 提醒时间)]；只解码提醒时间列，不解码文本"""
+        if self._due is None:
+            return []
+        _, _, _, _, due, _, statuses, _ = self._layout
+        finished = {_STATUS_CODES[status] for status in FINISHED_STATUSES}
+        codes = self._mm[statuses:statuses + self._count]
+        return [(self._ids[row], due_at) for row, due_at in enumerate(self._unpack(due, 'q', self._count))
+                if due_at != NO_TIME and codes[row] not in finished]
+
+    def expired_tasks(self, cutoff):
+        """结束时间早于 cutoff 的已结束任务；只扫描已结束分组的数值列，文本只解码选中的行"""
+        start, count = self._todo, self._count - self._todo
+        offsets, ids, orders, done, due, _, statuses, texts = self._layout
+        done = self._unpack(done + 8 * start, 'q', count)
+        rows = [i for i, done_at in enumerate(done) if done_at != NO_TIME and done_at < cutoff]
+        if not rows:
+            return []
+        offsets = self._unpack(offsets + 8 * start, 'Q', count + 1)
+        ids = self._unpack(ids + 8 * start, 'q', count)
+        orders = self._unpack(orders + 8 * start, 'd', count)
+        due = [NO_TIME] * count if due is None else self._unpack(due + 8 * start, 'q', count)
+        codes = self._mm[statuses + start:statuses + start + count]
+        expired = []
+        for i in rows:
+            text = self._mm[texts + offsets[i]:texts + offsets[i + 1]].decode('utf-8')
+            order = orders[i]
+            expired.append(Task(text, STATUSES[codes[i]], int(order) if order.is_integer() else order,
+                                ids[i], done[i], None if due[i] == NO_TIME else due[i]))
+        return expired
+
+    def tasks(self):
+        return [t.to_dict() for t in self]
+
+    def snapshot(self):
+        return [t.to_dict(with_order=True) for t in self]
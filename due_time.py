@@ -0,0 +1,146 @@
+"""从任务文本中解析提醒时间（不依赖 Qt，命令行工具也可使用）
+
+识别的写法（可组合）：
+    日期    今天、明天、后天、大后天、今晚、明早、明晚、周三、下周一、星期五、5月20日、5月20号
+    时段    凌晨、早上、上午、中午、下午、傍晚、晚上（下午/晚上的 1~11 点加 12 小时）
+    时刻    9点、九点半、10点15、10点一刻、21:30、21：30
+
+只有时刻时取下一次到达该时刻（今天已过则为明天）；只有日期时在当天 DEFAULT_HOUR 点提醒。
+"""
+import re
+import time
+from datetime import datetime, timedelta
+
+DEFAULT_HOUR = 9  # 只写了日期时的提醒时刻
+DUE_AT_RANGE = (0, 4102444800)  # 接受的提醒、完成时间（Unix 秒）：1970 年到 2100 年
+_CN_DIGITS = {'零': 0, '〇': 0, '一': 1, '二': 2, '两': 2, '三': 3, '四': 4,
+              '五': 5, '六': 6, '七': 7, '八': 8, '九': 9}
+_WEEKDAYS = {'一': 0, '二': 1, '三': 2, '四': 3, '五': 4, '六': 5, '日': 6, '天': 6}
+_DAY_OFFSETS = {'今天': 0, '今早': 0, '今晚': 0, '明天': 1, '明早': 1, '明晚': 1, '后天': 2, '大后天': 3}
+_EVENING = ('下午', '傍晚', '晚上', '今晚', '明晚')
+
+_NUM = r'(?:\d{1,2}|[零〇一二两三四五六七八九十]{1,3})'
+_DAY = (r'(?:(?P<day>大后天|今天|今早|今晚|明天|明早|明晚|后天)'
+        r'|(?P<next>下)?(?:周|星期|礼拜)(?P<weekday>[一二三四五六日天])'
+        rf'|(?P<month>{_NUM})月(?P<mday>{_NUM})[日号])')
+_PERIOD = r'(?P<period>凌晨|早上|早晨|上午|中午|下午|傍晚|晚上)'
+_CLOCK = (rf'(?:(?P<hour>{_NUM})[点时](?:(?P<half>半)|(?P<quarter>[一三])刻|(?P<minute>{_NUM})分?)?'
+          r'|(?P<hh>\d{1,2})[:：](?P<mm>\d{2}))')
+_WITH_CLOCK = re.compile(rf'(?:{_DAY}\s*)?(?:{_PERIOD}\s*)?{_CLOCK}')
+_DAY_ONLY = re.compile(_DAY)
+
+
+def _number(text):
+    """阿拉伯数字或不超过两位的中文数字"""
+    if text.isdigit():
+        return int(text)
+    if '十' in text:
+        tens, _, ones = text.partition('十')
+        if len(tens) > 1 or len(ones) > 1:
+            return None
+        return (_CN_DIGITS[tens] if tens else 1) * 10 + (_CN_DIGITS[ones] if ones else 0)
+    return _CN_DIGITS[text] if len(text) == 1 else None
+
+
+def _clock(match):
+    """匹配中的 (时, 分)，不合法时返回 None"""
+    if match.group('hh') is not None:
+        hour, minute = int(match.group('hh')), int(match.group('mm'))
+    else:
+        hour = _number(match.group('hour'))
+        if match.group('half'):
+            minute = 30
+        elif match.group('quarter'):
+            minute = 15 if match.group('quarter') == '一' else 45
+        elif match.group('minute'):
+            minute = _number(match.group('minute'))
+        else:
+            minute = 0
+    if hour is None or minute is None:
+        return None
+    period = match.group('period') or match.group('day')
+    if period in _EVENING and hour < 12:
+        hour += 12
+    elif period == '中午' and hour < 6:  # 中午 1 点
+        hour += 12
+    if hour > 23 or minute > 59:
+        return None
+    return hour, minute
+
+
+def _date(match, now):
+    """匹配中的日期；没有写日期时返回 None"""
+    if match.group('day'):
+        return now.date() + timedelta(days=_DAY_OFFSETS[match.group('day')])
+    if match.group('weekday'):
+        ahead = (_WEEKDAYS[match.group('weekday')] - now.weekday()) % 7
+        if match.group('next'):
+            ahead += 7
+        return now.date() + timedelta(days=ahead)
+    if match.group('month'):
+        month, day = _number(match.group('month')), _number(match.group('mday'))
+        if month is None or day is None:
+            return None
+        try:
+            date = now.date().replace(month=month, day=day)
+            if date < now.date():  # 今年已过，指明年
+                date = date.replace(year=date.year + 1)
+        except ValueError:
+            return None
+        return date
+    return None
+
+
+def parse_due_time(text, now=None):
+    """从文本中解析提醒时间，返回 Unix 秒；没有可识别的时间时返回 None"""
+    now = datetime.fromtimestamp(time.time() if now is None else now)
+    match = _WITH_CLOCK.search(text)
+    if match is not None:
+        clock = _clock(match)
+        if clock is None:
+            return None
+        hour, minute = clock
+        date = _date(match, now)
+        if date is None and match.group('month'):
+            return None
+        due = datetime.combine(date or now.date(), datetime.min.time()).replace(hour=hour, minute=minute)
+        if date is None and due <= now:  # 只写了时刻且今天已过
+            due += timedelta(days=1)
+        return int(due.timestamp())
+    match = _DAY_ONLY.search(text)
+    if match is None:
+        return None
+    date = _date(match, now)
+    if date is None:
+        return None
+    return int(datetime.combine(date, datetime.min.time()).replace(hour=DEFAULT_HOUR).timestamp())
+
+
+def parse_timestamp(value, field="due_at"):
+    """接口、导入等外部输入中的时间：Unix 秒、可解析的时间文本或 None，返回 Unix 秒或 None；
+    无法识别或超出范围时抛出 ValueError
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        timestamp = parse_due_time(value)
+        if timestamp is None:
+            raise ValueError(f"无法识别的时间 {value!r}")
+        return timestamp
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{field} 应为 Unix 秒、时间文本或 null")
+    # 超出范围的时间无法显示和保存（NaN、Infinity 也在这里拒绝）
+    if not DUE_AT_RANGE[0] <= value <= DUE_AT_RANGE[1]:
+        raise ValueError(f"{field} 超出范围 {DUE_AT_RANGE[0]}～{DUE_AT_RANGE[1]}")
+    return int(value)
+
+
+def format_due_time(due_at, now=None):
+    """提醒时间的简短显示：今天只显示时刻，其余显示月日和时刻"""
+    due = datetime.fromtimestamp(due_at)
+    today = datetime.fromtimestamp(time.time() if now is None else now).date()
+    if due.date() == today:
+        return due.strftime("%H:%M")
+    if due.date() == today + timedelta(days=1):
+        return due.strftime("明天 %H:%M")
+    return f"{due.month}月{due.day}日 {due:%H:%M}"
@@ -0,0 +1,84 @@
+"""跨进程的数据文件锁：命令行和窗口程序写同一个 memo_data.json 时互斥
+
+锁加在旁边的 .lock 文件上（数据文件会被原子替换，不能直接锁它），
+进程退出时操作系统自动释放，不会留下失效的锁。
+"""
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows 没有 fcntl
+    fcntl = None
+    import msvcrt
+
+LOCK_SUFFIX = '.lock'
+LOCK_TIMEOUT = 10.0       # 等待其他进程释放锁的最长时间（秒）
+LOCK_POLL_INTERVAL = 0.01
+
+
+class LockTimeout(OSError):
+    """等待锁超时"""
+
+
+class FileLock:
+    """数据文件的排他锁，用作 with 语句；同一对象可在一个线程中重复进入，多个线程之间互斥"""
+
+    def __init__(self, data_path, timeout=LOCK_TIMEOUT):
+        self.path = data_path + LOCK_SUFFIX
+        self.timeout = timeout
+        self._fd = None
+        self._depth = 0
+        self._thread_lock = threading.RLock()  # flock 不区分同一进程内的线程
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        if self._depth:
+            self._depth += 1
+            return
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                _try_lock(fd)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    os.close(fd)
+                    self._thread_lock.release()
+                    raise LockTimeout(f"数据文件被其他程序占用: {self.path}")
+                time.sleep(LOCK_POLL_INTERVAL)
+        self._fd = fd
+        self._depth = 1
+
+    def release(self):
+        self._depth -= 1
+        if not self._depth:
+            _unlock(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _try_lock(fd):
+    """非阻塞地加锁，已被占用时抛出 OSError"""
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    else:
+        msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+
+
+def _unlock(fd):
+    if fcntl is not None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+    else:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
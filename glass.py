@@ -0,0 +1,172 @@
+"""玻璃窗口的阴影：预先渲染、缓存为位图，代替加在整个窗口上的 QGraphicsDropShadowEffect
+
+QGraphicsDropShadowEffect 加在中心控件上时，任何子控件重绘（按钮悬停、滚动列表、折叠动画的每一帧）
+都会让 Qt 把整个中心控件重新渲染到离屏缓冲并重新模糊。这里只在启动时模糊一次圆角矩形，
+切成九宫格；各面板的阴影按九宫格拼接到与窗口同大的缓存位图上，只在窗口大小或面板位置变化时重新拼接，
+子控件重绘时只复制缓存中对应的区域。
+
+环境变量 GLASS_MEMO_RENDER=effect 时仍使用 QGraphicsDropShadowEffect（用于对比）。
+"""
+import os
+
+from PySide6.QtCore import QEvent, QPoint, QRect, QRectF, Qt
+from PySide6.QtGui import QImage, QPainter, QPixmap, QRegion
+from PySide6.QtWidgets import QGraphicsBlurEffect, QGraphicsPixmapItem, QGraphicsScene, QWidget
+
+from theme import PANEL_RADIUS, SHADOW_BLUR, SHADOW_COLOR, SHADOW_OFFSET
+
+RENDER_ENV = "GLASS_MEMO_RENDER"
+RENDER_MODES = ("cached", "effect")
+
+
+def render_mode():
+    """阴影的渲染方式：cached（默认，缓存位图）或 effect（QGraphicsDropShadowEffect）"""
+    mode = os.environ.get(RENDER_ENV, "cached")
+    return mode if mode in RENDER_MODES else "cached"
+
+
+def _blur(image, radius):
+    """用 Qt 的模糊效果（与阴影效果相同的算法）模糊图像，只在生成九宫格时调用一次"""
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(image))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(radius)
+    effect.setBlurHints(QGraphicsBlurEffect.QualityHint)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+    result = QImage(image.size(), QImage.Format_ARGB32_Premultiplied)
+    result.fill(Qt.transparent)
+    painter = QPainter(result)
+    scene.render(painter, QRectF(result.rect()), QRectF(image.rect()))
+    painter.end()
+    return QPixmap.fromImage(result)
+
+
+class ShadowTiles:
+    """模糊过的圆角矩形阴影，按九宫格绘制到任意大小的矩形下方：四角原样复制，四边和中间拉伸
+
+    圆角矩形足够大，模糊后中间一格是均匀的颜色（color），面板内部可以直接用纯色填充。
+    """
+
+    def __init__(self, radius=PANEL_RADIUS, blur=SHADOW_BLUR, color=SHADOW_COLOR):
+        self.spread = blur  # 阴影超出面板边缘的距离
+        self.edge = 2 * blur + radius  # 九宫格每个角的边长：从阴影外缘到模糊不再变化的位置
+        size = 2 * self.edge + 2
+        image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+        image.fill(Qt.transparent)
+        painter = QPainter(image)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(color)
+        painter.drawRoundedRect(QRectF(blur, blur, size - 2 * blur, size - 2 * blur), radius, radius)
+        painter.end()
+        self.pixmap = _blur(image, blur / 2)  # 模糊效果的半径约是阴影效果的两倍宽，取一半与原来的阴影一致
+        self.color = self.pixmap.toImage().pixelColor(self.edge, self.edge)
+
+    def _segments(self, start, length):
+        """一个方向上的 (目标起点, 目标长度, 源起点, 源长度)；放不下两个角时只取两端的一部分，中间不拉伸"""
+        e, size = self.edge, self.pixmap.width()
+        if length >= 2 * e:
+            return [(start, e, 0, e), (start + e, length - 2 * e, e, size - 2 * e),
+                    (start + length - e, e, size - e, e)]
+        half = length // 2
+        return [(start, half, 0, half), (start + half, length - half, size - (length - half), length - half)]
+
+    def draw(self, painter, rect):
+        """在面板 rect 下方画出阴影，返回阴影的外框和颜色均匀的中间部分（面板太小时为 None）"""
+        outer = rect.adjusted(-self.spread, -self.spread, self.spread, self.spread)
+        if outer.isEmpty():
+            return outer, None
+        xs = self._segments(outer.left(), outer.width())
+        ys = self._segments(outer.top(), outer.height())
+        for x, w, sx, sw in xs:
+            for y, h, sy, sh in ys:
+                painter.drawPixmap(QRect(x, y, w, h), self.pixmap, QRect(sx, sy, sw, sh))
+        if len(xs) < 3 or len(ys) < 3:
+            return outer, None
+        e = self.edge
+        return outer, outer.adjusted(e, e, -e, -e)
+
+
+class GlassBackground(QWidget):
+    """窗口的中心控件：在各面板下方画出缓存的阴影
+
+    add_panels() 登记需要阴影的面板，watch() 登记移动时会带动面板的容器。
+    缓存位图只在控件大小、面板位置或可见性变化时重新拼接（不重新模糊），子控件重绘时只复制缓存；
+    面板内部阴影颜色均匀的区域（列表滚动时重绘的大部分）直接填充纯色，不混合位图。
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._panels = []
+        self._tiles = None  # 第一次绘制时生成
+        self._cache = None
+        self._interior = QRegion()  # 阴影颜色均匀、可以纯色填充的区域
+        self.cache_builds = 0  # 重新拼接缓存的次数
+
+    def add_panels(self, *widgets):
+        self._panels.extend(widgets)
+        self.watch(*widgets)
+
+    def watch(self, *widgets):
+        for widget in widgets:
+            widget.installEventFilter(self)
+        self.invalidate()
+
+    def invalidate(self):
+        """面板布局变化：丢弃缓存，下次绘制时重新拼接"""
+        if self._cache is not None:
+            self._cache = None
+            self.update()
+
+    def eventFilter(self, obj, event):
+        if event.type() in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide):
+            self.invalidate()
+        return False
+
+    def resizeEvent(self, event):
+        self._cache = None
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        if not self._panels:
+            return
+        if self._cache is None:
+            self._build_cache()
+        painter = QPainter(self)
+        region = event.region()
+        for rect in region.intersected(self._interior):
+            painter.fillRect(rect, self._tiles.color)
+        for rect in region.subtracted(self._interior):
+            painter.drawPixmap(rect, self._cache, self._device_rect(rect))
+
+    def _device_rect(self, rect):
+        ratio = self._cache.devicePixelRatio()
+        return QRect(round(rect.x() * ratio), round(rect.y() * ratio),
+                     round(rect.width() * ratio), round(rect.height() * ratio))
+
+    def _build_cache(self):
+        """把所有可见面板的阴影拼接到与控件同大的位图上，并计算可以纯色填充的区域"""
+        if self._tiles is None:
+            self._tiles = ShadowTiles()
+        ratio = self.devicePixelRatioF()
+        self._cache = QPixmap(self.size() * ratio)
+        self._cache.setDevicePixelRatio(ratio)
+        self._cache.fill(Qt.transparent)
+        painter = QPainter(self._cache)
+        shadows = []
+        for panel in self._panels:
+            if panel.isVisibleTo(self):
+                rect = QRect(panel.mapTo(self, QPoint(0, 0)), panel.size())
+                shadows.append(self._tiles.draw(painter, rect.translated(SHADOW_OFFSET)))
+        painter.end()
+        # 中间部分减去其他面板的阴影（相邻面板的阴影会伸进来叠加）
+        self._interior = QRegion()
+        for outer, inner in shadows:
+            if inner is not None:
+                part = QRegion(inner)
+                for other, _ in shadows:
+                    if other is not outer:
+                        part = part.subtracted(QRegion(other))
+                self._interior = self._interior.united(part)
+        self.cache_builds += 1
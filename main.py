@@ -1,18 +1,72 @@
 import sys
-import json
 import os
-from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QEvent, Signal, QSize
+import time
+from PySide6.QtCore import (Qt, QPropertyAnimation, QEasingCurve, QEvent, QFileSystemWatcher,
+                            QPoint, QSize, QTimer)
 from PySide6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout,
-                               QListWidget, QLineEdit, QPushButton, QHBoxLayout,
-                               QListWidgetItem, QMessageBox, QGraphicsDropShadowEffect, QLabel)
+                               QTableView, QListView, QHeaderView, QLineEdit, QPushButton,
+                               QHBoxLayout, QLabel, QAbstractItemView, QMessageBox, QInputDialog, QGraphicsDropShadowEffect,
+                               QMenu, QStyle, QSystemTrayIcon)
 from PySide6.QtGui import QColor, QPalette
 
+from archive import TaskArchive, archive_days, archive_path, expired_tasks
+from task_model import TaskListModel, ArchiveModel, TaskItemDelegate, ROW_HEIGHT
+from task_store import DATA_FILE, STORAGE_ENV, create_store
+from save_scheduler import SaveScheduler
+from theme import STYLESHEET, SHADOW_BLUR, SHADOW_COLOR, SHADOW_OFFSET, set_style_property
+from perf import Profiler, profiling_requested
+from memo_api import ApiBridge, api_port, apply_requests
+from due_time import format_due_time, parse_due_time
+from reminder import ReminderScheduler
+from glass import GlassBackground, render_mode
+
+# 启动时同步载入的任务数（第一屏），其余每批载入的任务数
+FIRST_SCREEN_SIZE = 50
+LOAD_BATCH_SIZE = 2000
+SEARCH_INDEX_BATCH = 500  # 搜索框获得焦点后每轮事件循环索引的任务数
+# 开启性能计时时包装的方法
+PROFILED_METHODS = ("load_data", "_load_next_batch", "update_stats", "save_data", "sort_memos",
+                    "change_status", "add_memo", "delete_item", "edit_item", "filter_memos",
+                    "_run_batch", "archive_finished", "sync_from_disk", "merge_from_disk", "run_api_requests",
+                    "show_reminders", "attach_list")
+PROFILED_MODEL_METHODS = ("append_batch", "add_task", "remove_task", "set_status", "set_text",
+                          "sort", "set_filter_text", "set_status_many", "remove_many", "row_of", "sync",
+                          "add_tasks", "update_ids", "set_due")
+PERF_REFRESH_INTERVAL = 500  # 性能浮层刷新间隔（毫秒）
+ARCHIVE_CHECK_INTERVAL = 60 * 60 * 1000  # 检查是否有需要归档的任务的间隔（毫秒）
+SYNC_DELAY = 100  # 数据文件变化后等待合并的时间，连续的变化只合并一次（毫秒）
+SYNC_POLL_INTERVAL = 2000  # 定时检查数据文件的间隔，网络文件系统上可能收不到变化通知（毫秒）
+REMINDER_MESSAGE_TIME = 10000  # 系统通知的显示时间（毫秒）
+REMINDER_PREVIEW = 3  # 提醒横幅和通知中列出的任务数
+
 class GlassMemo(QMainWindow):
-    def __init__(self):
+    def __init__(self, data_file=None, profile=None, api=None):
         super().__init__()
 
-        # 设置数据文件路径
-        self.data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memo_data.json')
+        # 设置数据文件路径（默认与程序同目录）
+        self.data_file = data_file or DATA_FILE
+
+        # 存储模式：json 每次修改整体保存；journal 只追加操作日志；sqlite 按需查询
+        self.storage_mode = os.environ.get(STORAGE_ENV, "json")
+        self.store = create_store(self.data_file, self.storage_mode)
+        # 修改后不立即写盘，由保存调度器合并后在后台线程写入
+        self.save_scheduler = SaveScheduler(self.store, parent=self)
+        # 结束超过一定天数的任务移到压缩归档文件，列表和统计只包含仍需关注的任务
+        self.archive = TaskArchive(archive_path(self.data_file))
+        self.showing_archive = False
+        # 带提醒时间的待办任务由一个最小堆和一个定时器调度，到期时通知并突出显示
+        self.reminders = ReminderScheduler(self)
+        self.reminders.reminders_due.connect(self.show_reminders)
+        self.due_ids = []  # 横幅中尚未查看的到期任务
+        self.tray_icon = None  # 系统通知，第一次提醒时才创建
+
+        # 性能计时（GLASS_MEMO_PROFILE=1 或 --profile）：包装热点方法，必须在连接信号之前进行
+        if profile is None:
+            profile = profiling_requested()
+        self.profiler = Profiler() if profile else None
+        self.perf_file = os.path.splitext(self.data_file)[0] + '.perf.json'
+        if self.profiler is not None:
+            self.profiler.instrument(self, PROFILED_METHODS)
 
         # 窗口基础设置
         self.setWindowTitle("Glass Memo")
@@ -22,7 +76,7 @@ class GlassMemo(QMainWindow):
         self.title_bar = QWidget()
         self.title_bar.setFixedHeight(40)
         self.title_bar.setCursor(Qt.OpenHandCursor)
-        self.title_bar.setStyleSheet("background: rgba(60, 60, 60, 0.5); border-radius: 10px;")
+        self.title_bar.setObjectName("titleBar")
         self.title_bar.installEventFilter(self)
 
         # 添加标题文字和任务统计
@@ -31,6 +85,7 @@ class GlassMemo(QMainWindow):
         
         # 左侧标题和统计信息容器
         left_container = QWidget()
+        left_container.setObjectName("titleLeft")
         left_layout = QHBoxLayout(left_container)
         left_layout.setContentsMargins(0, 0, 0, 0)
         left_layout.setSpacing(10)
@@ -51,61 +106,41 @@ class GlassMemo(QMainWindow):
         self.stats_label = QLineEdit("(待办:0 完成:0 取消:0)")
         self.stats_label.setReadOnly(True)
         self.stats_label.setFixedWidth(200)
-        self.stats_label.setStyleSheet("""
-            QLineEdit {
-                background: transparent;
-                border: none;
-                color: white;
-                font-size: 14px;
-                font-family: "Microsoft YaHei";
-            }
-        """)
+        self.stats_label.setObjectName("statsLabel")
 
         # 添加展开/折叠按钮
         self.toggle_btn = QPushButton("▼")  # 初始为展开状态
         self.toggle_btn.setFixedSize(30, 30)
-        self.toggle_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: white;
-                font-size: 16px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: rgba(100, 100, 100, 0.5);
-                border-radius: 15px;
-            }
-            QPushButton:pressed {
-                background: rgba(80, 80, 80, 0.7);
-            }
-        """)
+        self.toggle_btn.setObjectName("toggleButton")
         self.toggle_btn.clicked.connect(self.toggle_content)
 
+        # 性能浮层开关（仅在开启性能计时时显示）
+        self.perf_btn = QPushButton("⏱")
+        self.perf_btn.setFixedSize(30, 30)
+        self.perf_btn.setObjectName("perfButton")
+        self.perf_btn.setVisible(self.profiler is not None)
+        self.perf_btn.clicked.connect(self.toggle_perf_overlay)
+
+        # 归档视图开关
+        self.archive_btn = QPushButton("🗄")
+        self.archive_btn.setFixedSize(30, 30)
+        self.archive_btn.setObjectName("archiveButton")
+        self.archive_btn.setToolTip("查看归档")
+        self.archive_btn.clicked.connect(self.toggle_archive)
+
         # 关闭按钮
         close_btn = QPushButton("×")
         close_btn.setFixedSize(40, 40)
         close_btn.clicked.connect(self.close)
-        close_btn.setStyleSheet("""
-            QPushButton {
-                background: transparent;
-                color: white;
-                font-size: 24px;
-                border: none;
-            }
-            QPushButton:hover {
-                background: rgba(255, 80, 80, 0.7);
-                border-radius: 15px;
-            }
-            QPushButton:pressed {
-                background: rgba(255, 50, 50, 0.9);
-            }
-        """)
+        close_btn.setObjectName("closeButton")
         
         # left_layout.addWidget(title_label)
         left_layout.addWidget(self.stats_label)
         
         title_layout.addWidget(left_container)
         title_layout.addWidget(self.toggle_btn)
+        title_layout.addWidget(self.archive_btn)
+        title_layout.addWidget(self.perf_btn)
         title_layout.addStretch()
         title_layout.addWidget(close_btn)
 
@@ -113,8 +148,8 @@ class GlassMemo(QMainWindow):
         self.dragging = False
         self.offset = None
 
-        # 创建主控件
-        central_widget = QWidget()
+        # 创建主控件（同时绘制各面板的阴影）
+        central_widget = GlassBackground()
         self.setCentralWidget(central_widget)
 
         # 主布局
@@ -132,93 +167,126 @@ class GlassMemo(QMainWindow):
         self.input_field = QLineEdit()
         self.input_field.setPlaceholderText("输入备忘内容...")
         self.input_field.setMinimumHeight(40)
-        self.input_field.setStyleSheet("""
-            QLineEdit {
-                background: rgba(50, 50, 50, 0.7);
-                border: 1px solid rgba(255, 255, 255, 0.3);
-                border-radius: 10px;
-                color: white;
-                padding: 10px 15px;
-                font-size: 16px;
-            }
-            QLineEdit:placeholder {
-                color: rgba(255, 255, 255, 0.5);
-            }
-        """)
+        self.input_field.setObjectName("inputField")
         self.input_field.setFocus()  # 自动聚焦
         self.input_layout.addWidget(self.input_field)
 
+        # 搜索框：输入时即时筛选列表和统计
+        self.search_field = QLineEdit()
+        self.search_field.setPlaceholderText("搜索...")
+        self.search_field.setMinimumHeight(40)
+        self.search_field.setFixedWidth(130)
+        self.search_field.setClearButtonEnabled(True)
+        self.search_field.setObjectName("searchField")
+        self.input_layout.addWidget(self.search_field)
+
         self.add_btn = QPushButton("添加任务")
         self.add_btn.setFixedSize(100, 40)
-        self.add_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(80, 160, 80, 0.7);
-                border: none;
-                border-radius: 10px;
-                color: white;
-                font-size: 15px;
-            }
-            QPushButton:hover {
-                background: rgba(100, 180, 100, 0.8);
-            }
-            QPushButton:pressed {
-                background: rgba(60, 140, 60, 0.9);
-            }
-        """)
+        self.add_btn.setObjectName("addButton")
         self.input_layout.addWidget(self.add_btn)
 
         self.clear_btn = QPushButton("清空")
         self.clear_btn.setFixedSize(80, 40)
-        self.clear_btn.setStyleSheet("""
-            QPushButton {
-                background: rgba(200, 60, 60, 0.7);
-                border: none;
-                border-radius: 10px;
-                color: white;
-                font-size: 15px;
-            }
-            QPushButton:hover {
-                background: rgba(220, 70, 70, 0.8);
-            }
-            QPushButton:pressed {
-                background: rgba(180, 50, 50, 0.9);
-            }
-        """)
+        self.clear_btn.setObjectName("clearButton")
         self.input_layout.addWidget(self.clear_btn)
 
         # 将输入区域包装为 QWidget 以便控制可见性
         self.input_layout_widget = QWidget()
         self.input_layout_widget.setLayout(self.input_layout)
 
+        # 批量操作栏：选中任务（Ctrl/Shift 多选）或正在搜索时显示
+        self.batch_bar = QWidget()
+        self.batch_bar.setObjectName("batchBar")
+        batch_layout = QHBoxLayout(self.batch_bar)
+        batch_layout.setContentsMargins(10, 5, 10, 5)
+        batch_layout.setSpacing(8)
+        self.batch_label = QLabel()
+        self.batch_label.setObjectName("batchLabel")
+        batch_layout.addWidget(self.batch_label)
+        batch_layout.addStretch()
+        self.selection_buttons = []
+        for text, slot in (("完成所选", lambda: self.batch_set_status("complete")),
+                           ("取消所选", lambda: self.batch_set_status("cancel")),
+                           ("设为待办", lambda: self.batch_set_status("todo")),
+                           ("删除所选", self.batch_delete)):
+            button = QPushButton(text)
+            button.clicked.connect(slot)
+            batch_layout.addWidget(button)
+            self.selection_buttons.append(button)
+        self.complete_matching_btn = QPushButton("完成全部匹配项")
+        self.complete_matching_btn.clicked.connect(self.complete_matching)
+        batch_layout.addWidget(self.complete_matching_btn)
+        self.batch_bar.hide()
+
+        # 提醒横幅：有任务到期时显示，点击后定位到第一条到期任务
+        self.reminder_banner = QPushButton()
+        self.reminder_banner.setObjectName("reminderBanner")
+        self.reminder_banner.setCursor(Qt.PointingHandCursor)
+        self.reminder_banner.clicked.connect(self.open_reminder)
+        self.reminder_banner.hide()
+
         # 备忘录列表（展示项目）
-        self.memo_list = QListWidget()
-        self.memo_list.setAlternatingRowColors(True)
-        self.memo_list.setStyleSheet("""
-            QListWidget {
-                background: rgba(40, 40, 40, 0.8);
-                border: 1px solid rgba(255, 255, 255, 0.2);
-                border-radius: 12px;
-                color: white;
-                font-size: 16px;
-                padding: 10px;
-            }
-            QListWidget::item {
-                background: rgba(60, 60, 60, 0.7);
-                border-radius: 10px;
-                margin: 6px 2px;
-                padding: 5px;
-            }
-            QListWidget::item:hover {
-                background: rgba(70, 70, 70, 0.8);
-            }
-        """)
+        # 用单列表格代替 QListView：固定行高的表头按区间记录行，插入删除不会逐行重新布局
+        self.memo_list = QTableView()
+        self.memo_list.horizontalHeader().hide()
+        self.memo_list.horizontalHeader().setStretchLastSection(True)
+        self.memo_list.verticalHeader().hide()
+        self.memo_list.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.memo_list.verticalHeader().setDefaultSectionSize(ROW_HEIGHT)
+        self.memo_list.setShowGrid(False)
+        self.memo_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.memo_list.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.memo_list.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.memo_list.setSelectionBehavior(QAbstractItemView.SelectRows)
+        # 拖动任务调整顺序（只能在所在分组内移动，由模型完成移动）
         self.memo_list.setDragEnabled(True)
         self.memo_list.setAcceptDrops(True)
+        self.memo_list.setDragDropMode(QAbstractItemView.InternalMove)
         self.memo_list.setDefaultDropAction(Qt.MoveAction)
+        self.memo_list.setDragDropOverwriteMode(False)
+        self.memo_list.setDropIndicatorShown(True)
+        self.memo_list.setObjectName("memoList")
+        # 右键菜单：设置或取消提醒
+        self.memo_list.setContextMenuPolicy(Qt.CustomContextMenu)
+        self.memo_list.customContextMenuRequested.connect(self.show_task_menu)
+
+        # 任务数据由模型保存，委托只绘制可见行并处理按钮点击
+        self.task_model = TaskListModel(self.store, self, reminders=self.reminders)
+        if self.profiler is not None:
+            self.profiler.instrument(self.task_model, PROFILED_MODEL_METHODS, "model.")
+            self.profiler.instrument_jobs(self.store, "save_job", "store.")
+        self.memo_list.setModel(self.task_model)
+        self.list_attached = True  # 列表不可见时与模型断开（见 attach_list）
+        self._list_top_task = None  # 断开时列表顶部的任务 id，重新连接后滚动回这里
+        self.task_delegate = TaskItemDelegate(self.memo_list)
+        self.memo_list.setItemDelegate(self.task_delegate)
+        self.task_delegate.status_clicked.connect(self.change_status)
+        self.task_delegate.delete_clicked.connect(self.delete_item)
+        self.task_delegate.edit_clicked.connect(self.edit_item)
+        self.task_model.task_moved.connect(self.task_moved)
+        self.memo_list.selectionModel().selectionChanged.connect(self.update_batch_bar)
+
+        # 归档视图：代替任务列表显示，打开时才读取归档文件，滚动时分页解压
+        self.archive_list = QListView()
+        self.archive_list.setObjectName("archiveList")
+        self.archive_list.setUniformItemSizes(True)
+        self.archive_list.hide()
 
         # 组装界面
         main_layout.addWidget(self.input_layout_widget)
+        main_layout.addWidget(self.batch_bar)
+        main_layout.addWidget(self.reminder_banner)
         main_layout.addWidget(self.memo_list)
+        main_layout.addWidget(self.archive_list)
+
+        # 性能浮层：叠在列表左上角，不拦截鼠标
+        self.perf_overlay = QLabel(central_widget)
+        self.perf_overlay.setObjectName("perfOverlay")
+        self.perf_overlay.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.perf_overlay.hide()
+        self.perf_timer = QTimer(self)
+        self.perf_timer.setInterval(PERF_REFRESH_INTERVAL)
+        self.perf_timer.timeout.connect(self.refresh_perf_overlay)
 
         # 设置窗口特效
         self.setWindowFlags(Qt.FramelessWindowHint)
@@ -237,6 +305,8 @@ class GlassMemo(QMainWindow):
         self.add_btn.clicked.connect(self.add_memo)
         self.clear_btn.clicked.connect(self.clear_all)
         self.input_field.returnPressed.connect(self.add_memo)  # Enter 键添加任务
+        self.search_field.textChanged.connect(self.filter_memos)
+        self.search_field.installEventFilter(self)  # 获得焦点时提前建立搜索索引
 
         # 初始化动画
         self.fade_animation = QPropertyAnimation(self, b"windowOpacity")
@@ -246,82 +316,162 @@ class GlassMemo(QMainWindow):
         self.fade_animation.setEasingCurve(QEasingCurve.InOutQuad)
         self.fade_animation.start()
 
-        # 添加阴影效果
-        shadow = QGraphicsDropShadowEffect()
-        shadow.setBlurRadius(20)
-        shadow.setColor(QColor(0, 0, 0, 100))
-        shadow.setOffset(0, 5)
-        central_widget.setGraphicsEffect(shadow)
-
-        # 设置消息框样式
-        QMessageBox.setStyleSheet(self, """
-            QMessageBox {
-                background: rgba(50, 50, 50, 0.9);
-                border-radius: 10px;
-            }
-            QMessageBox QLabel {
-                color: white;
-                font-size: 14px;
-                padding: 10px;
-            }
-            QMessageBox QPushButton {
-                width: 60px;
-                padding: 8px 15px;
-                margin: 5px;
-                border-radius: 8px;
-                color: white;
-                font-size: 14px;
-                background: rgba(70, 70, 70, 0.7);
-                border: none;
-            }
-            QMessageBox QPushButton:hover {
-                background: rgba(90, 90, 90, 0.8);
-            }
-        """)
+        # 添加阴影效果：默认只在布局变化时拼接缓存的阴影位图，子控件重绘时不再重新模糊整个窗口
+        self.render_mode = render_mode()
+        if self.render_mode == "effect":
+            shadow = QGraphicsDropShadowEffect(central_widget)  # 需要父对象，否则 Python 端回收后效果被删除
+            shadow.setBlurRadius(SHADOW_BLUR)
+            shadow.setColor(SHADOW_COLOR)
+            shadow.setOffset(SHADOW_OFFSET)
+            central_widget.setGraphicsEffect(shadow)
+        else:
+            central_widget.add_panels(self.title_bar, self.input_field, self.search_field, self.add_btn,
+                                      self.clear_btn, self.batch_bar, self.reminder_banner, self.memo_list,
+                                      self.archive_list)
+            central_widget.watch(self.input_layout_widget)  # 输入框随所在的行移动
+
+        # 整个窗口共用一份样式表（包括消息框），各控件按 objectName 匹配
+        self.setStyleSheet(STYLESHEET)
 
         # 初始化内容可见性
         self.is_content_visible = True
-        self.input_layout_widget.setVisible(self.is_content_visible)
-        self.memo_list.setVisible(self.is_content_visible)
+        self.update_content_visibility()
+
+        # 定时归档（载入完成时也会检查一次）
+        self.archive_timer = QTimer(self)
+        self.archive_timer.setInterval(ARCHIVE_CHECK_INTERVAL)
+        self.archive_timer.timeout.connect(self.archive_finished)
+        self.archive_timer.start()
+
+        # 多个窗口或命令行共用数据文件：文件变化时合并其他程序写入的修改
+        self.file_watcher = QFileSystemWatcher(self)
+        self.file_watcher.fileChanged.connect(self.schedule_sync)
+        self.file_watcher.directoryChanged.connect(self.schedule_sync)  # 文件被原子替换时
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(SYNC_DELAY)
+        self.sync_timer.timeout.connect(self.sync_from_disk)
+        self.sync_poll_timer = QTimer(self)
+        self.sync_poll_timer.setInterval(SYNC_POLL_INTERVAL)
+        self.sync_poll_timer.timeout.connect(self.sync_from_disk)
+        self.sync_poll_timer.start()
+        self.watch_data_files()
 
         # 加载保存的数据
+        self._pending_batches = None
+        self._load_progress = 0.0
+        self._save_after_load = False
+        self._closed = False  # 数据文件已关闭：定时器和文件监视不再访问存储
+        self._sync_reading = False  # 正在后台读取其他程序写入的内容
+        self._indexing = False  # 正在分批建立搜索索引
         self.load_data()
 
+        # 本机 HTTP 接口（GLASS_MEMO_API 或 --api 开启）：请求在后台线程接收，在界面线程成批执行
+        self.api_bridge = None
+        if api is None:
+            api = api_port()
+        if api is not None:
+            self.api_bridge = ApiBridge(api, self.run_api_requests, parent=self)
+            try:
+                self.api_bridge.start()
+            except OSError as e:
+                print(f"启动接口服务出错: {e}")
+                self.api_bridge = None
+
     def load_data(self):
-        """从文件加载数据"""
+        """从文件加载数据：先同步载入第一屏，其余部分在事件循环中分批载入"""
+        self.load_started = time.perf_counter()
+        self.first_paint_time = None
+        self.memo_list.viewport().installEventFilter(self)  # 记录首次绘制时间
         try:
-            if os.path.exists(self.data_file):
-                with open(self.data_file, 'r', encoding='utf-8') as f:
-                    tasks = json.load(f)
-                    for task in tasks:
-                        item = QListWidgetItem()
-                        task_widget = TaskItemWidget(task['text'])
-                        task_widget.status = task['status']
-                        task_widget.change_status(task['status'])
-                        item.setSizeHint(task_widget.sizeHint())
-                        self.memo_list.addItem(item)
-                        self.memo_list.setItemWidget(item, task_widget)
-                        task_widget.delete_btn.clicked.connect(lambda: self.delete_item(item))
-                        task_widget.status_changed.connect(self.sort_memos)
-                    self.update_stats()
+            self._pending_batches = self.task_model.begin_load(LOAD_BATCH_SIZE, FIRST_SCREEN_SIZE)
         except Exception as e:
             print(f"加载数据出错: {e}")
+            self._pending_batches = None
+            return
+        self._load_next_batch()
 
-    def save_data(self):
-        """保存数据到文件"""
+    def _load_next_batch(self):
+        """载入下一批任务；还有剩余时交回事件循环，稍后继续"""
+        if self._pending_batches is None:
+            return  # 已由 finish_loading 载入完毕
         try:
-            tasks = []
-            for i in range(self.memo_list.count()):
-                item = self.memo_list.item(i)
-                widget = self.memo_list.itemWidget(item)
-                tasks.append({
-                    'text': widget.text_label.text(),
-                    'status': widget.status
-                })
-            with open(self.data_file, 'w', encoding='utf-8') as f:
-                json.dump(tasks, f, ensure_ascii=False, indent=2)
+            batch = next(self._pending_batches, None)
         except Exception as e:
-            print(f"保存数据出错: {e}")
+            print(f"加载数据出错: {e}")
+            batch = None
+        if batch is None:
+            self._pending_batches = None
+            self.load_time = time.perf_counter() - self.load_started
+            self.update_stats()
+            if self._save_after_load:
+                self._save_after_load = False
+                self.save_data()
+            QTimer.singleShot(0, self.archive_finished)  # 不拖慢载入完成后的第一次绘制
+            return
+        tasks, self._load_progress = batch
+        self.task_model.append_batch(tasks)
+        self.update_stats()
+        QTimer.singleShot(0, self._load_next_batch)
+
+    def finish_loading(self):
+        """同步载入剩余的全部任务"""
+        while self._pending_batches is not None:
+            self._load_next_batch()
+
+    def is_loading(self):
+        return self._pending_batches is not None
+
+    def watch_data_files(self):
+        """监视数据文件及其所在目录；被替换或新建的文件需要重新加入"""
+        watched = set(self.file_watcher.files())
+        paths = [path for path in self.store.watched_paths() if path not in watched and os.path.exists(path)]
+        directory = os.path.dirname(os.path.abspath(self.data_file))
+        if directory not in self.file_watcher.directories():
+            paths.append(directory)
+        if paths:
+            self.file_watcher.addPaths(paths)
+
+    def schedule_sync(self):
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
+
+    def sync_from_disk(self):
+        """合并其他窗口或命令行写入的修改：读取和解析在后台线程进行，读完后在界面线程合并"""
+        if self._closed or self.is_loading() or self._sync_reading:
+            return
+        job = self.store.sync_job()
+        if job is not None:
+            self._sync_reading = True
+            self.save_scheduler.run(job, self.merge_from_disk)
+            return
+        self.merge_from_disk(None)
+
+    def merge_from_disk(self, disk):
+        """把读到的内容与本地修改合并，只刷新变化的行；disk 为 None 时在当前线程读取"""
+        self._sync_reading = False
+        if self._closed or self.is_loading():
+            return
+        try:
+            changed = self.task_model.sync(disk)
+        except Exception as e:
+            print(f"同步数据出错: {e}")
+            return
+        self.watch_data_files()
+        if changed:
+            self.update_stats()
+            self.update_batch_bar()
+            self.save_data()  # 写入合并时保留的本地修改
+
+    def save_data(self):
+        """保存数据到文件（合并短时间内的多次调用，在后台写入）"""
+        if self._closed:
+            return
+        if self.is_loading():
+            # 未载入完时保存会丢掉剩余任务，等载入完成后再保存
+            self._save_after_load = True
+            return
+        self.save_scheduler.schedule()
 
     def closeEvent(self, event):
         """窗口关闭时保存数据"""
@@ -334,7 +484,25 @@ class GlassMemo(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
-            self.save_data()
+            # 先停下会访问存储的定时器和文件监视（包括载入完成时排队的归档检查），再关闭数据文件
+            self.archive_timer.stop()
+            self.sync_timer.stop()
+            self.sync_poll_timer.stop()
+            self.file_watcher.blockSignals(True)
+            try:
+                if self.api_bridge is not None:
+                    self.api_bridge.stop()
+                self.finish_loading()
+                self.save_scheduler.flush()  # 写入尚未保存的修改
+                self._closed = True
+                self.store.close()
+            except Exception as e:
+                print(f"保存数据出错: {e}")
+            if self.profiler is not None:
+                try:
+                    self.profiler.dump(self.perf_file)
+                except Exception as e:
+                    print(f"保存性能统计出错: {e}")
             super().closeEvent(event)
         else:
             event.ignore()  # 取消关闭
@@ -342,8 +510,7 @@ class GlassMemo(QMainWindow):
     def toggle_content(self):
         """切换内容的显示和隐藏"""
         self.is_content_visible = not self.is_content_visible
-        self.input_layout_widget.setVisible(self.is_content_visible)
-        self.memo_list.setVisible(self.is_content_visible)
+        self.update_content_visibility()
         
         # 创建动画
         self.resize_animation = QPropertyAnimation(self, b"size")
@@ -359,8 +526,104 @@ class GlassMemo(QMainWindow):
             
         self.resize_animation.start()
 
+    def update_content_visibility(self):
+        """按折叠状态和是否在查看归档，显示任务列表或归档视图"""
+        show_tasks = self.is_content_visible and not self.showing_archive
+        self.input_layout_widget.setVisible(show_tasks)
+        self.memo_list.setVisible(show_tasks)
+        self.attach_list(show_tasks and not self.isMinimized())
+        self.archive_list.setVisible(self.is_content_visible and self.showing_archive)
+        self.reminder_banner.setVisible(show_tasks and bool(self.due_ids))
+        self.update_batch_bar()
+
+    def attach_list(self, attached):
+        """把任务列表连接到模型或断开
+
+        列表不可见（折叠、最小化或在查看归档）时断开：各种途径的修改只更新存储、提醒和统计，
+        隐藏的视图不再为每次修改插入行、更新表头和选择、重新布局；重新连接时视图按模型一次性重建。
+        """
+        if attached == self.list_attached:
+            return
+        self.list_attached = attached
+        selection = self.memo_list.selectionModel()
+        if attached:
+            self.memo_list.setModel(self.task_model)
+            self.memo_list.selectionModel().selectionChanged.connect(self.update_batch_bar)
+            row = None if self._list_top_task is None else self.task_model.row_of(self._list_top_task)
+            if row is not None:
+                self.memo_list.scrollTo(self.task_model.index(row), QAbstractItemView.PositionAtTop)
+        else:
+            top = self.memo_list.indexAt(QPoint(0, 0))
+            self._list_top_task = top.data(TaskListModel.IdRole) if top.isValid() else None
+            self.task_delegate.clear_hover()
+            self.memo_list.setModel(None)
+        selection.deleteLater()  # 视图不会删除被替换的选择模型，留着它仍会跟踪模型的每次修改
+
+    def changeEvent(self, event):
+        """最小化时断开任务列表，恢复时重新连接"""
+        if event.type() == QEvent.WindowStateChange:
+            self.update_content_visibility()
+        super().changeEvent(event)
+
+    def toggle_archive(self):
+        """在任务列表和归档视图之间切换；每次打开都从头读取归档"""
+        self.showing_archive = not self.showing_archive
+        if self.showing_archive:
+            self.archive_list.setModel(ArchiveModel(self.archive, parent=self.archive_list))
+        else:
+            model = self.archive_list.model()
+            self.archive_list.setModel(None)
+            model.deleteLater()  # 释放已读取的归档记录
+        self.archive_btn.setText("📋" if self.showing_archive else "🗄")
+        self.archive_btn.setToolTip("返回任务列表" if self.showing_archive else "查看归档")
+        if self.showing_archive and not self.is_content_visible:
+            self.toggle_content()
+        else:
+            self.update_content_visibility()
+
+    def archive_finished(self):
+        """把结束超过 GLASS_MEMO_ARCHIVE_DAYS 天的任务移入归档文件"""
+        days = archive_days()
+        if days <= 0 or self._closed or self.is_loading():
+            return
+        try:
+            expired = expired_tasks(self.store, days)
+            if not expired:
+                return
+            self.archive.append(expired)  # 先写归档再删除，中途出错也不会丢任务
+        except Exception as e:
+            print(f"归档任务出错: {e}")
+            return
+        self.task_model.remove_ids([task.id for task in expired])
+        self.update_stats()
+        self.update_batch_bar()
+        self.save_data()
+
+    def prepare_search(self):
+        """分批建立搜索索引，每批之后交回事件循环；建完之前就开始搜索时由搜索补完剩余部分"""
+        self._indexing = not self._closed and not self.task_model.prepare_search(SEARCH_INDEX_BATCH)
+        if self._indexing:
+            QTimer.singleShot(0, self.prepare_search)
+
+    def toggle_perf_overlay(self):
+        """显示或隐藏性能浮层"""
+        if self.perf_overlay.isVisible():
+            self.perf_timer.stop()
+            self.perf_overlay.hide()
+            return
+        self.refresh_perf_overlay()
+        self.perf_overlay.show()
+        self.perf_overlay.raise_()
+        self.perf_timer.start()
+
+    def refresh_perf_overlay(self):
+        """刷新性能浮层中的统计"""
+        self.perf_overlay.setText(self.profiler.report())
+        self.perf_overlay.adjustSize()
+        self.perf_overlay.move(self.memo_list.geometry().topLeft() + QPoint(10, 10))
+
     def eventFilter(self, obj, event):
-        """事件过滤器，仅处理标题栏的拖动"""
+        """事件过滤器，处理标题栏的拖动、搜索框获得焦点，并记录列表首次绘制的时间"""
         if obj == self.title_bar:
             if event.type() == QEvent.MouseButtonPress:
                 if event.button() == Qt.LeftButton:
@@ -380,45 +643,39 @@ class GlassMemo(QMainWindow):
                     self.dragging = False
                     obj.setCursor(Qt.OpenHandCursor)
                     return True
+        elif obj == self.search_field and event.type() == QEvent.FocusIn:
+            if not self._indexing:
+                self.prepare_search()
+        elif obj == self.memo_list.viewport() and event.type() == QEvent.Paint:
+            if self.first_paint_time is None:
+                self.first_paint_time = time.perf_counter() - self.load_started
+                obj.removeEventFilter(self)
         return super().eventFilter(obj, event)
 
     def update_stats(self):
-        """更新任务统计信息"""
-        todo_count = 0
-        complete_count = 0
-        cancel_count = 0
-        
-        for i in range(self.memo_list.count()):
-            item = self.memo_list.item(i)
-            widget = self.memo_list.itemWidget(item)
-            if widget.status == "todo":
-                todo_count += 1
-            elif widget.status == "complete":
-                complete_count += 1
-            elif widget.status == "cancel":
-                cancel_count += 1
-                
-        self.stats_label.setText(f"(待办:{todo_count} 完成:{complete_count} 取消:{cancel_count})")
+        """更新任务统计信息（计数由模型增量维护，有筛选时只统计匹配项）"""
+        set_style_property(self.stats_label, "loading", self.is_loading())
+        if self.is_loading():
+            self.stats_label.setText(
+                f"(加载中 {self._load_progress:.0%}，已载入 {self.task_model.rowCount()} 条)")
+            return
+        counts = self.task_model.counts(filtered=True)
+        self.stats_label.setText(
+            f"(待办:{counts['todo']} 完成:{counts['complete']} 取消:{counts['cancel']})")
 
     def add_memo(self):
         """添加备忘录项"""
         text = self.input_field.text()
         if text.strip():
-            item = QListWidgetItem()
-            task_widget = TaskItemWidget(text)
-            item.setSizeHint(task_widget.sizeHint())
-            self.memo_list.addItem(item)
-            self.memo_list.setItemWidget(item, task_widget)
-            task_widget.delete_btn.clicked.connect(lambda: self.delete_item(item))
-            task_widget.status_changed.connect(self.sort_memos)
-            self.sort_memos()  # 添加后排序
+            # 文本中写了时间（如“明天9点开会”）时按该时间提醒
+            self.task_model.add_task(text, due_at=parse_due_time(text))  # 直接插入到待办分组末尾
             self.update_stats()  # 更新统计
             self.input_field.clear()
             self.save_data()  # 保存数据
 
     def clear_all(self):
         """清空所有备忘录项"""
-        if self.memo_list.count() == 0:
+        if self.task_model.rowCount() == 0:
             return
         reply = QMessageBox.question(
             self,
@@ -428,170 +685,209 @@ class GlassMemo(QMainWindow):
             QMessageBox.No
         )
         if reply == QMessageBox.Yes:
-            self.memo_list.clear()
+            self.task_model.clear()
             self.update_stats()  # 更新统计
             self.save_data()  # 保存数据
 
-    def delete_item(self, item):
-        """删除指定备忘录项"""
-        self.memo_list.takeItem(self.memo_list.row(item))
-        self.sort_memos()  # 删除后排序
+    def delete_item(self, task_id):
+        """删除指定备忘录项（按任务 id 查找当前行）"""
+        row = self.task_model.row_of(task_id)
+        if row is None:
+            return
+        self.task_model.remove_task(row)  # 删除不影响其余行的顺序
         self.update_stats()  # 更新统计
         self.save_data()  # 保存数据
 
-    def sort_memos(self):
-        """对备忘录项按状态排序"""
-        tasks = []
-        for i in range(self.memo_list.count()):
-            item = self.memo_list.item(i)
-            widget = self.memo_list.itemWidget(item)
-            tasks.append({
-                'text': widget.text_label.text(),
-                'status': widget.status
-            })
-        
-        self.memo_list.clear()
-        unfinished = [task for task in tasks if task['status'] in ["todo"]]
-        finished = [task for task in tasks if task['status'] in ["complete", "cancel"]]
-        sorted_tasks = unfinished + finished
-        
-        for task in sorted_tasks:
-            item = QListWidgetItem()
-            task_widget = TaskItemWidget(task['text'])
-            task_widget.status = task['status']
-            task_widget.change_status(task['status'])
-            item.setSizeHint(task_widget.sizeHint())
-            self.memo_list.addItem(item)
-            self.memo_list.setItemWidget(item, task_widget)
-            task_widget.delete_btn.clicked.connect(lambda: self.delete_item(item))
-            task_widget.status_changed.connect(self.sort_memos)
+    def change_status(self, task_id, status):
+        """修改指定备忘录项的状态"""
+        row = self.task_model.row_of(task_id)
+        if row is None:
+            return
+        self.task_model.set_status(row, status)  # 只把这一行移动到新位置
         self.update_stats()  # 更新统计
         self.save_data()  # 保存数据
 
-class TaskItemWidget(QWidget):
-    status_changed = Signal()  # 当状态改变时发出信号
-
-    def __init__(self, text, parent=None):
-        super().__init__(parent)
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(15, 15, 15, 15)
-
-        # 任务文本
-        self.text_label = QLineEdit(text)
-        self.text_label.setReadOnly(True)
-        self.text_label.setMinimumHeight(50)
-        self.text_label.setAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-        self.text_label.setStyleSheet("""
-            QLineEdit {
-                border: none;
-                background: transparent;
-                color: white;
-                font-size: 18px;
-                padding: 5px;
-                margin-bottom: 10px;
-            }
-        """)
-
-        # 按钮行
-        btn_container = QWidget()
-        btn_container.setFixedHeight(50)
-        btn_layout = QHBoxLayout(btn_container)
-        btn_layout.setContentsMargins(0, 0, 0, 0)
-        btn_layout.setSpacing(10)
-
-        # 四个按钮
-        self.todo_btn = QPushButton("代办📋")
-        self.complete_btn = QPushButton("完成✅")
-        self.cancel_btn = QPushButton("取消❌")
-        self.delete_btn = QPushButton("删除🗑️")
-        self.currentstatus = QLabel("当前状态：代办")
-        self.currentstatus.setStyleSheet("background: transparent;color: white;")
-        # 设置按钮大小
-        for btn in [self.todo_btn, self.complete_btn, self.cancel_btn, self.delete_btn]:
-            btn.setFixedSize(80, 40)
-
-        # 设置按钮样式
-        button_style = """
-            QPushButton {
-                background: transparent;
-                color: white;
-                border: none;
-            }
-            QPushButton:hover {
-                background: rgba(255, 255, 255, 0.1);
-                border-radius: 5px;
-            }
-            QPushButton:pressed {
-                background: rgba(255, 255, 255, 0.2);
-            }
-            QPushButton:focus {
-                outline: none;
-            }
-        """
-        
-        self.todo_btn.setStyleSheet(button_style)
-        self.complete_btn.setStyleSheet(button_style)
-        self.cancel_btn.setStyleSheet(button_style)
-        self.delete_btn.setStyleSheet(button_style)
-        
-        # 设置状态标签样式
-        self.currentstatus.setStyleSheet("""
-            QLabel {
-                background: transparent;
-                color: white;
-            }
-            QLabel:focus {
-                outline: none;
-            }
-        """)
+    def edit_item(self, task_id):
+        """修改指定备忘录项的文本"""
+        row = self.task_model.row_of(task_id)
+        if row is None:
+            return
+        old_text = self.task_model.task(row).text
+        text, ok = QInputDialog.getText(self, "编辑任务", "任务内容：", text=old_text)
+        # 对话框打开期间列表可能已变化，按 id 重新查找
+        row = self.task_model.row_of(task_id)
+        if not ok or not text.strip() or text == old_text or row is None:
+            return
+        # 新文本中写了时间时改用该时间提醒，否则保留原来的提醒
+        due_at = parse_due_time(text)
+        self.task_model.update_ids({task_id: {'text': text} if due_at is None else
+                                    {'text': text, 'due_at': due_at}})
+        self.update_stats()  # 搜索时匹配数可能变化
+        self.save_data()  # 保存数据
 
-        # 连接信号
-        self.todo_btn.clicked.connect(lambda: self.change_status("todo"))
-        self.complete_btn.clicked.connect(lambda: self.change_status("complete"))
-        self.cancel_btn.clicked.connect(lambda: self.change_status("cancel"))
-        
-        btn_layout.addWidget(self.todo_btn)
-        btn_layout.addWidget(self.complete_btn)
-        btn_layout.addWidget(self.cancel_btn)
-        btn_layout.addStretch()
-        btn_layout.addWidget(self.delete_btn)
-        btn_layout.addWidget(self.currentstatus)
-        # 添加到主布局
-        layout.addWidget(self.text_label)
-        layout.addWidget(btn_container)
-
-        self.status = "todo"  # 初始状态
-        self.change_status("todo")
-
-    def change_status(self, status):
-        """更改任务状态并更新样式"""
-        self.status = status
-        style = """
-            QLineEdit {
-                border: none;
-                background: %s;
-                font-size: 18px;
-                padding: 5px;
-                margin-bottom: 10px;
-                border-radius: 5px;
-                color: white;
-            }
-        """
-        if status == "todo":
-            self.text_label.setStyleSheet(style % "rgba(255, 255, 0, 0.2)")
-            self.currentstatus.setText("当前状态：代办")
-        elif status == "complete":
-            self.text_label.setStyleSheet(style % "rgba(0, 255, 0, 0.2)")
-            self.currentstatus.setText("当前状态：完成")
-        elif status == "cancel":
-            self.text_label.setStyleSheet(style % "rgba(255, 0, 0, 0.2)")
-            self.currentstatus.setText("当前状态：取消")
-        self.status_changed.emit()  # 通知状态改变
-        
-        # 更新父窗口的统计信息
-        parent = self.window()
-        if isinstance(parent, GlassMemo):
-            parent.update_stats()
+    def show_task_menu(self, pos):
+        """任务的右键菜单：设置或取消提醒"""
+        index = self.memo_list.indexAt(pos)
+        if not index.isValid():
+            return
+        task_id = index.data(TaskListModel.IdRole)
+        menu = QMenu(self)
+        menu.addAction("设置提醒…", lambda: self.edit_reminder(task_id))
+        if index.data(TaskListModel.DueRole) is not None:
+            menu.addAction("取消提醒", lambda: self.set_reminder(task_id, None))
+        menu.exec(self.memo_list.viewport().mapToGlobal(pos))
+
+    def edit_reminder(self, task_id):
+        """输入提醒时间（与任务文本中的写法相同，如“明天 9点”“周五下午3点”“21:30”）"""
+        row = self.task_model.row_of(task_id)
+        if row is None:
+            return
+        due_at = self.task_model.task(row).due_at
+        text, ok = QInputDialog.getText(self, "设置提醒", "提醒时间（如 明天9点、周五下午3点、21:30）：",
+                                        text="" if due_at is None else format_due_time(due_at))
+        if not ok or not text.strip():
+            return
+        due_at = parse_due_time(text)
+        if due_at is None:
+            QMessageBox.warning(self, "设置提醒", f"无法识别的时间：{text}")
+            return
+        self.set_reminder(task_id, due_at)
+
+    def set_reminder(self, task_id, due_at):
+        """修改任务的提醒时间，None 表示取消提醒"""
+        row = self.task_model.row_of(task_id)
+        if row is None:
+            return
+        self.task_model.set_due(row, due_at)
+        self.save_data()  # 保存数据
+
+    def show_reminders(self, ids):
+        """任务到期：突出显示对应的行，显示提醒横幅并发出系统通知（点击横幅或通知后关闭横幅）"""
+        self.memo_list.viewport().update()  # 到期的行按提醒时间重新绘制
+        self.due_ids.extend(ids)
+        store = self.task_model.store()
+        texts = [task.text for task in map(store.get, ids[:REMINDER_PREVIEW]) if task is not None]
+        message = "、".join(texts)
+        if len(ids) > len(texts):
+            message += f" 等 {len(ids)} 项"
+        if len(self.due_ids) > len(ids):
+            self.reminder_banner.setText(f"⏰ 提醒：{message}（共 {len(self.due_ids)} 项待查看）")
+        else:
+            self.reminder_banner.setText(f"⏰ 提醒：{message}")
+        self.update_content_visibility()
+        QApplication.alert(self)  # 任务栏闪烁
+        if QSystemTrayIcon.isSystemTrayAvailable() and QSystemTrayIcon.supportsMessages():
+            if self.tray_icon is None:
+                icon = self.style().standardIcon(QStyle.SP_MessageBoxInformation)
+                self.tray_icon = QSystemTrayIcon(icon, self)
+                self.tray_icon.messageClicked.connect(self.open_reminder)
+                self.tray_icon.show()
+            self.tray_icon.showMessage("Glass Memo 提醒", message, QSystemTrayIcon.Information,
+                                       REMINDER_MESSAGE_TIME)
+
+    def open_reminder(self):
+        """显示窗口并定位到第一条仍在列表中的到期任务，关闭横幅"""
+        self.showNormal()  # 先取消最小化，展开时列表才会重新连接模型
+        if not self.is_content_visible:
+            self.toggle_content()
+        self.activateWindow()
+        for task_id in self.due_ids:
+            row = self.task_model.row_of(task_id)
+            if row is not None:
+                index = self.task_model.index(row)
+                self.memo_list.scrollTo(index)
+                self.memo_list.setCurrentIndex(index)
+                break
+        self.due_ids = []
+        self.update_content_visibility()
+
+    def task_moved(self, row):
+        """拖动排序后保存；顺序键过密时空闲时重新编号"""
+        self.save_data()  # 保存数据
+        if self.task_model.needs_reorder():
+            QTimer.singleShot(0, self.sort_memos)
+
+    def filter_memos(self, text):
+        """按搜索词筛选列表（由文本索引查找，不逐条比较）"""
+        self.task_model.set_filter_text(text.strip())
+        self.update_stats()  # 统计只计匹配项
+        self.update_batch_bar()
+
+    def selected_rows(self):
+        """返回选中的行号（升序）"""
+        return sorted(index.row() for index in self.memo_list.selectionModel().selectedRows())
+
+    def update_batch_bar(self):
+        """按选中数量和搜索状态更新批量操作栏"""
+        selected = len(self.memo_list.selectionModel().selectedRows())
+        filtering = bool(self.task_model.filter_text())
+        self.batch_label.setText(f"已选 {selected} 项")
+        for button in self.selection_buttons:
+            button.setEnabled(selected > 0)
+        self.complete_matching_btn.setVisible(filtering)
+        self.batch_bar.setVisible(self.is_content_visible and not self.showing_archive
+                                  and (selected > 0 or filtering))
+
+    def batch_set_status(self, status):
+        """修改所有选中任务的状态"""
+        rows = self.selected_rows()
+        if rows:
+            self._run_batch(self.task_model.set_status_many, rows, status)
+
+    def batch_delete(self):
+        """删除所有选中的任务"""
+        rows = self.selected_rows()
+        if not rows:
+            return
+        reply = QMessageBox.question(
+            self,
+            "确认删除",
+            f"确定要删除选中的 {len(rows)} 项吗？",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self._run_batch(self.task_model.remove_many, rows)
+
+    def complete_matching(self):
+        """把搜索结果中的全部任务标记为完成"""
+        count = self.task_model.rowCount()
+        if count == 0:
+            return
+        reply = QMessageBox.question(
+            self,
+            "确认完成",
+            f"确定要把匹配的 {count} 项全部标记为完成吗？",
+            QMessageBox.Yes | QMessageBox.No,
+            QMessageBox.No
+        )
+        if reply == QMessageBox.Yes:
+            self._run_batch(self.task_model.set_status_many, range(count), "complete")
+
+    def _run_batch(self, operation, *args):
+        """执行一次批量操作：无论涉及多少任务，排序、统计和保存都只做一次"""
+        scroll = self.memo_list.verticalScrollBar().value()
+        try:
+            operation(*args)
+        finally:
+            # 中途出错时已执行的部分也要刷新统计并保存
+            self.memo_list.verticalScrollBar().setValue(scroll)  # 模型整体刷新后保持滚动位置
+            self.update_stats()  # 更新统计
+            self.update_batch_bar()
+            self.save_data()  # 保存数据
+
+    def run_api_requests(self, requests):
+        """执行一批接口请求：添加和修改各只刷新一次列表，统计和保存也只做一次；载入完成前暂不执行"""
+        if self.is_loading():
+            return False
+        self._run_batch(apply_requests, self.task_model, requests)
+        return True
+
+    def sort_memos(self):
+        """对备忘录项按状态重新排序（增删改已增量维护顺序，仅用于整体重排）"""
+        self.task_model.sort()
+        self.update_stats()  # 更新统计
+        self.save_data()  # 保存数据
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
@@ -601,6 +897,6 @@ if __name__ == "__main__":
     palette.setColor(QPalette.Window, QColor(53, 53, 53))
     app.setPalette(palette)
     
-    window = GlassMemo()
+    window = GlassMemo(profile=profiling_requested(sys.argv), api=api_port(sys.argv))
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,438 @@
+"""本机 HTTP/JSON 接口：监控脚本、聊天机器人等可以向正在运行的窗口添加、查询和修改任务
+
+通过环境变量 GLASS_MEMO_API=1（默认端口 8765）或 GLASS_MEMO_API=端口、命令行参数 --api[=端口] 开启，
+只监听 127.0.0.1。服务在后台线程的 asyncio 事件循环中解析请求，请求排队后由界面线程成批执行：
+一批内的添加合并为一次 add_many，对同一任务的修改合并后只刷新一次；每批最多执行 API_BATCH_SIZE 个请求，
+其余的留到下一轮事件循环，突发上万个请求时界面仍能及时绘制。同一批内的查询在添加和修改之后执行。
+
+    GET   /tasks[?status=todo&search=关键字&limit=100]   列出任务（按显示顺序）
+    POST  /tasks        {"text": "...", "status": "todo"}   添加任务，返回 {"id": ...}
+    POST  /tasks/bulk   {"tasks": [{"text": "..."}, ...]}   批量添加，返回 {"ids": [...]}
+    PATCH /tasks/<id>   {"text": "...", "status": "..."}    修改任务，返回修改后的任务
+
+带 Origin 头（浏览器跨站请求）或 Host 不是 127.0.0.1/localhost（DNS 重绑定）的请求返回 403，
+添加和修改的请求体须声明 Content-Type: application/json，否则返回 415。
+添加和修改时可带 due_at（Unix 秒、“明天9点”这样的文本，或 null 取消提醒）；没有给出时按任务文本中的时间提醒。
+"""
+import asyncio
+import json
+import os
+import threading
+from collections import deque
+from http import HTTPStatus
+from itertools import islice
+from urllib.parse import parse_qs, urlsplit
+
+from PySide6.QtCore import QCoreApplication, QEvent, QObject, QTimer
+
+from due_time import parse_due_time, parse_timestamp
+from search_index import matches
+from task_list import STATUSES
+
+API_ENV = "GLASS_MEMO_API"
+API_HOST = "127.0.0.1"
+DEFAULT_API_PORT = 8765
+API_BATCH_SIZE = 500       # 界面线程每轮最多执行的请求数
+API_BATCH_DELAY = 10       # 收到请求后等待更多请求一起执行的时间（毫秒）
+API_RETRY_DELAY = 100      # 窗口暂不能执行请求（如正在载入）时的重试间隔（毫秒）
+MAX_PENDING = 100000       # 排队的请求超过此数量时返回 503
+MAX_BODY = 16 * 1024 * 1024
+
+
+def api_port(argv=()):
+    """环境变量或命令行要求开启接口时返回端口，否则返回 None"""
+    for arg in argv:
+        if arg == "--api":
+            return DEFAULT_API_PORT
+        if arg.startswith("--api="):
+            return _port(arg[len("--api="):])
+    value = os.environ.get(API_ENV, "")
+    if value in ("", "0"):
+        return None
+    return DEFAULT_API_PORT if value == "1" else _port(value)
+
+
+def _port(value):
+    try:
+        return int(value)
+    except ValueError:
+        print(f"接口端口不是数字，使用默认端口 {DEFAULT_API_PORT}")
+        return DEFAULT_API_PORT
+
+
+class ApiError(Exception):
+    """请求有误，status 为返回的 HTTP 状态码"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class ApiRequest:
+    """排队等待界面线程执行的请求
+
+    界面线程执行后用 resolve() 记下结果，整批执行完再由 ApiServer.deliver() 一次交回服务线程，
+    不必每个请求都唤醒一次事件循环。
+    """
+    __slots__ = ('op', 'data', 'future', 'result')
+
+    def __init__(self, op, data, future=None):
+        self.op = op        # "add"、"bulk"、"update" 或 "list"
+        self.data = data
+        self.future = future  # 服务线程中等待结果的 asyncio.Future
+        self.result = None    # (状态码, 响应 JSON)
+
+    def resolve(self, status, payload):
+        self.result = (status, payload)
+
+
+def _due_at(value, where="请求"):
+    """请求中的 due_at：Unix 秒、可解析的时间文本或 null"""
+    try:
+        return parse_timestamp(value)
+    except ValueError as e:
+        raise ApiError(400, f"{where}: {e}")
+
+
+def _task_record(data, where="请求"):
+    """检查一条要添加的任务，返回 {'text', 'status'}，有提醒时间时带 due_at"""
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+        raise ApiError(400, f"{where}: 缺少 text 字段")
+    if not data['text'].strip():
+        raise ApiError(400, f"{where}: 任务内容不能为空")
+    status = data.get('status') or "todo"
+    if status not in STATUSES:
+        raise ApiError(400, f"{where}: 未知状态 {status!r}")
+    record = {'text': data['text'], 'status': status}
+    due_at = _due_at(data['due_at'], where) if 'due_at' in data else parse_due_time(data['text'])
+    if due_at is not None:
+        record['due_at'] = due_at
+    return record
+
+
+def _update_fields(data):
+    """检查修改请求，返回要修改的字段"""
+    if not isinstance(data, dict):
+        raise ApiError(400, "请求体应为 JSON 对象")
+    fields = {}
+    if 'text' in data:
+        if not isinstance(data['text'], str) or not data['text'].strip():
+            raise ApiError(400, "任务内容不能为空")
+        fields['text'] = data['text']
+    if 'due_at' in data:
+        fields['due_at'] = _due_at(data['due_at'])
+    elif 'text' in fields:
+        # 与界面中编辑一致：新文本中写了时间时改用该时间提醒
+        due_at = parse_due_time(fields['text'])
+        if due_at is not None:
+            fields['due_at'] = due_at
+    if 'status' in data:
+        if data['status'] not in STATUSES:
+            raise ApiError(400, f"未知状态 {data['status']!r}")
+        fields['status'] = data['status']
+    if not fields:
+        raise ApiError(400, "没有要修改的字段（text、status、due_at）")
+    return fields
+
+
+def _list_query(query):
+    """解析列表请求的查询参数"""
+    params = {key: values[-1] for key, values in parse_qs(query).items()}
+    status = params.get('status', "all")
+    if status not in STATUSES + ("all",):
+        raise ApiError(400, f"未知状态 {status!r}")
+    try:
+        limit = int(params['limit']) if 'limit' in params else None
+    except ValueError:
+        raise ApiError(400, "limit 应为整数")
+    if limit is not None and limit < 0:
+        raise ApiError(400, "limit 不能为负数")
+    return {'status': status, 'search': params.get('search', ""), 'limit': limit}
+
+
+def _parse_request(method, target, body):
+    """把 HTTP 请求转换为 (op, data)，请求有误时抛出 ApiError"""
+    url = urlsplit(target)
+    parts = [part for part in url.path.split('/') if part]
+    if not parts or parts[0] != 'tasks' or len(parts) > 2:
+        raise ApiError(404, f"未知路径: {url.path}")
+    if method == 'GET' and len(parts) == 1:
+        return "list", _list_query(url.query)
+    try:
+        data = json.loads(body) if body else None
+    except ValueError as e:
+        raise ApiError(400, f"请求体不是有效的 JSON: {e}")
+    if method == 'POST' and parts == ['tasks']:
+        return "add", [_task_record(data)]
+    if method == 'POST' and parts == ['tasks', 'bulk']:
+        records = data.get('tasks') if isinstance(data, dict) else data
+        if not isinstance(records, list):
+            raise ApiError(400, "tasks 应为数组")
+        return "bulk", [_task_record(record, f"第 {i} 条") for i, record in enumerate(records, 1)]
+    if method == 'PATCH' and len(parts) == 2:
+        try:
+            task_id = int(parts[1])
+        except ValueError:
+            raise ApiError(404, f"未知路径: {url.path}")
+        return "update", (task_id, _update_fields(data))
+    raise ApiError(405, f"不支持 {method} {url.path}")
+
+
+def _check_headers(method, headers, port):
+    """拒绝浏览器发出的跨站请求和 DNS 重绑定：不接受 Origin 头，Host 只能是本机地址，
+    写入请求必须是 application/json（网页表单和不经预检的跨站请求发不出这种请求）
+    """
+    if 'origin' in headers:
+        raise ApiError(403, "不接受浏览器跨站请求")
+    if headers.get('host', '').lower() not in {f"{name}{suffix}" for name in ('127.0.0.1', 'localhost')
+                                                for suffix in ('', f":{port}")}:
+        raise ApiError(403, f"Host 应为 127.0.0.1 或 localhost: {headers.get('host')!r}")
+    if method != 'GET' and headers.get('content-type', '').split(';')[0].strip().lower() != 'application/json':
+        raise ApiError(415, "请求体应为 Content-Type: application/json")
+
+
+def _response(status, payload, keep_alive):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    head = (f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode('latin-1') + body
+
+
+class ApiServer:
+    """在后台线程运行的 HTTP 服务；解析好的请求放入队列，由界面线程调用 take() 取出执行
+
+    notify 在队列由空变为非空时（在服务线程中）调用，用于唤醒界面线程。
+    """
+
+    def __init__(self, port, notify, host=API_HOST):
+        self.host = host
+        self.port = port
+        self._notify = notify
+        self._queue = deque()
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+
+    def start(self):
+        """启动服务线程并等待开始监听；端口被占用等错误时抛出 OSError"""
+        ready = threading.Event()
+        errors = []
+
+        def run():
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                server = loop.run_until_complete(
+                    asyncio.start_server(self._handle, self.host, self.port))
+            except OSError as e:
+                errors.append(e)
+                loop.close()
+                ready.set()
+                return
+            self.port = server.sockets[0].getsockname()[1]  # 端口为 0 时由系统分配
+            self._loop = loop
+            ready.set()
+            loop.run_forever()
+            # 已停止：关闭监听，取消仍在等待结果的连接
+            server.close()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+        self._thread = threading.Thread(target=run, name="memo-api", daemon=True)
+        self._thread.start()
+        ready.wait()
+        if errors:
+            raise errors[0]
+
+    def stop(self):
+        """停止服务并关闭所有连接，丢弃尚未执行的请求"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._loop = None
+        self.take()
+
+    def pending(self):
+        """排队中的请求数"""
+        return len(self._queue)
+
+    def take(self, limit=None):
+        """按到达顺序取出最多 limit 个排队的请求"""
+        with self._lock:
+            count = len(self._queue) if limit is None else min(limit, len(self._queue))
+            return [self._queue.popleft() for _ in range(count)]
+
+    def deliver(self, requests):
+        """把一批已执行请求的结果交回服务线程（可在任意线程调用）"""
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(_deliver, requests)
+
+    def put_back(self, requests):
+        """把取出但暂未执行的请求按原顺序放回队首"""
+        with self._lock:
+            self._queue.extendleft(reversed(requests))
+
+    def _submit(self, op, data):
+        request = ApiRequest(op, data, asyncio.get_running_loop().create_future())
+        with self._lock:
+            if len(self._queue) >= MAX_PENDING:
+                raise ApiError(503, "请求过多，请稍后重试")
+            self._queue.append(request)
+            wake = len(self._queue) == 1
+        if wake:
+            self._notify()
+        return request
+
+    async def _dispatch(self, method, target, headers, body):
+        try:
+            _check_headers(method, headers, self.port)
+            request = self._submit(*_parse_request(method, target, body))
+        except ApiError as e:
+            return e.status, {'error': str(e)}
+        except (ValueError, OverflowError, RecursionError) as e:
+            return 400, {'error': f"无法解析请求: {e}"}
+        return await request.future
+
+    async def _handle(self, reader, writer):
+        """处理一个连接上的请求（支持 HTTP/1.1 长连接）"""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    method, target, version = line.decode('latin-1').split()
+                except ValueError:
+                    writer.write(_response(400, {'error': "无法解析请求行"}, False))
+                    break
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get('content-length') or 0)
+                except ValueError:
+                    length = -1
+                if not 0 <= length <= MAX_BODY:
+                    writer.write(_response(413, {'error': "请求体过大或长度无效"}, False))
+                    break
+                body = await reader.readexactly(length) if length else b''
+                status, payload = await self._dispatch(method, target, headers, body)
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                writer.write(_response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ValueError:
+            # 请求行或请求头超过读取上限（readline 抛出 ValueError）
+            writer.write(_response(400, {'error': "请求行或请求头过长"}, False))
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+def _deliver(requests):
+    for request in requests:
+        if not request.future.done():  # 连接可能已断开
+            request.future.set_result(request.result or (500, {'error': "请求未被执行"}))
+
+
+def apply_requests(model, requests):
+    """在界面线程执行一批请求：添加合并为一次 add_tasks，修改按 id 合并为一次 update_ids，最后执行查询"""
+    adds = [request for request in requests if request.op in ("add", "bulk")]
+    updates = [request for request in requests if request.op == "update"]
+    if adds:
+        ids = iter(model.add_tasks([record for request in adds for record in request.data]))
+        for request in adds:
+            added = list(islice(ids, len(request.data)))
+            request.resolve(201, {'id': added[0]} if request.op == "add" else {'ids': added})
+    if updates:
+        merged = {}
+        for request in updates:
+            task_id, fields = request.data
+            merged.setdefault(task_id, {}).update(fields)  # 同一任务的多次修改，后到的为准
+        model.update_ids(merged)
+        store = model.store()
+        for request in updates:
+            task = store.get(request.data[0])
+            if task is None:
+                request.resolve(404, {'error': f"找不到任务: {request.data[0]}"})
+            else:
+                request.resolve(200, task.to_dict())
+    for request in requests:
+        if request.op == "list":
+            request.resolve(200, {'tasks': _list_tasks(model.store(), **request.data)})
+
+
+def _list_tasks(store, status, search, limit):
+    tasks = (task for task in store.iter_tasks()
+             if (status == "all" or task.status == status) and (not search or matches(search, task.text)))
+    return [task.to_dict() for task in islice(tasks, limit)]
+
+
+class ApiBridge(QObject):
+    """把 ApiServer 排队的请求分批交给界面线程执行
+
+    execute(requests) 在界面线程执行一批请求，返回 False 表示暂不能执行（稍后重试）。
+    """
+    # 服务线程用 postEvent（线程安全）唤醒界面线程
+    RequestsPending = QEvent.Type(QEvent.registerEventType())
+
+    def __init__(self, port, execute, parent=None):
+        super().__init__(parent)
+        self.execute = execute
+        self.batch_count = 0  # 实际执行的批数
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._run_batch)
+        self.server = ApiServer(port, self._notify)
+
+    def start(self):
+        self.server.start()
+
+    def stop(self):
+        self._timer.stop()
+        self.server.stop()
+
+    def _notify(self):
+        QCoreApplication.postEvent(self, QEvent(self.RequestsPending))
+
+    def event(self, event):
+        if event.type() == self.RequestsPending:
+            self._schedule()
+            return True
+        return super().event(event)
+
+    def _schedule(self, delay=API_BATCH_DELAY):
+        if not self._timer.isActive():
+            self._timer.start(delay)
+
+    def _run_batch(self):
+        requests = self.server.take(API_BATCH_SIZE)
+        if not requests:
+            return
+        try:
+            done = self.execute(requests)
+        except Exception as e:
+            print(f"执行接口请求出错: {e}")
+            for request in requests:
+                if request.result is None:  # 出错前已执行的请求保留结果
+                    request.resolve(500, {'error': str(e)})
+            done = True
+        if done is False:
+            self.server.put_back(requests)
+            self._schedule(API_RETRY_DELAY)
+            return
+        self.server.deliver(requests)
+        self.batch_count += 1
+        if self.server.pending():
+            self._schedule(0)  # 剩余的请求留到下一轮事件循环，先让界面绘制
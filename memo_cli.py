@@ -0,0 +1,221 @@
+"""命令行工具：不启动窗口、不导入 Qt，直接读写数据文件，适合脚本和定时任务调用
+
+用法：
+    python memo_cli.py add 9点和李总吃饭 [--due "明天 8点"]
+    python memo_cli.py list [--status todo|complete|cancel|all] [--search 关键字]
+    python memo_cli.py done 3 5
+    python memo_cli.py cancel 4
+    python memo_cli.py rm 7
+    python memo_cli.py stats
+    python memo_cli.py import tickets.csv [--dedupe]
+    python memo_cli.py export backup.jsonl [--status todo]
+    python memo_cli.py archive [--days 30]
+    python memo_cli.py list --archived
+    python memo_cli.py convert memo_data.json memo_data.bin
+
+添加时按文本中的时间（或 --due）设置提醒，到时由正在运行的窗口提醒。
+任务以 id 指定（list 输出的第一列）。整个命令在数据文件锁内完成，与同时运行的命令行
+或窗口程序的写入不会交错。数据文件和存储模式与窗口程序相同，可用 --file、--storage 覆盖。
+"""
+import argparse
+import os
+import sys
+
+from archive import TaskArchive, archive_days, archive_expired, archive_path
+from due_time import format_due_time, parse_due_time
+from file_lock import LockTimeout
+from search_index import matches
+from task_io import FORMATS, convert_snapshot, export_tasks, import_tasks
+from task_list import STATUSES, STATUS_NAMES, Task
+from task_store import DATA_FILE, STORAGE_ENV, STORAGE_MODES, create_store
+
+STATUS_MARKS = {"todo": " ", "complete": "✓", "cancel": "✗"}
+
+
+def cmd_add(store, args):
+    text = " ".join(args.text)
+    if not text.strip():
+        print("任务内容不能为空", file=sys.stderr)
+        return 1
+    due_at = parse_due_time(args.due if args.due else text)
+    if args.due and due_at is None:
+        print(f"无法识别的时间: {args.due}", file=sys.stderr)
+        return 1
+    row = store.add(text, due_at=due_at)
+    print(store[row].id)
+    return 0
+
+
+def cmd_list(store, args):
+    if args.archived:
+        tasks = (Task.from_dict(record) for record in TaskArchive(archive_path(args.file)))
+    else:
+        tasks = store.iter_tasks()
+    for task in tasks:
+        if args.status != "all" and task.status != args.status:
+            continue
+        if args.search and not matches(args.search, task.text):
+            continue
+        due = f"  ⏰ {format_due_time(task.due_at)}" if task.due_at is not None else ""
+        print(f"{task.id:>6} [{STATUS_MARKS.get(task.status, '?')}] {task.text}{due}")
+    return 0
+
+
+def cmd_stats(store, args):
+    counts = store.counts()
+    print(" ".join(f"{STATUS_NAMES[status]}:{counts.get(status, 0)}" for status in STATUSES))
+    return 0
+
+
+def _rows_of(store, ids):
+    """把任务 id 换成行号；有不存在的 id 时返回 None"""
+    rows = []
+    for task_id in dict.fromkeys(ids):  # 去掉重复的 id
+        row = store.row_of(task_id)
+        if row is None:
+            print(f"找不到任务: {task_id}", file=sys.stderr)
+            return None
+        rows.append(row)
+    return rows
+
+
+def set_status_command(status):
+    def command(store, args):
+        rows = _rows_of(store, args.ids)
+        if rows is None:
+            return 1
+        if len(rows) == 1:
+            store.set_status(rows[0], status)
+        else:
+            store.set_status_many(rows, status)
+        return 0
+    return command
+
+
+def cmd_rm(store, args):
+    rows = _rows_of(store, args.ids)
+    if rows is None:
+        return 1
+    if len(rows) == 1:
+        store.remove(rows[0])
+    else:
+        store.remove_many(rows)
+    return 0
+
+
+def cmd_archive(store, args):
+    try:
+        count = archive_expired(store, TaskArchive(archive_path(args.file)), args.days)
+    except OSError as e:
+        print(f"归档出错: {e}", file=sys.stderr)
+        return 1
+    print(f"归档 {count} 条")
+    return 0
+
+
+def cmd_import(store, args):
+    try:
+        added, skipped = import_tasks(store, args.path, args.format, args.dedupe)
+    except (OSError, ValueError) as e:
+        print(f"导入出错: {e}", file=sys.stderr)
+        return 1
+    print(f"导入 {added} 条，跳过 {skipped} 条")
+    return 0
+
+
+def cmd_export(store, args):
+    try:
+        count = export_tasks(store, args.path, args.format, args.status)
+    except (OSError, ValueError) as e:
+        print(f"导出出错: {e}", file=sys.stderr)
+        return 1
+    print(f"导出 {count} 条")
+    return 0
+
+
+def cmd_convert(args):
+    try:
+        count = convert_snapshot(args.src, args.dst)
+    except (OSError, ValueError) as e:
+        print(f"转换出错: {e}", file=sys.stderr)
+        return 1
+    print(f"转换 {count} 条")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Glass Memo 命令行工具")
+    parser.add_argument('--file', default=DATA_FILE, help="数据文件路径（默认与程序同目录的 memo_data.json）")
+    parser.add_argument('--storage', choices=STORAGE_MODES,
+                        default=os.environ.get(STORAGE_ENV, "json"), help="存储模式（默认取环境变量）")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('add', help="添加待办任务，输出新任务的 id")
+    p.add_argument('text', nargs='+')
+    p.add_argument('--due', help="提醒时间（默认取文本中的时间，如“明天9点”）")
+    p.set_defaults(func=cmd_add, writes=True)
+
+    p = commands.add_parser('list', help="列出任务")
+    p.add_argument('--status', choices=STATUSES + ("all",), default="all")
+    p.add_argument('--search', help="只列出包含该关键字的任务")
+    p.add_argument('--archived', action='store_true', help="列出已归档的任务")
+    p.set_defaults(func=cmd_list, writes=False)
+
+    for name, status, help_text in (("done", "complete", "标记为完成"),
+                                    ("cancel", "cancel", "标记为取消"),
+                                    ("todo", "todo", "恢复为待办")):
+        p = commands.add_parser(name, help=help_text)
+        p.add_argument('ids', type=int, nargs='+')
+        p.set_defaults(func=set_status_command(status), writes=True)
+
+    p = commands.add_parser('rm', help="删除任务")
+    p.add_argument('ids', type=int, nargs='+')
+    p.set_defaults(func=cmd_rm, writes=True)
+
+    p = commands.add_parser('stats', help="各状态的任务数")
+    p.set_defaults(func=cmd_stats, writes=False)
+
+    p = commands.add_parser('archive', help="把结束超过一定天数的任务移入归档文件")
+    p.add_argument('--days', type=float, default=archive_days(),
+                   help="默认取环境变量 GLASS_MEMO_ARCHIVE_DAYS，未设置时为 30")
+    p.set_defaults(func=cmd_archive, writes=True)
+
+    p = commands.add_parser('import', help="从 JSON 数组、JSONL 或 CSV 文件批量导入任务")
+    p.add_argument('path')
+    p.add_argument('--format', choices=FORMATS, help="默认按扩展名判断")
+    p.add_argument('--dedupe', action='store_true', help="跳过文本与已有任务相同的记录")
+    p.set_defaults(func=cmd_import, writes=True)
+
+    p = commands.add_parser('export', help="把任务导出为 JSON 数组、JSONL 或 CSV 文件")
+    p.add_argument('path')
+    p.add_argument('--format', choices=FORMATS, help="默认按扩展名判断")
+    p.add_argument('--status', choices=STATUSES, help="只导出该状态的任务")
+    p.set_defaults(func=cmd_export, writes=False)
+
+    p = commands.add_parser('convert', help="在 JSON 快照和二进制快照之间转换（按源文件格式判断方向）")
+    p.add_argument('src')
+    p.add_argument('dst')
+    p.set_defaults(func=cmd_convert, writes=False, standalone=True)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'standalone', False):  # 只处理命令行给出的文件，不打开数据文件
+        return args.func(args)
+    store = create_store(args.file, args.storage)
+    try:
+        # 读取、修改和保存都在锁内完成，期间其他进程的写入会等待
+        with store.locked():
+            store.load()
+            status = args.func(store, args)
+            if args.writes and status == 0:
+                store.close()
+    except LockTimeout as e:
+        print(e, file=sys.stderr)
+        return 2
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""可选的热点操作计时：调用次数、延迟直方图，以及信号链引起的嵌套和重入调用
+
+通过环境变量 GLASS_MEMO_PROFILE=1 或命令行参数 --profile 开启；未开启时不包装任何方法。
+"""
+import functools
+import json
+import os
+import threading
+import time
+
+PROFILE_ENV = "GLASS_MEMO_PROFILE"
+# 直方图各桶的上界（毫秒），最后一桶收集更慢的调用
+BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+
+def profiling_requested(argv=()):
+    """环境变量或命令行是否要求开启计时"""
+    return "--profile" in argv or os.environ.get(PROFILE_ENV, "") not in ("", "0")
+
+
+class OpStats:
+    """单个操作的统计"""
+    __slots__ = ('count', 'total', 'max', 'nested', 'reentrant', 'histogram')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.nested = 0     # 在另一个被计时的操作内部发生的调用
+        self.reentrant = 0  # 同一操作尚未返回时再次进入
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+
+    def record(self, elapsed, nested, reentrant):
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        self.nested += nested
+        self.reentrant += reentrant
+        ms = elapsed * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+    def percentile(self, p):
+        """按直方图估算的 p 分位延迟（桶上界，毫秒）"""
+        target = self.count * p
+        seen = 0
+        for bound, n in zip(BUCKETS_MS, self.histogram):
+            seen += n
+            if seen >= target:
+                return min(bound, round(self.max * 1000, 3))
+        return round(self.max * 1000, 3)
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'total_ms': round(self.total * 1000, 3),
+            'mean_ms': round(self.total * 1000 / self.count, 3) if self.count else 0,
+            'p50_ms': self.percentile(0.5),
+            'p95_ms': self.percentile(0.95),
+            'max_ms': round(self.max * 1000, 3),
+            'nested': self.nested,
+            'reentrant': self.reentrant,
+            'histogram': {f"<={bound}ms": n for bound, n in zip(BUCKETS_MS, self.histogram)}
+                         | {f">{BUCKETS_MS[-1]}ms": self.histogram[-1]},
+        }
+
+
+class Profiler:
+    """包装对象的方法并记录耗时；可在多个线程中使用"""
+
+    def __init__(self):
+        self._stats = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()  # 每个线程正在执行的操作栈
+
+    def wrap(self, name, func):
+        """返回记录 name 耗时的包装函数"""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            stack = self._local.__dict__.setdefault('stack', [])
+            nested = bool(stack)
+            reentrant = name in stack
+            stack.append(name)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                stack.pop()
+                self.record(name, elapsed, nested, reentrant)
+        return wrapper
+
+    def instrument(self, obj, names, prefix=""):
+        """用包装函数替换 obj 上的方法（需在连接信号之前调用）"""
+        for name in names:
+            setattr(obj, name, self.wrap(prefix + name, getattr(obj, name)))
+
+    def instrument_jobs(self, obj, method, prefix=""):
+        """包装返回后台任务的方法（如 TaskStore.save_job），任务执行的耗时另记为 <方法名>.run"""
+        factory = self.wrap(prefix + method, getattr(obj, method))
+        job_name = prefix + method + ".run"
+
+        @functools.wraps(factory)
+        def wrapper():
+            job = factory()
+            return None if job is None else self.wrap(job_name, job)
+        setattr(obj, method, wrapper)
+
+    def record(self, name, elapsed, nested=False, reentrant=False):
+        with self._lock:
+            stats = self._stats.get(name)
+            if stats is None:
+                stats = self._stats[name] = OpStats()
+            stats.record(elapsed, nested, reentrant)
+
+    def snapshot(self):
+        """返回 {操作名: 统计字典}"""
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in sorted(self._stats.items())}
+
+    def report(self):
+        """浮层中显示的文字表格"""
+        # 表头每个汉字占两列，宽度相应减小
+        lines = [f"{'操作':<22}{'次数':>4}{'p50':>8}{'p95':>8}{'最大':>7}{'嵌套':>4}{'重入':>3}"]
+        for name, s in self.snapshot().items():
+            lines.append(f"{name:<24}{s['count']:>6}{s['p50_ms']:>8.2f}{s['p95_ms']:>8.2f}"
+                         f"{s['max_ms']:>9.2f}{s['nested']:>6}{s['reentrant']:>5}")
+        return "\n".join(lines)
+
+    def dump(self, path):
+        """把统计写入 JSON 文件"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
@@ -0,0 +1,136 @@
+"""提醒调度：带提醒时间的待办任务都放在一个最小堆中，只用一个定时器等待最早的提醒"""
+import heapq
+import itertools
+import math
+import time
+
+from PySide6.QtCore import QObject, QTimer, Qt, Signal
+
+# 定时器一次最长等待的时间（毫秒）；系统休眠或调整时钟后，最多晚这么久发现已到期的提醒
+MAX_WAIT = 60 * 60 * 1000
+# 已取消的条目超过此数量且多于有效条目时重建堆
+COMPACT_MIN = 1024
+
+
+class ReminderScheduler(QObject):
+    """提醒时间的最小堆，加一个每次重新设定的单次定时器
+
+    安排、改期和取消都是 O(log n)：取消只把堆中的条目标记为失效，失效条目多于有效条目时整体重建堆
+    （均摊 O(1)）。空闲时只有一个定时器在等待最早的提醒，任务再多也不轮询。
+    已经提醒过的任务记下当时的提醒时间，之后再安排同一时间（整体刷新、修改文本等）不会重复提醒。
+    """
+    reminders_due = Signal(list)  # 到期的任务 id，同时到期的合并为一次
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._heap = []      # [提醒时间, 序号, 任务 id]，任务 id 为 None 表示已取消
+        self._entries = {}   # 任务 id -> 堆中的有效条目
+        self._stale = 0      # 堆中已取消的条目数
+        self._fired = {}     # 已提醒过的任务 id -> 提醒时间
+        self._counter = itertools.count()  # 提醒时间相同时按安排顺序到期，也避免比较任务 id
+        self._armed = None   # 定时器正在等待的提醒时间
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._fire)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def due_at(self, task_id):
+        """任务已安排的提醒时间，没有安排时返回 None"""
+        entry = self._entries.get(task_id)
+        return None if entry is None else entry[0]
+
+    def next_due(self):
+        """最早的提醒时间，没有提醒时返回 None"""
+        return self._armed
+
+    def schedule(self, task_id, due_at):
+        """安排任务在 due_at（Unix 秒）提醒；已安排过的任务改到新时间，已在该时间提醒过的不再安排"""
+        if task_id in self._fired:
+            if self._fired[task_id] == due_at:
+                return
+            del self._fired[task_id]
+        old = self._entries.get(task_id)
+        if old is not None:
+            if old[0] == due_at:
+                return
+            self._invalidate(old)
+        entry = [due_at, next(self._counter), task_id]
+        self._entries[task_id] = entry
+        heapq.heappush(self._heap, entry)
+        self._rearm()
+
+    def cancel(self, task_id):
+        """取消任务的提醒，没有安排时什么也不做"""
+        self._fired.pop(task_id, None)
+        entry = self._entries.get(task_id)
+        if entry is None:
+            return
+        self._invalidate(entry)
+        self._rearm()
+
+    def reset(self, items):
+        """用 (任务 id, 提醒时间) 整体替换全部提醒，一次建堆 O(n)（载入或整体刷新时使用）
+
+        已在同一时间提醒过的任务保持已提醒，不会因为整体刷新再次提醒。
+        """
+        fired, self._fired = self._fired, {}
+        self._entries = {}
+        for task_id, due_at in items:
+            if fired.get(task_id) == due_at:
+                self._fired[task_id] = due_at
+            else:
+                self._entries[task_id] = [due_at, next(self._counter), task_id]
+        self._heap = list(self._entries.values())
+        heapq.heapify(self._heap)
+        self._stale = 0
+        self._rearm()
+
+    def clear(self):
+        self.reset(())
+
+    def _invalidate(self, entry):
+        """把堆中的条目标记为失效；失效条目过多时重建堆"""
+        self._entries.pop(entry[2], None)
+        entry[2] = None
+        self._stale += 1
+        if self._stale > COMPACT_MIN and self._stale > len(self._entries):
+            self._heap = list(self._entries.values())
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _rearm(self):
+        """让定时器等待堆顶（最早）的提醒；堆顶没有变化时不重新设定"""
+        heap = self._heap
+        while heap and heap[0][2] is None:
+            heapq.heappop(heap)
+            self._stale -= 1
+        due_at = heap[0][0] if heap else None
+        if due_at == self._armed:
+            return
+        self._armed = due_at
+        if due_at is None:
+            self._timer.stop()
+            return
+        wait = math.ceil((due_at - time.time()) * 1000)
+        self._timer.start(min(max(wait, 0), MAX_WAIT))
+
+    def _fire(self):
+        """取出所有已到期的提醒并发出信号，再等待下一个"""
+        now = time.time()
+        heap = self._heap
+        due = []
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)
+            if entry[2] is None:
+                self._stale -= 1
+                continue
+            del self._entries[entry[2]]
+            self._fired[entry[2]] = entry[0]
+            due.append(entry[2])
+        self._armed = None
+        self._rearm()
+        if due:
+            self.reminders_due.emit(due)
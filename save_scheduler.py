@@ -0,0 +1,62 @@
+from PySide6.QtCore import QObject, QThreadPool, QTimer, Signal
+
+SAVE_DELAY = 300  # 合并修改的时间窗口（毫秒）
+
+
+class SaveScheduler(QObject):
+    """合并短时间内的多次修改，只在后台线程写一次文件"""
+
+    # 后台读取完成（在写入线程发出，由界面线程接收）：(回调, 结果)
+    job_done = Signal(object, object)
+
+    def __init__(self, store, delay=SAVE_DELAY, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.save_count = 0  # 实际发起的写入次数
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(delay)
+        self._timer.timeout.connect(self._start_save)
+        # 单线程池保证写入按提交顺序执行，新快照不会被旧快照覆盖
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(1)
+        self.job_done.connect(self._deliver)
+
+    def schedule(self):
+        """标记有修改；时间窗口内的多次修改只保存一次"""
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _start_save(self):
+        job = self.store.save_job()  # 在界面线程取快照，耗时的序列化和写盘交给线程池
+        if job is not None:
+            self.save_count += 1
+            self._pool.start(lambda: self._run(job))
+
+    @staticmethod
+    def _run(job):
+        try:
+            job()
+        except Exception as e:
+            print(f"保存数据出错: {e}")
+
+    def run(self, job, done):
+        """在写入线程执行 job（排在已提交的写入之后），在界面线程把结果传给 done；出错时传入 None"""
+        def task():
+            try:
+                result = job()
+            except Exception as e:
+                print(f"读取数据出错: {e}")
+                result = None
+            self.job_done.emit(done, result)
+        self._pool.start(task)
+
+    def _deliver(self, done, result):
+        done(result)
+
+    def flush(self):
+        """立即保存尚未写入的修改并等待所有写入完成（退出前调用）"""
+        if self._timer.isActive():
+            self._timer.stop()
+            self._start_save()
+        self._pool.waitForDone()
@@ -0,0 +1,133 @@
+"""任务文本的字符 n-gram 倒排索引：中文没有空格分词，按单字和相邻两字建索引"""
+from array import array
+from itertools import islice
+
+
+def fold(text):
+    """统一大小写，搜索不区分大小写"""
+    return text.casefold()
+
+
+def _grams(folded):
+    """文本中出现的全部单字和相邻两字"""
+    grams = set(folded)
+    grams.update(map(str.__add__, folded, folded[1:]))
+    return grams
+
+
+def matches(query, text):
+    """text 是否包含 query（不区分大小写）"""
+    return fold(query) in fold(text)
+
+
+class SearchIndex:
+    """n-gram -> 文档号数组；随任务增删增量更新
+
+    每个任务（键）分配一个文档号，倒排表用紧凑的整数数组而不是集合，
+    每条记录只占 4 字节，也不会产生大量需要垃圾回收跟踪的对象。
+    删除时只做标记，查询时跳过已删除的文档号；标记过多时清理倒排表并重新编号。
+
+    build=False 时先不建立，由 build(limit) 分批索引 items（期间的增删改照常调用，
+    尚未索引到的键记入 _skip，轮到时跳过），第一次查询时补完剩余部分。
+    """
+
+    def __init__(self, items=(), build=True):
+        self._postings = {}  # n-gram -> array('i') 文档号
+        self._keys = []      # 文档号 -> 键（已删除为 None）
+        self._docs = {}      # 键 -> 文档号
+        self._removed = 0    # 倒排表中尚未清理的已删除文档数
+        self._pending = iter(items)  # 尚未索引的 (键, 文本)，建完后为 None
+        self._skip = set()   # 建立期间已单独处理过、轮到时跳过的键
+        if build:
+            self.build()
+
+    def __len__(self):
+        return len(self._docs)
+
+    def build(self, limit=None):
+        """继续索引尚未索引的项，最多 limit 项（None 为全部），返回是否已全部建完"""
+        if self._pending is None:
+            return True
+        skip = self._skip
+        count = 0
+        for key, text in islice(self._pending, limit):
+            count += 1
+            if key in skip:
+                skip.discard(key)
+            else:
+                self._add(key, text)
+        if limit is not None and count == limit:
+            return False
+        self._pending = None
+        self._skip = set()
+        return True
+
+    def add(self, key, text):
+        if self._pending is not None:
+            self._skip.add(key)
+        self._add(key, text)
+
+    def _add(self, key, text):
+        doc = len(self._keys)
+        self._keys.append(key)
+        self._docs[key] = doc
+        postings = self._postings
+        for gram in _grams(fold(text)):
+            docs = postings.get(gram)
+            if docs is None:
+                postings[gram] = array('i', (doc,))
+            else:
+                docs.append(doc)
+
+    def remove(self, key):
+        if key not in self._docs and self._pending is not None:
+            self._skip.add(key)  # 还没索引到
+            return
+        # 只把文档号标记为已删除，倒排表中的失效记录在数量过多时统一清理
+        doc = self._docs.pop(key)
+        self._keys[doc] = None
+        self._removed += 1
+        if self._removed > len(self._docs):
+            self._compact()
+
+    def _compact(self):
+        """从倒排表中清除已删除的文档号，其余文档按原顺序重新编号，_keys 随之收缩"""
+        renumber = array('i', [-1]) * len(self._keys)  # 旧文档号 -> 新文档号（已删除为 -1）
+        keys = []
+        for doc, key in enumerate(self._keys):
+            if key is not None:
+                renumber[doc] = len(keys)
+                keys.append(key)
+        for gram, docs in list(self._postings.items()):
+            alive = array('i', [renumber[doc] for doc in docs if renumber[doc] >= 0])
+            if alive:
+                self._postings[gram] = alive
+            else:
+                del self._postings[gram]
+        self._keys = keys
+        self._docs = {key: doc for doc, key in enumerate(keys)}
+        self._removed = 0
+
+    def update(self, key, text):
+        """任务文本修改后更新索引"""
+        self.remove(key)
+        self.add(key, text)
+
+    def candidates(self, query):
+        """返回可能包含 query 的任务键列表，以及结果是否已确定无误
+
+        一两个字的查询直接命中对应的倒排表；更长的查询取各个两字片段的交集，
+        可能包含片段都出现但不相邻的任务，需要调用方再用 matches 核对。
+        """
+        self.build()
+        folded = fold(query)
+        if len(folded) <= 2:
+            docs = self._postings.get(folded, ())
+            exact = True
+        else:
+            postings = sorted((self._postings.get(folded[i:i + 2], ()) for i in range(len(folded) - 1)),
+                              key=len)
+            docs = set(postings[0]).intersection(*postings[1:]) if postings[0] else ()
+            exact = not docs
+        keys = self._keys
+        return [keys[doc] for doc in docs if keys[doc] is not None], exact
@@ -0,0 +1,158 @@
+"""任务的批量导入和导出：JSONL、CSV 和 memo_data.json 使用的 JSON 数组格式，
+以及 JSON 快照与二进制快照之间的转换
+
+导入和导出都逐条读写，内存占用与文件大小无关；导入的任务作为一次修改加入存储。
+只依赖数据层，不需要创建窗口。
+"""
+import csv
+import json
+import os
+
+from binary_snapshot import BinarySnapshot, is_binary_snapshot, write_binary_temp
+from due_time import parse_timestamp
+from task_list import STATUSES, TaskList
+from task_store import iter_json_array, read_snapshot, starts_with_array, write_temp
+
+FORMATS = ("json", "jsonl", "csv")
+CSV_FIELDS = ("id", "text", "status", "due_at", "done_at")
+TIME_FIELDS = ("due_at", "done_at")
+_EXTENSIONS = {'.jsonl': "jsonl", '.ndjson': "jsonl", '.csv': "csv", '.json': "json"}
+
+
+def guess_format(path):
+    """按扩展名判断文件格式，无法判断时按 JSON 数组处理"""
+    return _EXTENSIONS.get(os.path.splitext(path)[1].lower(), "json")
+
+
+def _timestamp(value, field, where):
+    """导入记录中的时间，与本机接口的 due_at 按同样的规则检查；CSV 的空单元格为没有，数字文本为 Unix 秒"""
+    if isinstance(value, str):
+        value = value.strip() or None
+        try:
+            value = float(value) if value is not None else None
+        except ValueError:
+            pass  # 时间文本
+    try:
+        return parse_timestamp(value, field)
+    except ValueError as e:
+        raise ValueError(f"{where}: {e}")
+
+
+def _record(data, where):
+    """检查一条导入记录，返回 {'text', 'status'}，有提醒、完成时间时带 due_at、done_at；
+    不带 id，导入的任务由存储分配新的 id
+    """
+    if not isinstance(data, dict) or not isinstance(data.get('text'), str):
+        raise ValueError(f"{where}: 缺少 text 字段")
+    status = data.get('status') or "todo"
+    if status not in STATUSES:
+        raise ValueError(f"{where}: 未知状态 {status!r}")
+    record = {'text': data['text'], 'status': status}
+    for field in TIME_FIELDS:
+        value = _timestamp(data.get(field), field, where)
+        if value is not None:
+            record[field] = value
+    return record
+
+
+def read_records(path, fmt=None):
+    """逐条产出文件中的任务记录 {'text', 'status'[, 'due_at', 'done_at']}"""
+    fmt = fmt or guess_format(path)
+    if fmt == "jsonl":
+        with open(path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if line.strip():
+                    yield _record(json.loads(line), f"第 {line_no} 行")
+    elif fmt == "csv":
+        # utf-8-sig 兼容 Excel 导出的 BOM
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            if 'text' not in (reader.fieldnames or ()):
+                raise ValueError("CSV 文件第一行需要包含 text 列")
+            for data in reader:
+                yield _record(data, f"第 {reader.line_num} 行")
+    elif fmt == "json":
+        if starts_with_array(path):
+            for i, (data, _) in enumerate(iter_json_array(path), 1):
+                yield _record(data, f"第 {i} 条")
+        else:  # 日志模式的快照对象
+            for i, data in enumerate(read_snapshot(path)[1], 1):
+                yield _record(data, f"第 {i} 条")
+    else:
+        raise ValueError(f"未知格式: {fmt}")
+
+
+def import_tasks(store, path, fmt=None, dedupe=False):
+    """把文件中的任务作为一批加入 store，返回 (导入数, 跳过数)
+
+    空文本总是跳过；dedupe 为 True 时跳过与已有任务或前面记录文本相同的任务。
+    文件中有错误记录时抛出 ValueError，store 保持不变。
+    """
+    seen = {task.text for task in store.iter_tasks()} if dedupe else None
+    skipped = 0
+
+    def accepted():
+        nonlocal skipped
+        for record in read_records(path, fmt):
+            text = record['text']
+            if not text.strip() or (seen is not None and text in seen):
+                skipped += 1
+                continue
+            if seen is not None:
+                seen.add(text)
+            yield record
+
+    added = store.add_many(accepted())
+    return len(added), skipped
+
+
+def export_tasks(store, path, fmt=None, status=None):
+    """按显示顺序把任务写入文件（先写临时文件再替换），status 不为空时只导出该状态，返回导出数"""
+    fmt = fmt or guess_format(path)
+    if fmt not in FORMATS:
+        raise ValueError(f"未知格式: {fmt}")
+    count = 0
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(CSV_FIELDS)
+        elif fmt == "json":
+            f.write("[")
+        for task in store.iter_tasks():
+            if status is not None and task.status != status:
+                continue
+            if fmt == "csv":
+                writer.writerow((task.id, task.text, task.status, '' if task.due_at is None else task.due_at,
+                                 '' if task.done_at is None else task.done_at))
+            else:
+                line = json.dumps(task.to_dict(), ensure_ascii=False)
+                if fmt == "jsonl":
+                    f.write(line + "\n")
+                else:
+                    f.write(("," if count else "") + "\n  " + line)
+            count += 1
+        if fmt == "json":
+            f.write("\n]\n")
+    os.replace(tmp_path, path)
+    return count
+
+
+def convert_snapshot(src, dst):
+    """在 JSON 快照和二进制快照之间转换（按 src 的格式决定方向），id、顺序键、完成时间和日志序号
+    原样保留，返回任务数
+    """
+    if is_binary_snapshot(src):
+        snapshot = BinarySnapshot(src)
+        try:
+            tmp_path = write_temp(dst, {'seq': snapshot.seq, 'tasks': snapshot.snapshot()}, indent=2)
+            count = len(snapshot)
+        finally:
+            snapshot.close()
+    else:
+        seq, tasks = read_snapshot(src)
+        tasks = TaskList(tasks).snapshot()  # 旧数据补上 id 和顺序键
+        tmp_path = write_binary_temp(dst, tasks, seq)
+        count = len(tasks)
+    os.replace(tmp_path, dst)
+    return count
@@ -0,0 +1,413 @@
+import bisect
+import math
+import time
+
+from search_index import SearchIndex, matches
+
+# 任务状态；已结束的状态排在待办之后
+STATUSES = ("todo", "complete", "cancel")
+FINISHED_STATUSES = ("complete", "cancel")
+# 任务状态的显示名称
+STATUS_NAMES = {"todo": "代办", "complete": "完成", "cancel": "取消"}
+# 拖动排序时新顺序键取相邻两键的中点；相邻键的差小于此值时应重新编号
+MIN_ORDER_GAP = 2 ** -16
+# 状态字符串统一指向同一个对象，避免每条任务各存一份
+_INTERNED_STATUSES = {status: status for status in STATUSES}
+
+
+class Task:
+    """单条任务记录；__slots__ 省去实例字典，不含文本时每条约 80 字节
+
+    id 是任务的持久编号，保存在数据文件中，排序和增删都不会改变它。
+    done_at 是任务改为已结束状态的时间（Unix 秒），待办任务为 None，用于归档。
+    due_at 是提醒时间（Unix 秒），没有提醒时为 None。
+    """
+    __slots__ = ('id', 'text', 'status', 'order', 'done_at', 'due_at')
+
+    def __init__(self, text, status="todo", order=0, task_id=None, done_at=None, due_at=None):
+        self.id = task_id
+        self.text = text
+        self.status = _INTERNED_STATUSES.get(status, status)
+        self.order = order
+        self.done_at = done_at
+        self.due_at = due_at
+
+    @classmethod
+    def from_dict(cls, data, order=0):
+        """从 JSON 字典创建；字典中带 order 时优先使用，旧数据没有 id 时为 None"""
+        return cls(data['text'], data['status'], data.get('order', order), data.get('id'),
+                   data.get('done_at'), data.get('due_at'))
+
+    def to_dict(self, with_order=False):
+        """转换为用于保存的字典；待办任务不写 done_at，没有提醒时不写 due_at"""
+        data = {'id': self.id, 'text': self.text, 'status': self.status}
+        if with_order:
+            data['order'] = self.order
+        if self.done_at is not None:
+            data['done_at'] = self.done_at
+        if self.due_at is not None:
+            data['due_at'] = self.due_at
+        return data
+
+    def __repr__(self):
+        return (f"Task({self.text!r}, {self.status!r}, {self.order!r}, {self.id!r}, {self.done_at!r}, "
+                f"{self.due_at!r})")
+
+
+def finish_time(status, now=None):
+    """新设为 status 时记录的完成时间：已结束状态为 now（默认当前时间），待办为 None"""
+    if status not in FINISHED_STATUSES:
+        return None
+    return int(time.time()) if now is None else now
+
+
+def done_time(task, status, now=None):
+    """任务改为 status 后的完成时间；状态不变时保留原来的时间"""
+    if task.status == status and task.done_at is not None:
+        return task.done_at
+    return finish_time(status, now)
+
+
+def order_between(before, after):
+    """排在顺序键 before 和 after 之间的新顺序键；None 表示该侧没有任务
+
+    顺序键是浮点数，取中点后只需修改被移动的一条任务；
+    在同一位置反复插入几十次后才会耗尽精度，MIN_ORDER_GAP 留有余量。
+    """
+    if before is None:
+        return 0 if after is None else after - 1
+    if after is None:
+        return before + 1
+    return (before + after) / 2
+
+
+def next_order_after(order):
+    """比 order 大的最小整数顺序键（新任务排在所有已有任务之后）"""
+    return math.floor(order) + 1
+
+
+def _sort_key(task):
+    """排序键：(是否已结束, 组内顺序, id)
+
+    拖动时的顺序键只与本组相邻任务比较，另一组可能有相同的键，任务改变状态后两者并列，此时按 id 排。
+    """
+    return (task.status in FINISHED_STATUSES, task.order, task.id)
+
+
+class StatusCounter:
+    """按状态维护任务数量，随增删改增量更新"""
+
+    def __init__(self, tasks=()):
+        self._counts = dict.fromkeys(STATUSES, 0)
+        for task in tasks:
+            self.add(task.status)
+
+    def __getitem__(self, status):
+        return self._counts.get(status, 0)
+
+    def add(self, status, n=1):
+        self._counts[status] = self._counts.get(status, 0) + n
+
+    def remove(self, status):
+        self._counts[status] -= 1
+
+    def counts(self):
+        """返回 {状态: 数量}"""
+        return dict(self._counts)
+
+
+class TaskCounts:
+    """全部任务及筛选子集的状态计数"""
+
+    def __init__(self):
+        self.counter = StatusCounter()
+        self._filter = None
+        self.filtered_counter = None
+
+    def reset(self, tasks, counter=None):
+        """重新统计；已知各状态数量时可直接传入 counter"""
+        self.counter = counter if counter is not None else StatusCounter(tasks)
+        self.set_filter(self._filter, tasks)
+
+    def set_filter(self, predicate, tasks):
+        """设置筛选条件（task -> bool）并统计匹配的任务，None 表示不筛选"""
+        self._filter = predicate
+        if predicate is None:
+            self.filtered_counter = None
+        else:
+            self.filtered_counter = StatusCounter(t for t in tasks if predicate(t))
+
+    def counts(self, filtered=False):
+        """返回各状态数量；filtered 为 True 且设置了筛选条件时只统计匹配的任务"""
+        if filtered and self.filtered_counter is not None:
+            return self.filtered_counter.counts()
+        return self.counter.counts()
+
+    def add(self, task):
+        self.counter.add(task.status)
+        if self._filter is not None and self._filter(task):
+            self.filtered_counter.add(task.status)
+
+    def remove(self, task):
+        self.counter.remove(task.status)
+        if self._filter is not None and self._filter(task):
+            self.filtered_counter.remove(task.status)
+
+
+class TaskList:
+    """按状态分组的有序任务列表：待办在前，已结束在后，组内按 order 排列
+
+    另有 id -> 任务的哈希索引；任务所在行由其排序键二分查找得到，列表重排后依然正确。
+    """
+
+    def __init__(self, tasks=()):
+        self._counts = TaskCounts()
+        self._index = None  # 文本索引，第一次搜索时才建立
+        self.reset(tasks)
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """用 id 互不相同的任务记录（如二进制快照解码出的）建立列表，不经过字典转换
+
+        记录一般已按显示顺序排列（旧版快照中顺序键相同的任务可能不按 id），排序接近线性。
+        """
+        task_list = cls()
+        task_list._tasks = sorted(tasks, key=_sort_key)
+        task_list._by_id = {task.id: task for task in task_list._tasks}
+        task_list._next_id = max(task_list._by_id, default=0) + 1
+        task_list._next_order = next_order_after(max((t.order for t in task_list._tasks), default=-1))
+        task_list._counts.reset(task_list._tasks)
+        return task_list
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __getitem__(self, row):
+        return self._tasks[row]
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def reset(self, tasks):
+        """用任务列表重建；任务带 order 时沿用，否则按原有相对顺序编号"""
+        items = [Task.from_dict(t, i) for i, t in enumerate(tasks)]
+        self._by_id = {}
+        self._next_id = max((t.id for t in items if t.id is not None), default=0) + 1
+        for task in items:
+            self._register(task)
+        self._tasks = sorted(items, key=_sort_key)
+        self._next_order = next_order_after(max((t.order for t in items), default=-1))
+        self._counts.reset(self._tasks)
+        self._index = None
+
+    def extend(self, tasks):
+        """在末尾追加一批任务（用于分批加载），返回追加后是否仍然有序"""
+        first = len(self._tasks)
+        for t in tasks:
+            task = Task.from_dict(t, self._next_order)
+            self._next_order = max(self._next_order, next_order_after(task.order))
+            self._register(task)
+            self._tasks.append(task)
+            self._counts.add(task)
+            if self._index is not None:
+                self._index.add(task, task.text)
+        keys = [_sort_key(t) for t in self._tasks[max(first - 1, 0):]]
+        return all(a < b for a, b in zip(keys, keys[1:]))
+
+    def _register(self, task):
+        """把任务加入 id 索引；没有 id 或 id 重复时分配新的 id"""
+        if task.id is None or task.id in self._by_id:
+            task.id = self._next_id
+        if task.done_at is None and task.status in FINISHED_STATUSES:
+            task.done_at = int(time.time())  # 新建的以及旧数据中的已结束任务从此刻开始计时
+        self._next_id = max(self._next_id, task.id + 1)
+        self._by_id[task.id] = task
+
+    def get(self, task_id):
+        """按 id 返回任务，不存在时返回 None"""
+        return self._by_id.get(task_id)
+
+    def row_of(self, task_id):
+        """返回 id 对应任务所在的行号，不存在时返回 None"""
+        task = self._by_id.get(task_id)
+        return None if task is None else self.position(task.status, task.order, task_id)
+
+    def subset(self, ids):
+        """返回只含指定任务（副本）的 TaskList，新任务的顺序键和 id 与本列表接着分配；用于预演少量操作"""
+        part = TaskList(task.to_dict(with_order=True) for task in map(self._by_id.get, ids) if task is not None)
+        part._next_order = max(part._next_order, self._next_order)
+        part._next_id = max(part._next_id, self._next_id)
+        return part
+
+    def reorder(self):
+        """按当前顺序重新编号顺序键；行的先后不变，任务对象和 id 索引保持不动"""
+        for i, task in enumerate(self._tasks):
+            task.order = i
+        self._next_order = len(self._tasks)
+
+    def resort(self):
+        """extend 打乱顺序后重新排序"""
+        self._tasks.sort(key=_sort_key)
+
+    def set_filter(self, predicate, matched=None):
+        """设置统计用的筛选条件（task -> bool），None 表示不筛选；已知匹配的任务时可传入 matched"""
+        self._counts.set_filter(predicate, self._tasks if matched is None else matched)
+
+    def counts(self, filtered=False):
+        """返回各状态数量；filtered 为 True 且设置了筛选条件时只统计匹配的任务"""
+        return self._counts.counts(filtered)
+
+    def tasks(self):
+        """返回用于保存的任务列表（按当前顺序）"""
+        return [t.to_dict() for t in self._tasks]
+
+    def snapshot(self):
+        """返回带顺序键的任务字典，可原样传回 reset 恢复"""
+        return [t.to_dict(with_order=True) for t in self._tasks]
+
+    def prepare_search(self, limit=None):
+        """建立文本索引（之后随增删增量更新）；给出 limit 时这次最多索引 limit 个任务，返回是否已建完"""
+        if self._index is None:
+            # 文本在索引到时才读取，期间修改过的任务由索引自己跳过
+            self._index = SearchIndex(((t, t.text) for t in list(self._tasks)), build=False)
+        return self._index.build(limit)
+
+    def search(self, query):
+        """返回文本包含 query 的任务（按显示顺序）"""
+        self.prepare_search()
+        candidates, exact = self._index.candidates(query)
+        if len(candidates) > len(self._tasks) // 8:
+            candidates = set(candidates)
+            found = [t for t in self._tasks if t in candidates]  # 结果很多时顺序扫描比排序快
+        else:
+            found = sorted(candidates, key=_sort_key)
+        if exact:
+            return found
+        return [t for t in found if matches(query, t.text)]
+
+    def position(self, status, order, task_id=None):
+        """二分查找具有该状态、顺序键和 id 的任务应处的行号；不给 id 时为顺序键相同的任务之前"""
+        key = (status in FINISHED_STATUSES, order)
+        if task_id is not None:
+            key += (task_id,)
+        return bisect.bisect_left(self._tasks, key, key=_sort_key)
+
+    def add(self, text, status="todo", task_id=None, done_at=None, order=None, due_at=None):
+        """添加任务到所在分组末尾（给出 order 时按该顺序键插入），返回行号；task_id 为空时分配新的 id"""
+        if order is None:
+            order = self._next_order
+        task = Task(text, status, order, task_id, done_at, due_at)
+        self._next_order = max(self._next_order, next_order_after(order))
+        self._register(task)
+        row = self.position(status, task.order, task.id)
+        self._tasks.insert(row, task)
+        self._counts.add(task)
+        if self._index is not None:
+            self._index.add(task, text)
+        return row
+
+    def add_many(self, records):
+        """把一批任务字典（text、status，可带 id、due_at）加到各自分组末尾，整体重建一次列表，返回添加的任务
+
+        records 可以是迭代器；读取中途出错时列表保持不变。
+        """
+        added, todo, finished = [], [], []
+        order = self._next_order
+        for data in records:
+            task = Task(data['text'], data.get('status', "todo"), order, data.get('id'),
+                        data.get('done_at'), data.get('due_at'))
+            order += 1
+            added.append(task)
+            (finished if task.status in FINISHED_STATUSES else todo).append(task)
+        self._next_order = order
+        for task in added:  # 按输入顺序分配 id
+            self._register(task)
+            self._counts.add(task)
+            if self._index is not None:
+                self._index.add(task, task.text)
+        # 新任务的顺序键大于已有任务，待办接在待办分组末尾，已结束的接在列表末尾
+        split = bisect.bisect_left(self._tasks, (True,), key=_sort_key)
+        self._tasks[split:split] = todo
+        self._tasks.extend(finished)
+        return added
+
+    def remove(self, row):
+        """删除指定行，返回被删除的任务"""
+        task = self._tasks.pop(row)
+        del self._by_id[task.id]
+        self._counts.remove(task)
+        if self._index is not None:
+            self._index.remove(task)
+        return task
+
+    def remove_many(self, rows):
+        """删除多行（整体重建一次列表），返回被删除的任务"""
+        rows = set(rows)
+        removed = [self._tasks[row] for row in sorted(rows)]
+        self._tasks = [t for i, t in enumerate(self._tasks) if i not in rows]
+        for task in removed:
+            del self._by_id[task.id]
+            self._counts.remove(task)
+            if self._index is not None:
+                self._index.remove(task)
+        return removed
+
+    def move_target(self, row, status):
+        """返回该行改为 status 后应处的行号（按删除该行后的列表计算）"""
+        task = self._tasks[row]
+        target = self.position(status, task.order, task.id)
+        return target - 1 if target > row else target
+
+    def set_status(self, row, status, now=None):
+        """修改状态并把该行移到新位置，返回新行号；now 为完成时间（重放日志时传入）"""
+        target = self.move_target(row, status)
+        task = self._tasks[row]
+        self._counts.remove(task)
+        task.done_at = done_time(task, status, now)
+        task.status = _INTERNED_STATUSES.get(status, status)
+        self._counts.add(task)
+        if target != row:
+            del self._tasks[row]
+            self._tasks.insert(target, task)
+        return target
+
+    def set_order(self, row, order):
+        """修改该行的顺序键并移到新位置（拖动排序），返回新行号"""
+        task = self._tasks.pop(row)
+        task.order = order
+        self._next_order = max(self._next_order, next_order_after(order))
+        target = self.position(task.status, order, task.id)
+        self._tasks.insert(target, task)
+        return target
+
+    def set_text(self, row, text):
+        """修改指定行的文本（不影响顺序）"""
+        task = self._tasks[row]
+        self._counts.remove(task)  # 筛选统计可能依赖文本
+        task.text = text
+        self._counts.add(task)
+        if self._index is not None:
+            self._index.update(task, text)
+
+    def set_due(self, row, due_at):
+        """修改指定行的提醒时间（不影响顺序），None 表示取消提醒"""
+        self._tasks[row].due_at = due_at
+
+    def set_status_many(self, rows, status, now=None):
+        """修改多行的状态；改动少时逐个二分插入，改动多时统一排序一次"""
+        status = _INTERNED_STATUSES.get(status, status)
+        rows = sorted(row for row in rows if self._tasks[row].status != status)
+        changed = [self._tasks[row] for row in rows]
+        now = finish_time(status, now)
+        for task in changed:
+            self._counts.remove(task)
+            task.done_at = now
+            task.status = status
+            self._counts.add(task)
+        if len(changed) * 32 > len(self._tasks):
+            self._tasks.sort(key=_sort_key)  # 大部分仍有序，Timsort 接近线性
+            return
+        for row in reversed(rows):
+            del self._tasks[row]
+        for task in changed:
+            bisect.insort(self._tasks, task, key=_sort_key)
@@ -0,0 +1,762 @@
+import bisect
+import json
+import time
+from itertools import islice
+
+from PySide6.QtCore import (Qt, QAbstractListModel, QModelIndex, QMimeData, QRect, QRectF,
+                            QSize, QEvent, Signal)
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtGui import QFont, QPainter, QPen
+
+from due_time import format_due_time
+from search_index import matches
+from task_list import FINISHED_STATUSES, MIN_ORDER_GAP, STATUS_NAMES, order_between
+from theme import (STATUS_COLORS, CARD_COLOR, CARD_HOVER_COLOR, CARD_SELECTED_COLOR,
+                   SELECTED_BORDER_COLOR, BUTTON_HOVER_COLOR, TEXT_COLOR, DUE_TEXT_COLOR,
+                   DUE_ALERT_COLOR, FONT_FAMILY)
+
+# 拖动排序时传递的数据类型（内容为任务 id 的 JSON 数组）
+TASK_IDS_MIME = "application/x-glassmemo-task-ids"
+
+# 合并其他程序的修改或按 id 批量修改时，变化超过此数量则整体刷新而不是逐行移动
+RESET_THRESHOLD = 500
+
+# 归档视图每次读取的条数
+ARCHIVE_PAGE_SIZE = 200
+
+# 行内按钮：(键, 文字)
+BUTTONS = [("todo", "代办📋"), ("complete", "完成✅"), ("cancel", "取消❌")]
+DELETE_BUTTON = ("delete", "删除🗑️")
+
+# 行布局尺寸
+ROW_MARGIN_V = 6
+ROW_MARGIN_H = 2
+PADDING = 15
+TEXT_HEIGHT = 50
+TEXT_SPACING = 10
+BUTTON_WIDTH = 80
+BUTTON_HEIGHT = 40
+BUTTON_SPACING = 10
+STATUS_WIDTH = 110
+ROW_HEIGHT = 2 * ROW_MARGIN_V + 2 * PADDING + TEXT_HEIGHT + TEXT_SPACING + BUTTON_HEIGHT
+
+
+def _display_key(task):
+    """显示顺序键，与 TaskList 的排序一致（顺序键相同时按 id）"""
+    return (task.status in FINISHED_STATUSES, task.order, task.id)
+
+
+class TaskListModel(QAbstractListModel):
+    """任务列表模型，数据和顺序由 TaskStore 维护（待办在前，已结束在后）
+
+    设置搜索词后只显示匹配的任务，行号均指筛选后的行。
+    给出 reminders（ReminderScheduler）时，增删改都同步安排或取消对应任务的提醒。
+    """
+    StatusRole = Qt.UserRole + 1
+    IdRole = Qt.UserRole + 2
+    DueRole = Qt.UserRole + 3
+
+    task_moved = Signal(int)  # 拖动排序完成，参数为新行号
+
+    def __init__(self, store, parent=None, reminders=None):
+        super().__init__(parent)
+        self._store = store
+        self._reminders = reminders
+        self._query = ""
+        self._visible = None  # 筛选时显示的任务（按显示顺序），None 表示显示全部
+        self._crowded = False  # 拖动排序后相邻顺序键过近，需要重新编号
+
+    def store(self):
+        """返回底层的任务存储"""
+        return self._store
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._store) if self._visible is None else len(self._visible)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self.task(index.row())
+        if role == Qt.DisplayRole:
+            return task.text
+        if role == self.StatusRole:
+            return task.status
+        if role == self.IdRole:
+            return task.id
+        if role == self.DueRole:
+            return task.due_at
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def mimeTypes(self):
+        return [TASK_IDS_MIME]
+
+    def mimeData(self, indexes):
+        data = QMimeData()
+        ids = [self.task(index.row()).id for index in sorted(indexes, key=QModelIndex.row)]
+        data.setData(TASK_IDS_MIME, json.dumps(ids).encode('ascii'))
+        return data
+
+    def dropMimeData(self, data, action, row, column, parent):
+        """拖放到 row 之前（row 为 -1 时放到 parent 行之前或列表末尾）；只移动拖动的第一条任务
+
+        移动在这里完成，返回 False 使视图不再删除源行。
+        """
+        if action != Qt.MoveAction or not data.hasFormat(TASK_IDS_MIME):
+            return False
+        ids = json.loads(bytes(data.data(TASK_IDS_MIME)).decode('ascii'))
+        source = self.row_of(ids[0]) if ids else None
+        if source is None:
+            return False
+        if row < 0:
+            row = parent.row() if parent.isValid() else self.rowCount()
+        target = self.move_row(source, row)
+        if target != source:
+            self.task_moved.emit(target)
+        return False
+
+    def task(self, row):
+        """返回指定行的任务"""
+        return self._store[row] if self._visible is None else self._visible[row]
+
+    def row_of(self, task_id):
+        """返回任务 id 当前所在的行号（筛选时为筛选后的行号），不在列表中时返回 None"""
+        if self._visible is None:
+            return self._store.row_of(task_id)
+        task = self._store.get(task_id)
+        if task is None:
+            return None
+        row = self._visible_position(task.status, task.order, task_id)
+        if row < len(self._visible) and self._visible[row].id == task_id:
+            return row
+        return None
+
+    def _source_row(self, row):
+        """筛选后的行号对应的存储行号"""
+        if self._visible is None:
+            return row
+        return self._store.row_of(self._visible[row].id)
+
+    def _group_range(self, task):
+        """任务所在分组（待办或已结束）在当前列表中的行号范围 [start, end)"""
+        if self._visible is None:
+            split = self._store.counts()['todo']
+        else:
+            split = self._visible_position("complete", float('-inf'))
+        return (split, self.rowCount()) if task.status in FINISHED_STATUSES else (0, split)
+
+    def _visible_position(self, status, order, task_id=None):
+        """具有该状态、顺序键和 id 的任务在筛选结果中应处的行号；不给 id 时为顺序键相同的任务之前"""
+        key = (status in FINISHED_STATUSES, order)
+        if task_id is not None:
+            key += (task_id,)
+        return bisect.bisect_left(self._visible, key, key=_display_key)
+
+    def _track(self, task_id, status=None, due_at=None):
+        """按任务的状态和提醒时间安排、改期或取消它的提醒（O(log n)）；只给 id 表示任务已删除"""
+        if self._reminders is None:
+            return
+        if due_at is None or status in FINISHED_STATUSES:
+            self._reminders.cancel(task_id)
+        else:
+            self._reminders.schedule(task_id, due_at)
+
+    def _track_task(self, task):
+        self._track(task.id, task.status, task.due_at)
+
+    def _track_ids(self, ids):
+        """按存储中现在的记录重新安排这些任务的提醒"""
+        if self._reminders is None:
+            return
+        for task_id in ids:
+            task = self._store.get(task_id)
+            if task is None:
+                self._track(task_id)
+            else:
+                self._track_task(task)
+
+    def _track_all(self):
+        """按存储整体重建提醒（载入或整体刷新后）"""
+        if self._reminders is not None:
+            self._reminders.reset(self._store.due_tasks())
+
+    def prepare_search(self, limit=None):
+        """提前建立存储的搜索索引（搜索框获得焦点时调用）；返回是否已建完"""
+        return self._store.prepare_search(limit)
+
+    def filter_text(self):
+        return self._query
+
+    def set_filter_text(self, query):
+        """只显示文本包含 query 的任务（不区分大小写），统计也只计匹配项；空字符串显示全部"""
+        self.beginResetModel()
+        self._query = query
+        self._apply_filter()
+        self.endResetModel()
+
+    def _apply_filter(self):
+        if not self._query:
+            self._visible = None
+            self._store.set_filter(None)
+            return
+        query = self._query
+        self._visible = self._store.search(query)
+        self._store.set_filter(lambda task: matches(query, task.text), self._visible)
+
+    def tasks(self):
+        """返回所有任务（按当前顺序）"""
+        return self._store.tasks()
+
+    def load(self):
+        """从存储加载任务"""
+        self.beginResetModel()
+        self._store.load()
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        self._track_all()
+
+    def begin_load(self, batch_size, first_batch_size=None):
+        """清空模型并开始分批加载，返回逐批产出 (任务列表, 进度) 的迭代器"""
+        self.beginResetModel()
+        batches = self._store.iter_load(batch_size, first_batch_size)
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        self._track_all()
+        return batches
+
+    def append_batch(self, tasks):
+        """追加一批加载到的任务"""
+        if not tasks:
+            return
+        if self._visible is not None:
+            # 加载过程中已在搜索：重新计算匹配结果
+            self.beginResetModel()
+            if not self._extend(tasks):
+                self._store.resort()
+            self._apply_filter()
+            self.endResetModel()
+            return
+        first = len(self._store)
+        self.beginInsertRows(QModelIndex(), first, first + len(tasks) - 1)
+        in_order = self._extend(tasks)
+        self.endInsertRows()
+        if not in_order:
+            self.layoutAboutToBeChanged.emit()
+            self._store.resort()
+            self.layoutChanged.emit()
+
+    def _extend(self, tasks):
+        """把一批任务追加到存储末尾并安排其中的提醒，返回追加后是否仍然有序"""
+        first = len(self._store)
+        in_order = self._store.extend(tasks)
+        if self._reminders is not None:
+            # id 可能在追加时才分配，按追加后的行读取
+            for row in range(first, len(self._store)):
+                task = self._store[row]
+                if task.due_at is not None:
+                    self._track_task(task)
+        return in_order
+
+    def add_task(self, text, status="todo", due_at=None):
+        """把任务插入到所在分组末尾，返回行号；不匹配当前搜索词时返回 None"""
+        if self._visible is not None:
+            task = self._store[self._store.add(text, status, due_at)]
+            self._track_task(task)
+            if not matches(self._query, text):
+                return None
+            row = self._visible_position(task.status, task.order, task.id)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._visible.insert(row, task)
+            self.endInsertRows()
+            return row
+        row = len(self._store) if status in FINISHED_STATUSES else self._store.counts()['todo']
+        self.beginInsertRows(QModelIndex(), row, row)
+        row = self._store.add(text, status, due_at)
+        self.endInsertRows()
+        self._track(self._store[row].id, status, due_at)
+        return row
+
+    def add_tasks(self, records):
+        """批量添加任务字典（text、status，可带 due_at），按输入顺序返回新任务的 id
+
+        全是待办且没有筛选时只插入新行（新任务都在待办分组末尾），否则整体刷新一次。
+        """
+        if not records:
+            return []
+        if self._visible is None and all(data.get('status', "todo") == "todo" for data in records):
+            row = self._store.counts()['todo']
+            self.beginInsertRows(QModelIndex(), row, row + len(records) - 1)
+            ids = self._store.add_many(records)
+            self.endInsertRows()
+        else:
+            self.beginResetModel()
+            ids = self._store.add_many(records)
+            if self._visible is not None:
+                self._apply_filter()
+            self.endResetModel()
+        for task_id, data in zip(ids, records):
+            if data.get('due_at') is not None:
+                self._track(task_id, data.get('status', "todo"), data['due_at'])
+        return ids
+
+    def remove_task(self, row):
+        """删除指定行"""
+        self.beginRemoveRows(QModelIndex(), row, row)
+        task = self._store.remove(self._source_row(row))
+        if self._visible is not None:
+            del self._visible[row]
+        self.endRemoveRows()
+        self._track(task.id)
+
+    def set_status(self, row, status):
+        """修改指定行的状态，只移动这一行，返回新行号"""
+        if self._visible is not None:
+            return self._set_visible_status(row, status)
+        target = self._store.move_target(row, status)
+        if target == row:
+            self._store.set_status(row, status)
+            self._track_task(self._store[row])
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [self.StatusRole])
+            return row
+        # beginMoveRows 的目标行按移动前的列表计算
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(),
+                           target + 1 if target > row else target)
+        self._store.set_status(row, status)
+        self.endMoveRows()
+        self._track_task(self._store[target])
+        index = self.index(target)
+        self.dataChanged.emit(index, index, [self.StatusRole])
+        return target
+
+    def move_row(self, row, target):
+        """把指定行移到 target 行之前（拖动排序），只能在所在分组内移动，返回新行号
+
+        新顺序键取目标位置前后两条任务的中点，存储只写入这一条任务。
+        """
+        task = self.task(row)
+        start, end = self._group_range(task)
+        target = min(max(target, start), end)
+        if target in (row, row + 1):
+            return row
+        before = self.task(target - 1).order if target > start else None
+        after = self.task(target).order if target < end else None
+        order = order_between(before, after)
+        if (before is not None and order <= before) or (after is not None and order >= after):
+            # 两侧顺序键相同（另一分组的任务改变状态后可能并列）或已取不到中点：先重新编号，行号不变
+            self.sort()
+            return self.move_row(row, target)
+        if before is not None and after is not None and after - before < MIN_ORDER_GAP:
+            self._crowded = True
+        new_row = target - 1 if target > row else target
+        self.beginMoveRows(QModelIndex(), row, row, QModelIndex(), target)
+        self._store.set_order(self._source_row(row), order)
+        if self._visible is not None:
+            del self._visible[row]
+            self._visible.insert(new_row, self._store.get(task.id))
+        self.endMoveRows()
+        return new_row
+
+    def needs_reorder(self):
+        """拖动排序后顺序键是否已过密，需要调用 sort() 重新编号"""
+        return self._crowded
+
+    def set_text(self, row, text):
+        """修改指定行的文本；筛选时不再匹配的任务从列表中移除"""
+        self._store.set_text(self._source_row(row), text)
+        if self._visible is not None:
+            task = self._visible[row]
+            if not matches(self._query, text):
+                self.beginRemoveRows(QModelIndex(), row, row)
+                del self._visible[row]
+                self.endRemoveRows()
+                return
+            self._visible[row] = self._store.get(task.id)
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.DisplayRole])
+
+    def set_due(self, row, due_at):
+        """修改指定行的提醒时间并重新安排提醒，None 表示取消提醒"""
+        self._store.set_due(self._source_row(row), due_at)
+        if self._visible is not None:
+            self._visible[row] = self._store.get(self._visible[row].id)
+        self._track_task(self.task(row))
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [self.DueRole])
+
+    def _set_visible_status(self, row, status):
+        task = self._visible[row]
+        target = self._visible_position(status, task.order, task.id)
+        target = target - 1 if target > row else target
+        if target != row:
+            self.beginMoveRows(QModelIndex(), row, row, QModelIndex(),
+                               target + 1 if target > row else target)
+        source_target = self._store.set_status(self._source_row(row), status)
+        del self._visible[row]
+        self._visible.insert(target, self._store[source_target])
+        if target != row:
+            self.endMoveRows()
+        self._track_task(self._visible[target])
+        index = self.index(target)
+        self.dataChanged.emit(index, index, [self.StatusRole])
+        return target
+
+    def set_status_many(self, rows, status):
+        """批量修改状态：存储只排序和写入一次，视图整体刷新一次"""
+        ids = [self.task(row).id for row in rows] if self._reminders is not None else ()
+        self.beginResetModel()
+        self._store.set_status_many([self._source_row(row) for row in rows], status)
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        self._track_ids(ids)
+
+    def remove_many(self, rows):
+        """批量删除指定的行"""
+        self.beginResetModel()
+        removed = self._store.remove_many([self._source_row(row) for row in rows])
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        for task in removed:
+            self._track(task.id)
+
+    def update_ids(self, updates):
+        """按 id 修改文本、状态和提醒时间，不论任务是否在筛选结果中；
+        updates 为 {id: {'text': ..., 'status': ..., 'due_at': ...}}，各字段都可省略
+
+        数量少且没有筛选时逐行刷新或移动，否则各状态只排序一次、视图整体刷新一次。
+        """
+        if self._visible is None and len(updates) <= RESET_THRESHOLD:
+            for task_id, fields in updates.items():
+                row = self.row_of(task_id)
+                if row is None:
+                    continue
+                if 'text' in fields:
+                    self.set_text(row, fields['text'])
+                if 'due_at' in fields:
+                    self.set_due(row, fields['due_at'])
+                if 'status' in fields:
+                    self.set_status(row, fields['status'])
+            return
+        self.beginResetModel()
+        by_status = {}
+        for task_id, fields in updates.items():
+            row = self._store.row_of(task_id)
+            if row is None:
+                continue
+            if 'text' in fields:
+                self._store.set_text(row, fields['text'])
+            if 'due_at' in fields:
+                self._store.set_due(row, fields['due_at'])
+            if 'status' in fields:
+                by_status.setdefault(fields['status'], []).append(task_id)
+        for status, ids in by_status.items():
+            # 上一组修改状态后行号已变化，按 id 重新查找
+            self._store.set_status_many([self._store.row_of(task_id) for task_id in ids], status)
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        self._track_ids(task_id for task_id, fields in updates.items()
+                        if 'status' in fields or 'due_at' in fields)
+
+    def remove_ids(self, ids):
+        """批量删除指定 id 的任务，不论它们是否在筛选结果中"""
+        self.beginResetModel()
+        self._store.remove_many([self._store.row_of(task_id) for task_id in ids])
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        for task_id in ids:
+            self._track(task_id)
+
+    def sync(self, disk=None):
+        """合并其他程序对数据文件的修改，只插入、删除或刷新变化的行，返回是否有变化
+
+        disk 为存储的 sync_job 在后台读到的内容。
+        """
+        changes = self._store.sync(disk)
+        if changes is not None and len(changes) <= RESET_THRESHOLD:
+            for task_id, task in changes:
+                self._apply_change(task_id, task)
+            return bool(changes)
+        self.beginResetModel()
+        for task_id, task in changes or ():
+            self._store.apply_change(task_id, task)
+        if self._visible is not None:
+            self._apply_filter()
+        self.endResetModel()
+        if changes is None:
+            self._track_all()
+        else:
+            self._track_ids(task_id for task_id, _ in changes)
+        return True
+
+    def _apply_change(self, task_id, task):
+        if task is None:
+            self._track(task_id)
+        else:
+            self._track_task(task)
+        old = self._store.get(task_id)
+        row = self.row_of(task_id)
+        shown = task is not None and (self._visible is None or matches(self._query, task.text))
+        if (row is not None and shown
+                and (old.status, old.order) == (task.status, task.order)):
+            # 位置不变：原地刷新
+            self._store.apply_change(task_id, task)
+            if self._visible is not None:
+                self._visible[row] = self._store.get(task_id)
+            index = self.index(row)
+            self.dataChanged.emit(index, index)
+            return
+        if row is not None:
+            self.beginRemoveRows(QModelIndex(), row, row)
+            self._store.apply_change(task_id, None)
+            if self._visible is not None:
+                del self._visible[row]
+            self.endRemoveRows()
+        elif old is not None:  # 不在筛选结果中
+            self._store.apply_change(task_id, None)
+        if task is None:
+            return
+        if not shown:
+            self._store.apply_change(task_id, task)
+            return
+        if self._visible is None:
+            row = self._store.position(task.status, task.order, task_id)
+        else:
+            row = self._visible_position(task.status, task.order, task_id)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._store.apply_change(task_id, task)
+        if self._visible is not None:
+            self._visible.insert(row, self._store.get(task_id))
+        self.endInsertRows()
+
+    def counts(self, filtered=False):
+        """返回各状态数量（O(1)，由存储增量维护）"""
+        return self._store.counts(filtered)
+
+    def set_count_filter(self, predicate):
+        """设置统计用的筛选条件，None 表示统计全部任务"""
+        self._store.set_filter(predicate)
+
+    def sort(self, column=0, order=Qt.AscendingOrder):
+        """按当前顺序重新编号（一般无需调用，增删改已保持有序；拖动排序使顺序键过密时调用）"""
+        self.layoutAboutToBeChanged.emit()
+        self._store.reorder()
+        if self._visible is not None:
+            self._apply_filter()  # 顺序键已重新编号
+        self._crowded = False
+        self.layoutChanged.emit()
+
+    def clear(self):
+        """清空所有任务"""
+        self.beginResetModel()
+        self._store.clear()
+        if self._visible is not None:
+            self._visible = []
+        self.endResetModel()
+        if self._reminders is not None:
+            self._reminders.clear()
+
+
+class ArchiveModel(QAbstractListModel):
+    """归档任务的只读列表：打开时不读取，滚动到底部时再解压下一页"""
+
+    def __init__(self, archive, page_size=ARCHIVE_PAGE_SIZE, parent=None):
+        super().__init__(parent)
+        self._records = []
+        self._source = iter(archive)
+        self._page_size = page_size
+        self._exhausted = False
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._records)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        record = self._records[index.row()]
+        if role == Qt.DisplayRole:
+            done_at = record.get('done_at')
+            date = time.strftime("%Y-%m-%d", time.localtime(done_at)) if done_at else ""
+            return f"{date}  [{STATUS_NAMES.get(record['status'], record['status'])}]  {record['text']}"
+        if role == Qt.ToolTipRole:
+            return time.strftime("归档于 %Y-%m-%d %H:%M", time.localtime(record['archived_at']))
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        page = list(islice(self._source, self._page_size))
+        if len(page) < self._page_size:
+            self._exhausted = True
+        if not page:
+            return
+        first = len(self._records)
+        self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+        self._records.extend(page)
+        self.endInsertRows()
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """绘制任务行，并通过点击位置判断按下的按钮"""
+    # 信号携带任务 id 而不是行号，处理时列表即使已经变化也不会找错任务
+    status_clicked = Signal(int, str)  # 任务 id, 新状态
+    delete_clicked = Signal(int)       # 任务 id
+    edit_clicked = Signal(int)         # 任务 id（双击文本）
+
+    def __init__(self, view):
+        super().__init__(view)
+        self._view = view
+        self._hover = None  # (行号, 按钮键)
+        self._text_font = QFont(FONT_FAMILY)
+        self._text_font.setPixelSize(18)
+        self._button_font = QFont(FONT_FAMILY)
+        self._button_font.setPixelSize(13)
+        view.setMouseTracking(True)
+        view.viewport().installEventFilter(self)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), ROW_HEIGHT)
+
+    def _layout(self, rect):
+        """计算一行内各区域的位置"""
+        card = rect.adjusted(ROW_MARGIN_H, ROW_MARGIN_V, -ROW_MARGIN_H, -ROW_MARGIN_V)
+        inner = card.adjusted(PADDING, PADDING, -PADDING, -PADDING)
+        text = QRect(inner.left(), inner.top(), inner.width(), TEXT_HEIGHT)
+        top = text.bottom() + 1 + TEXT_SPACING
+        buttons = {}
+        x = inner.left()
+        for key, _ in BUTTONS:
+            buttons[key] = QRect(x, top, BUTTON_WIDTH, BUTTON_HEIGHT)
+            x += BUTTON_WIDTH + BUTTON_SPACING
+        status = QRect(inner.right() + 1 - STATUS_WIDTH, top, STATUS_WIDTH, BUTTON_HEIGHT)
+        buttons[DELETE_BUTTON[0]] = QRect(status.left() - BUTTON_SPACING - BUTTON_WIDTH,
+                                          top, BUTTON_WIDTH, BUTTON_HEIGHT)
+        return card, text, buttons, status
+
+    def hit_test(self, rect, pos):
+        """返回位置 pos 处的按钮键，没有则返回 None"""
+        _, _, buttons, _ = self._layout(rect)
+        for key, button_rect in buttons.items():
+            if button_rect.contains(pos):
+                return key
+        return None
+
+    def paint(self, painter, option, index):
+        status = index.data(TaskListModel.StatusRole)
+        due_at = index.data(TaskListModel.DueRole)
+        # 提醒已到期的待办任务突出显示，直到完成、取消或改期
+        alert = due_at is not None and status not in FINISHED_STATUSES and due_at <= time.time()
+        card, text_rect, buttons, status_rect = self._layout(option.rect)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+
+        # 卡片背景（选中或提醒到期时加边框）
+        if alert:
+            painter.setPen(QPen(DUE_ALERT_COLOR, 2))
+        if option.state & QStyle.State_Selected:
+            if not alert:
+                painter.setPen(SELECTED_BORDER_COLOR)
+            painter.setBrush(CARD_SELECTED_COLOR)
+        elif option.state & QStyle.State_MouseOver:
+            painter.setBrush(CARD_HOVER_COLOR)
+        else:
+            painter.setBrush(CARD_COLOR)
+        painter.drawRoundedRect(QRectF(card), 10, 10)
+        painter.setPen(Qt.NoPen)
+
+        # 任务文本（按状态着色）
+        painter.setBrush(STATUS_COLORS.get(status, STATUS_COLORS["todo"]))
+        painter.drawRoundedRect(QRectF(text_rect), 5, 5)
+        text_area = text_rect.adjusted(5, 0, -5, 0)
+        if due_at is not None:
+            # 提醒时间靠右显示，文本让出相应宽度
+            painter.setFont(self._button_font)
+            label = f"⏰ {format_due_time(due_at)}"
+            painter.setPen(DUE_ALERT_COLOR if alert else DUE_TEXT_COLOR)
+            painter.drawText(text_area, Qt.AlignRight | Qt.AlignVCenter, label)
+            text_area.setRight(text_area.right() - painter.fontMetrics().horizontalAdvance(label) - 10)
+        painter.setPen(TEXT_COLOR)
+        painter.setFont(self._text_font)
+        elided = painter.fontMetrics().elidedText(index.data(Qt.DisplayRole), Qt.ElideRight,
+                                                   text_area.width())
+        painter.drawText(text_area, Qt.AlignLeft | Qt.AlignVCenter, elided)
+
+        # 按钮
+        painter.setFont(self._button_font)
+        for key, label in BUTTONS + [DELETE_BUTTON]:
+            button_rect = buttons[key]
+            if self._hover == (index.row(), key):
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(BUTTON_HOVER_COLOR)
+                painter.drawRoundedRect(QRectF(button_rect), 5, 5)
+            painter.setPen(TEXT_COLOR)
+            painter.drawText(button_rect, Qt.AlignCenter, label)
+
+        painter.drawText(status_rect, Qt.AlignLeft | Qt.AlignVCenter,
+                         f"当前状态：{STATUS_NAMES.get(status, '')}")
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        """点击按钮时发出对应信号，双击文本时请求编辑"""
+        if event.type() == QEvent.MouseButtonDblClick and event.button() == Qt.LeftButton:
+            if self._layout(option.rect)[1].contains(event.position().toPoint()):
+                self.edit_clicked.emit(index.data(TaskListModel.IdRole))
+                return True
+        if event.type() in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick):
+            return self.hit_test(option.rect, event.position().toPoint()) is not None
+        if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+            key = self.hit_test(option.rect, event.position().toPoint())
+            if key == DELETE_BUTTON[0]:
+                self.delete_clicked.emit(index.data(TaskListModel.IdRole))
+                return True
+            if key is not None:
+                self.status_clicked.emit(index.data(TaskListModel.IdRole), key)
+                return True
+        return super().editorEvent(event, model, option, index)
+
+    def eventFilter(self, obj, event):
+        """跟踪鼠标所在的按钮，仅重绘受影响的行"""
+        if event.type() == QEvent.MouseMove:
+            pos = event.position().toPoint()
+            index = self._view.indexAt(pos)
+            hover = None
+            if index.isValid():
+                key = self.hit_test(self._view.visualRect(index), pos)
+                if key is not None:
+                    hover = (index.row(), key)
+            self._set_hover(hover)
+        elif event.type() == QEvent.Leave:
+            self._set_hover(None)
+        return False
+
+    def clear_hover(self):
+        """清除悬停的按钮（视图与模型断开前调用，行号在重新连接后已无意义）"""
+        self._set_hover(None)
+
+    def _set_hover(self, hover):
+        if hover == self._hover:
+            return
+        model = self._view.model()
+        if model is None:  # 视图已与模型断开（窗口折叠时），没有要重绘的行
+            self._hover = hover
+            return
+        for state in (self._hover, hover):
+            if state is not None and state[0] < model.rowCount():
+                self._view.viewport().update(self._view.visualRect(model.index(state[0], 0)))
+        self._hover = hover
@@ -0,0 +1,1459 @@
+import bisect
+import codecs
+import contextlib
+import json
+import os
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from itertools import chain, count
+
+from binary_snapshot import BinarySnapshot, write_binary_temp
+from file_lock import FileLock
+from search_index import SearchIndex, matches
+from task_list import (Task, TaskList, TaskCounts, StatusCounter, FINISHED_STATUSES,
+                       done_time, finish_time, next_order_after)
+
+DATA_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'memo_data.json')
+STORAGE_ENV = "GLASS_MEMO_STORAGE"
+JOURNAL_SUFFIX = '.journal'
+BINARY_SUFFIX = '.bin'
+COMPACT_THRESHOLD = 1 << 20  # 日志超过 1MB 时压缩
+STORAGE_MODES = ("json", "journal", "sqlite", "binary")
+
+
+def read_snapshot(path):
+    """读取快照文件，返回 (序号, 任务列表)；兼容旧版的纯数组格式"""
+    if not os.path.exists(path):
+        return 0, []
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if isinstance(data, list):
+        return 0, data
+    return data.get('seq', 0), data.get('tasks', [])
+
+
+def iter_json_array(path, chunk_size=1 << 16):
+    """逐块读取顶层 JSON 数组，逐个产出 (元素, 已读取的字节比例)，内存占用与文件大小无关"""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    size = os.path.getsize(path) or 1
+    bytes_read = 0
+    with open(path, 'rb') as f:
+        buf = ''
+        pos = 0
+        started = False
+        while True:
+            while pos < len(buf) and buf[pos] in ' \t\r\n':
+                pos += 1
+            if pos >= len(buf) or not started:
+                if pos >= len(buf):
+                    chunk = f.read(chunk_size)
+                    if not chunk:
+                        raise ValueError("JSON 数组不完整")
+                    bytes_read += len(chunk)
+                    buf = buf[pos:] + text_decoder.decode(chunk)
+                    pos = 0
+                    continue
+                if buf[pos] != '[':
+                    raise ValueError("不是 JSON 数组")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            if buf[pos] == ',':
+                pos += 1
+                continue
+            try:
+                item, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    raise
+                bytes_read += len(chunk)
+                buf = buf[pos:] + text_decoder.decode(chunk)
+                pos = 0
+                continue
+            yield item, bytes_read / size
+
+
+def starts_with_array(path):
+    """文件是否为纯数组格式（而不是带序号的快照对象）"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return f.read(64).lstrip().startswith('[')
+
+
+def write_temp(path, data, **dump_args):
+    """把数据写入并刷到 path 旁边的临时文件，返回临时文件路径；调用方再用 os.replace 替换原文件，
+    写到一半崩溃也不会损坏数据。
+
+    临时文件名带进程号和线程号，多个进程可以同时写，只需在替换原文件时加锁。
+    """
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, **dump_args)
+        f.flush()
+        os.fsync(f.fileno())
+    return tmp_path
+
+
+def file_stamp(path):
+    """文件的 (inode, 大小, 修改时间)，用于发现其他程序的写入；文件不存在时返回 None"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return st.st_ino, st.st_size, st.st_mtime_ns
+
+
+def _fields(task):
+    """参与合并比较的任务内容；任务不存在时为 None"""
+    return None if task is None else (task.text, task.status, task.order, task.done_at, task.due_at)
+
+
+def _fields_by_id(tasks):
+    """把快照中的任务字典转换为 {id: _fields}；旧数据没有 id 或 id 重复时按加载时的规则分配"""
+    fields = {t.get('id'): (t['text'], t['status'], t.get('order', i), t.get('done_at'), t.get('due_at'))
+              for i, t in enumerate(tasks)}
+    if None not in fields and len(fields) == len(tasks):
+        return fields
+    return {task.id: _fields(task) for task in TaskList(tasks)}
+
+
+def merge_tasks(base, theirs, mine, new_ids):
+    """三方合并：base 为上次与磁盘一致时的内容，theirs 为磁盘上现在的内容（都是 {id: _fields}），
+    mine(id) 返回本地的任务，new_ids 产出未使用的 id
+
+    只有一方修改的任务取修改的一方；双方都修改时逐字段合并，同一字段以本地为准；
+    一方删除、另一方修改时保留修改；双方各自新建了相同 id 的任务时，本地的任务换用新的 id。
+    返回 (需要应用到本地的修改 [(id, 任务或 None)], 合并结果是否保留了磁盘上没有的本地内容)。
+    """
+    changes = []
+    kept_mine = False
+    changed = [task_id for task_id, fields in theirs.items() if base.get(task_id) != fields]
+    changed.extend(base.keys() - theirs.keys())
+    for task_id in changed:
+        old = base.get(task_id)
+        their_fields = theirs.get(task_id)
+        my_fields = _fields(mine(task_id))
+        if my_fields == old or my_fields == their_fields:
+            resolved = their_fields
+        elif my_fields is None or their_fields is None:
+            resolved = my_fields if their_fields is None else their_fields
+        elif old is None:
+            new_id = next(new_ids)
+            text, status, order, done_at, due_at = my_fields
+            changes.append((new_id, Task(text, status, order, new_id, done_at, due_at)))
+            kept_mine = True
+            resolved = their_fields
+        else:
+            resolved = tuple(m if m != o else t for m, o, t in zip(my_fields, old, their_fields))
+        if resolved != their_fields:
+            kept_mine = True
+        if resolved != my_fields:
+            if resolved is None:
+                changes.append((task_id, None))
+            else:
+                text, status, order, done_at, due_at = resolved
+                changes.append((task_id, Task(text, status, order, task_id, done_at, due_at)))
+    return changes, kept_mine
+
+
+def _record_row(tasks, record):
+    """操作记录针对的行号；记录中是任务 id，旧版日志直接记录行号"""
+    return record['row'] if 'row' in record else tasks.row_of(record['id'])
+
+
+def _record_rows(tasks, record):
+    if 'rows' in record:
+        return record['rows']
+    rows = (tasks.row_of(task_id) for task_id in record['ids'])
+    return [row for row in rows if row is not None]
+
+
+def apply_operation(tasks, record):
+    """在 TaskList 上重放一条操作记录；针对已不存在的任务（已被其他程序删除）的记录被忽略"""
+    op = record['op']
+    if op in ('status', 'delete', 'text', 'order', 'due'):
+        row = _record_row(tasks, record)
+        if row is None:
+            return
+        if op == 'status':
+            tasks.set_status(row, record['status'], record.get('at'))
+        elif op == 'delete':
+            tasks.remove(row)
+        elif op == 'text':
+            tasks.set_text(row, record['text'])
+        elif op == 'due':
+            tasks.set_due(row, record.get('due'))
+        else:
+            tasks.set_order(row, record['order'])
+    elif op == 'add':
+        tasks.add(record['text'], record['status'], record.get('id'), record.get('at'),
+                  due_at=record.get('due'))
+    elif op == 'status_many':
+        tasks.set_status_many(_record_rows(tasks, record), record['status'], record.get('at'))
+    elif op == 'delete_many':
+        tasks.remove_many(_record_rows(tasks, record))
+    elif op == 'add_many':
+        tasks.add_many(record['tasks'])
+    elif op == 'reorder':
+        tasks.reorder()
+    elif op == 'clear':
+        tasks.reset([])
+    else:
+        raise ValueError(f"未知操作: {op}")
+
+
+def create_store(data_file, mode="json"):
+    """按存储模式创建任务存储；data_file 为 memo_data.json 的路径"""
+    if mode == "journal":
+        return JournalTaskStore(data_file)
+    if mode == "sqlite":
+        return SqliteTaskStore(os.path.splitext(data_file)[0] + '.db', import_path=data_file)
+    if mode == "binary":
+        return BinaryTaskStore(os.path.splitext(data_file)[0] + BINARY_SUFFIX, import_path=data_file)
+    if mode != "json":
+        raise ValueError(f"未知存储模式: {mode}")
+    return JsonTaskStore(data_file)
+
+
+class TaskStore:
+    """任务存储接口：按显示顺序（待办在前，已结束在后）按行访问和修改任务
+
+    任务以 Task 记录表示，包含 id（持久编号）、text、status 和 order（组内顺序键）。
+    行号会随增删和状态变化而变，需要长期引用某个任务时用 id，再由 row_of 取得当前行号。
+    """
+
+    def load(self):
+        """打开存储并读取（或索引）已有任务"""
+        raise NotImplementedError
+
+    def save(self):
+        """把尚未持久化的修改写入磁盘"""
+        raise NotImplementedError
+
+    def locked(self):
+        """跨进程锁（with 语句）：在其中完成的读取、修改和保存不会与其他进程的写入交错"""
+        return contextlib.nullcontext()
+
+    def save_job(self):
+        """在界面线程取快照，返回可在后台线程执行的写入函数；无需写入时返回 None"""
+        self.save()
+        return None
+
+    def watched_paths(self):
+        """其他程序写入时会变化的文件，用于监视"""
+        return []
+
+    def sync_job(self):
+        """在界面线程检查磁盘，返回可在后台线程执行的读取函数，其结果交给 sync 合并；
+        不需要（或不能）在后台读取时返回 None，由 sync 自己读取
+        """
+        return None
+
+    def sync(self, disk=None):
+        """读取其他程序写入的修改并与本地未保存的修改合并，返回需要应用的修改 [(id, 任务或 None)]
+
+        disk 为 sync_job 返回的函数在后台读到的内容，为 None 时在当前线程读取。
+        由调用方逐项传给 apply_change，以便界面只刷新变化的行；无法列出具体修改时返回 None，
+        此时存储已整体重新读取。
+        """
+        return []
+
+    def apply_change(self, task_id, task):
+        """应用 sync 返回的一项修改：删除 id 对应的任务，task 不为 None 时再按其内容插入"""
+        raise NotImplementedError
+
+    def close(self):
+        """保存并释放资源"""
+        raise NotImplementedError
+
+    def iter_load(self, batch_size, first_batch_size=None):
+        """开始加载，返回逐批产出 (任务列表, 进度) 的迭代器，由调用方用 extend 追加
+
+        不支持分批加载的存储直接完成加载并返回空迭代器。
+        """
+        self.load()
+        return iter(())
+
+    def extend(self, tasks):
+        """在末尾追加一批任务（分批加载时使用），返回追加后是否仍然有序"""
+        raise NotImplementedError
+
+    def resort(self):
+        """extend 打乱顺序后重新排序"""
+        raise NotImplementedError
+
+    def __len__(self):
+        raise NotImplementedError
+
+    def __getitem__(self, row):
+        """返回指定行的任务"""
+        raise NotImplementedError
+
+    def counts(self, filtered=False):
+        """返回各状态数量；filtered 为 True 且设置了筛选条件时只统计匹配的任务"""
+        raise NotImplementedError
+
+    def set_filter(self, predicate, matched=None):
+        """设置统计用的筛选条件（task -> bool），None 表示不筛选
+
+        已知匹配的任务（如 search 的结果）时传入 matched，只统计这些任务而不必遍历全部。
+        """
+        raise NotImplementedError
+
+    def prepare_search(self, limit=None):
+        """提前建立搜索索引，避免第一次搜索时等待；给出 limit 时这次最多索引 limit 个任务，返回是否已建完"""
+        return True
+
+    def search(self, query):
+        """返回文本包含 query 的任务（不区分大小写，按显示顺序）"""
+        raise NotImplementedError
+
+    def position(self, status, order, task_id=None):
+        """具有该状态、顺序键和 id 的任务所在（或应处）的行号；顺序键相同时按 id 排，不给 id 时为它们之前"""
+        raise NotImplementedError
+
+    def get(self, task_id):
+        """按 id 返回任务，不存在时返回 None"""
+        raise NotImplementedError
+
+    def row_of(self, task_id):
+        """返回 id 对应任务当前所在的行号，不存在时返回 None"""
+        raise NotImplementedError
+
+    def tasks(self):
+        """返回全部任务的 {'id', 'text', 'status'} 字典列表（按显示顺序，用于保存）"""
+        raise NotImplementedError
+
+    def iter_tasks(self):
+        """按显示顺序逐个产出任务记录，不需要一次取出全部任务（用于导出等）"""
+        raise NotImplementedError
+
+    def snapshot(self):
+        """返回带顺序键的全部任务字典"""
+        raise NotImplementedError
+
+    def due_tasks(self):
+        """返回有提醒时间的待办任务 [(id, 提醒时间)]"""
+        return [(t.id, t.due_at) for t in self.iter_tasks()
+                if t.due_at is not None and t.status not in FINISHED_STATUSES]
+
+    def expired_tasks(self, cutoff):
+        """返回结束时间早于 cutoff（Unix 秒）的已结束任务（按显示顺序）"""
+        return [t for t in self.iter_tasks()
+                if t.status in FINISHED_STATUSES and t.done_at is not None and t.done_at < cutoff]
+
+    def add(self, text, status="todo", due_at=None):
+        """添加任务到所在分组末尾，返回行号；due_at 为提醒时间（Unix 秒）"""
+        raise NotImplementedError
+
+    def add_many(self, records):
+        """作为一次修改批量添加任务字典（text、status，可带 due_at），records 可以是迭代器；按输入顺序返回新任务的 id"""
+        raise NotImplementedError
+
+    def remove(self, row):
+        """删除指定行，返回被删除的任务"""
+        raise NotImplementedError
+
+    def move_target(self, row, status):
+        """返回该行改为 status 后应处的行号（按删除该行后的列表计算）"""
+        raise NotImplementedError
+
+    def set_status(self, row, status):
+        """修改状态并移动到新位置，返回新行号"""
+        raise NotImplementedError
+
+    def set_order(self, row, order):
+        """修改该行的顺序键（拖动排序，只写入这一条任务），返回新行号"""
+        raise NotImplementedError
+
+    def set_text(self, row, text):
+        """修改指定行的文本"""
+        raise NotImplementedError
+
+    def set_due(self, row, due_at):
+        """修改指定行的提醒时间，None 表示取消提醒"""
+        raise NotImplementedError
+
+    def set_status_many(self, rows, status):
+        """在一个事务中修改多行的状态并统一排序"""
+        raise NotImplementedError
+
+    def remove_many(self, rows):
+        """在一个事务中删除多行，返回被删除的任务"""
+        raise NotImplementedError
+
+    def reorder(self):
+        """按当前显示顺序重新编号顺序键"""
+        raise NotImplementedError
+
+    def clear(self):
+        """删除全部任务"""
+        raise NotImplementedError
+
+
+class JsonTaskStore(TaskStore):
+    """全部任务保存在内存中，save 时整体写入 JSON 文件"""
+
+    def __init__(self, path):
+        self.path = path
+        self.lock = FileLock(path)
+        self._tasks = TaskList()
+        self._dirty = False
+        # (上次读取或写入时数据文件的标记, 当时的任务内容 {id: _fields})；
+        # 内容为 None 表示与当前内存一致，第一次修改前才记下
+        self._synced = (None, None)
+        self._sync_count = 0  # 合并次数，合并前取的快照不再写入
+        self._version = self._saved_version = 0  # 本地修改次数、已写入磁盘的修改次数
+
+    def load(self):
+        with self.lock:
+            _, tasks = read_snapshot(self.path)
+            self._synced = (self._disk_stamp(), None)
+        self._tasks.reset(tasks)
+        self._dirty = False
+
+    def iter_load(self, batch_size, first_batch_size=None):
+        self._tasks.reset([])
+        self._dirty = False
+        self._synced = (self._disk_stamp(), None)
+        return self._iter_batches(batch_size, first_batch_size or batch_size)
+
+    def _iter_batches(self, batch_size, first_batch_size):
+        if not os.path.exists(self.path):
+            return
+        if not starts_with_array(self.path):
+            yield read_snapshot(self.path)[1], 1.0
+            return
+        batch = []
+        limit = first_batch_size
+        for task, progress in iter_json_array(self.path):
+            batch.append(task)
+            if len(batch) >= limit:
+                yield batch, progress
+                batch = []
+                limit = batch_size
+        if batch:
+            yield batch, 1.0
+
+    def extend(self, tasks):
+        return self._tasks.extend(tasks)
+
+    def resort(self):
+        self._tasks.resort()
+
+    def save(self):
+        job = self.save_job()
+        if job is not None:
+            job()
+        if self._dirty:
+            # 写入前其他程序修改了文件：在锁内合并后再写
+            with self.lock:
+                for task_id, task in self.sync():
+                    self.apply_change(task_id, task)
+                job = self.save_job()
+                if job is not None:
+                    job()
+
+    def save_job(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        tasks = self._tasks.snapshot()
+        sync_count, version = self._sync_count, self._version
+        return lambda: self._write(tasks, sync_count, version)
+
+    def locked(self):
+        return self.lock
+
+    def _disk_stamp(self):
+        return file_stamp(self.path)
+
+    def _write_temp(self, tasks):
+        return write_temp(self.path, tasks, indent=2)
+
+    def _write(self, tasks, sync_count, version):
+        tmp_path = self._write_temp(tasks)
+        with self.lock:
+            if self._disk_stamp() != self._synced[0] or self._sync_count != sync_count:
+                # 其他程序写入了新内容，或快照早于合并：放弃这次写入，合并后重新保存
+                os.remove(tmp_path)
+                self._dirty = True
+                return
+            os.replace(tmp_path, self.path)
+            # 整体保存后，之前日志模式留下的日志已失效
+            journal_path = self.path + JOURNAL_SUFFIX
+            if os.path.exists(journal_path):
+                os.remove(journal_path)
+            self._synced = (self._disk_stamp(), _fields_by_id(tasks))
+            self._saved_version = version
+
+    def _touch(self):
+        """标记本地修改；第一次修改前记下与磁盘一致的内容，作为之后合并的基准"""
+        stamp, base = self._synced
+        if base is None:
+            self._synced = (stamp, {task.id: _fields(task) for task in self._tasks})
+        self._version += 1
+        self._dirty = True
+
+    def watched_paths(self):
+        return [self.path]
+
+    def _read_disk(self):
+        """读取磁盘上的全部任务 {id: _fields}；纯数组逐个元素解析，在后台线程读取时不会长时间占住 GIL"""
+        if os.path.exists(self.path) and starts_with_array(self.path):
+            return _fields_by_id([task for task, _ in iter_json_array(self.path)])
+        return _fields_by_id(read_snapshot(self.path)[1])
+
+    def _new_ids(self, theirs):
+        """产出本地和磁盘上都未使用的 id（只在需要时才计算起点）"""
+        yield from count(max(chain(theirs, (task.id for task in self._tasks)), default=0) + 1)
+
+    def sync_job(self):
+        if self._disk_stamp() == self._synced[0]:
+            return None
+        return self._read_for_sync
+
+    def _read_for_sync(self):
+        """（后台线程）读取并解析磁盘内容，连同读取时的合并状态一起交给 sync"""
+        with self.lock:
+            return self._synced, self._disk_stamp(), self._read_disk()
+
+    def _fresh(self, disk):
+        """后台读取之后本地没有再写入或合并过时，读到的内容才能直接用来合并"""
+        return disk is not None and disk[0] is self._synced
+
+    def sync(self, disk=None):
+        with self.lock:
+            if not self._fresh(disk):
+                disk = None  # 读取后本地又写入或合并过：在当前线程重新读取
+            stamp = self._disk_stamp() if disk is None else disk[1]
+            synced_stamp, base = self._synced
+            if stamp == synced_stamp:
+                return []
+            theirs = self._read_disk() if disk is None else disk[2]
+            if base is None:
+                base = {task.id: _fields(task) for task in self._tasks}
+            changes, kept_mine = merge_tasks(base, theirs, self._tasks.get, self._new_ids(theirs))
+            # 保留的本地修改（包括合并前取了快照、还没写完的）还需写入
+            self._dirty = self._dirty or kept_mine or self._version != self._saved_version
+            self._synced = (stamp, theirs)
+            self._sync_count += 1
+        return changes
+
+    def apply_change(self, task_id, task):
+        row = self._tasks.row_of(task_id)
+        if row is not None:
+            self._tasks.remove(row)
+        if task is not None:
+            self._tasks.add(task.text, task.status, task_id, task.done_at, task.order, task.due_at)
+
+    def close(self):
+        self.save()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __getitem__(self, row):
+        return self._tasks[row]
+
+    def counts(self, filtered=False):
+        return self._tasks.counts(filtered)
+
+    def set_filter(self, predicate, matched=None):
+        self._tasks.set_filter(predicate, matched)
+
+    def prepare_search(self, limit=None):
+        return self._tasks.prepare_search(limit)
+
+    def search(self, query):
+        return self._tasks.search(query)
+
+    def position(self, status, order, task_id=None):
+        return self._tasks.position(status, order, task_id)
+
+    def get(self, task_id):
+        return self._tasks.get(task_id)
+
+    def row_of(self, task_id):
+        return self._tasks.row_of(task_id)
+
+    def tasks(self):
+        return self._tasks.tasks()
+
+    def iter_tasks(self):
+        return iter(self._tasks)
+
+    def snapshot(self):
+        return self._tasks.snapshot()
+
+    def add(self, text, status="todo", due_at=None):
+        self._touch()
+        return self._tasks.add(text, status, due_at=due_at)
+
+    def add_many(self, records):
+        self._touch()  # 先记下合并基准，基准中不能含有这次添加的任务
+        added = self._tasks.add_many(records)
+        return [task.id for task in added]
+
+    def remove(self, row):
+        self._touch()
+        return self._tasks.remove(row)
+
+    def move_target(self, row, status):
+        return self._tasks.move_target(row, status)
+
+    def set_status(self, row, status):
+        self._touch()
+        return self._tasks.set_status(row, status)
+
+    def set_order(self, row, order):
+        self._touch()
+        return self._tasks.set_order(row, order)
+
+    def set_text(self, row, text):
+        self._touch()
+        self._tasks.set_text(row, text)
+
+    def set_due(self, row, due_at):
+        self._touch()
+        self._tasks.set_due(row, due_at)
+
+    def set_status_many(self, rows, status):
+        self._touch()
+        self._tasks.set_status_many(rows, status)
+
+    def remove_many(self, rows):
+        self._touch()
+        return self._tasks.remove_many(rows)
+
+    def reorder(self):
+        self._touch()
+        self._tasks.reorder()
+
+    def clear(self):
+        self._touch()
+        self._tasks.reset([])
+
+
+class JournalTaskStore(JsonTaskStore):
+    """快照 + 追加日志：每次修改只追加一条操作记录（保存线程成批写入），启动时在快照上重放"""
+
+    def __init__(self, path, compact_threshold=COMPACT_THRESHOLD):
+        super().__init__(path)
+        self.journal_path = path + JOURNAL_SUFFIX
+        self.compact_threshold = compact_threshold
+        self.seq = 0
+        self._file = None
+        self._journal_size = 0
+        self._pending = []  # 尚未写入日志的操作记录 (op, fields)，由保存线程成批写入
+        self._pending_lock = threading.Lock()
+
+    def iter_load(self, batch_size, first_batch_size=None):
+        # 日志要在完整的快照上重放，不能分批加载
+        self.load()
+        return iter(())
+
+    def load(self):
+        """读取快照并重放日志"""
+        with self.lock:
+            self._replay()
+
+    def _replay(self):
+        seq, tasks = read_snapshot(self.path)
+        self._tasks.reset(tasks)
+        seq, good_size = self._replay_journal(self._tasks, seq)
+        if os.path.exists(self.journal_path) and good_size != os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(good_size)
+        self.seq = seq
+        self._file = open(self.journal_path, 'a', encoding='utf-8')
+        self._journal_size = self._file.tell()
+        self._pending = []
+        self._synced = (self._disk_stamp(), None)
+
+    def _replay_journal(self, tasks, seq):
+        """在 tasks 上重放日志中序号大于 seq 的记录，返回 (最后的序号, 日志中完好部分的字节数)"""
+        good_size = 0
+        if not os.path.exists(self.journal_path):
+            return seq, good_size
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                try:
+                    if not line.endswith(b'\n'):
+                        raise ValueError("记录不完整")
+                    record = json.loads(line)
+                except ValueError:
+                    break  # 崩溃时写了一半的记录，丢弃它及之后的内容
+                if record['seq'] > seq:
+                    if record['seq'] != seq + 1:
+                        break
+                    apply_operation(tasks, record)
+                    seq = record['seq']
+                good_size += len(line)
+        return seq, good_size
+
+    def _disk_stamp(self):
+        return file_stamp(self.path), file_stamp(self.journal_path)
+
+    def _touch(self):
+        pass  # 修改都会写入日志，合并前先写入积攒的记录，不需要合并基准
+
+    def watched_paths(self):
+        return [self.path, self.journal_path]
+
+    def _read_disk(self):
+        """重放磁盘上的快照和日志，并把序号更新为磁盘上的最新序号"""
+        seq, tasks = read_snapshot(self.path)
+        tasks = TaskList(tasks)
+        self.seq, _ = self._replay_journal(tasks, seq)
+        return {task.id: _fields(task) for task in tasks}
+
+    def _read_for_sync(self):
+        """（后台线程）先写入本地积攒的记录，再读取新增的日志记录；不能只读新增部分时读取全部"""
+        with self.lock:
+            self._write_pending()  # 本地记录接在其他程序的记录后面（后写的为准）
+            tail = self._read_tail()
+            if tail is not None:
+                return self._synced, tail[0], None, tail
+            return self._synced, self._disk_stamp(), self._read_disk(), None
+
+    def sync(self, disk=None):
+        with self.lock:
+            if not self._fresh(disk):
+                if self._disk_stamp() == self._synced[0]:
+                    return []
+                # 其他程序写入了新记录：本地积攒的记录先接在后面写入（后写的为准），再按磁盘合并
+                self._write_pending()
+                tail = self._read_tail()
+                disk = None
+            else:
+                tail = disk[3]
+            if tail is not None:
+                changes = self._apply_tail(*tail)
+            else:
+                changes = super().sync(disk)
+            self._synced = (self._synced[0], None)  # 合并后内存与磁盘一致
+        return changes
+
+    def _read_tail(self):
+        """快照没变、日志只是变长时，只读取新增的记录，返回 (时间戳, 最后的序号, 记录, 涉及的 id)；
+        不能这样合并时（快照被替换、日志被截断、有整体操作等）返回 None
+        """
+        stamp = self._disk_stamp()
+        old_stamp = self._synced[0]
+        if stamp == old_stamp:
+            return stamp, self.seq, [], set()
+        snapshot, journal = stamp
+        if (old_stamp is None or snapshot != old_stamp[0] or journal is None or old_stamp[1] is None
+                or journal[0] != old_stamp[1][0] or journal[1] < old_stamp[1][1]):
+            return None
+        seq = self.seq
+        records = []
+        ids = set()
+        with open(self.journal_path, 'rb') as f:
+            f.seek(old_stamp[1][1])
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    return None
+                if record['seq'] != seq + 1 or record['op'] in ('reorder', 'clear') or 'row' in record \
+                        or 'rows' in record:
+                    return None
+                seq = record['seq']
+                records.append(record)
+                ids.update(record.get('ids', ()))
+                ids.update(t['id'] for t in record.get('tasks', ()) if t.get('id') is not None)
+                if record.get('id') is not None:
+                    ids.add(record['id'])
+        return stamp, seq, records, ids
+
+    def _apply_tail(self, stamp, seq, records, ids):
+        """在涉及的任务的副本上重放新增的记录，返回修改"""
+        part = self._tasks.subset(ids)
+        for record in records:
+            apply_operation(part, record)
+        changes = [(task.id, task) for task in part if _fields(task) != _fields(self._tasks.get(task.id))]
+        changes.extend((task_id, None) for task_id in ids
+                       if part.get(task_id) is None and self._tasks.get(task_id) is not None)
+        self.seq = seq
+        self._synced = (stamp, None)
+        return changes
+
+    def append(self, op, **fields):
+        """记下一条操作记录；由保存线程与前后的记录一起写入并刷盘（组提交），界面线程不等待磁盘"""
+        with self._pending_lock:
+            self._pending.append((op, fields))
+
+    def _write_pending(self, last=None, tasks=None):
+        """把积攒的记录编号后一次写入日志并刷盘
+
+        其他程序写入后尚未合并时（sync），接着磁盘上的序号写入；之后的合并以磁盘为准，
+        其中已包含这些记录。写入的最后一条正是 last 时，tasks 与写入后的日志一致，接着压缩。
+        """
+        with self.lock:
+            with self._pending_lock:
+                records, self._pending = self._pending, []
+            if not records:
+                return
+            synced = self._disk_stamp() == self._synced[0]
+            if not synced:
+                seq, snapshot = read_snapshot(self.path)
+                self.seq, _ = self._replay_journal(TaskList(snapshot), seq)
+            lines = []
+            for op, fields in records:
+                self.seq += 1
+                lines.append(json.dumps({'seq': self.seq, 'op': op, **fields}, ensure_ascii=False) + '\n')
+            self._file.write(''.join(lines))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            self._journal_size = self._file.tell()
+            # 未合并时内存中缺少其他程序的修改，之后只能整体合并
+            self._synced = (self._disk_stamp() if synced else None, None)
+            compact = tasks is not None and synced and records[-1] is last
+            seq = self.seq
+        if compact:
+            self._write_snapshot(seq, tasks)
+
+    def save(self):
+        """在当前线程写入积攒的记录（命令行、退出时）"""
+        job = self.save_job()
+        if job is not None:
+            job()
+
+    def save_job(self):
+        """返回在保存线程写入积攒的记录的函数；日志超过阈值时顺带压缩"""
+        with self._pending_lock:
+            if not self._pending:
+                return None
+            last = self._pending[-1]
+        # 快照在界面线程上取，对应到 last 为止的记录；之后又有新记录时这次不压缩
+        tasks = self._tasks.snapshot() if self._journal_size >= self.compact_threshold else None
+        return lambda: self._write_pending(last, tasks)
+
+    def compact(self):
+        """把当前任务写成新快照并清空日志"""
+        self.save()
+        self._write_snapshot(self.seq, self._tasks.snapshot())
+
+    def _write_snapshot(self, seq, tasks):
+        try:
+            tmp_path = write_temp(self.path, {'seq': seq, 'tasks': tasks})
+            with self.lock:
+                if self._disk_stamp() != self._synced[0]:
+                    os.remove(tmp_path)  # 其他程序写入了尚未合并的记录，合并后再压缩
+                    return
+                os.replace(tmp_path, self.path)
+                # 期间没有新记录时才清空日志；否则保留，加载时会跳过已写入快照的记录
+                if self.seq == seq:
+                    self._file.seek(0)
+                    self._file.truncate()
+                    self._journal_size = 0
+                self._synced = (self._disk_stamp(), None)
+        except OSError as e:
+            print(f"压缩日志出错: {e}")
+
+    def close(self):
+        """写入最终快照并关闭日志"""
+        self.compact()
+        self._file.close()
+
+    def add(self, text, status="todo", due_at=None):
+        row = super().add(text, status, due_at)
+        task = self._tasks[row]
+        if due_at is None:
+            self.append('add', id=task.id, text=text, status=status, at=task.done_at)
+        else:
+            self.append('add', id=task.id, text=text, status=status, at=task.done_at, due=due_at)
+        return row
+
+    def add_many(self, records):
+        self._touch()
+        added = self._tasks.add_many(records)
+        self.append('add_many', tasks=[task.to_dict() for task in added])
+        return [task.id for task in added]
+
+    def remove(self, row):
+        task = super().remove(row)
+        self.append('delete', id=task.id)
+        return task
+
+    def set_status(self, row, status):
+        task_id = self._tasks[row].id
+        target = super().set_status(row, status)
+        self.append('status', id=task_id, status=status, at=self._tasks[target].done_at)
+        return target
+
+    def set_order(self, row, order):
+        task_id = self._tasks[row].id
+        target = super().set_order(row, order)
+        self.append('order', id=task_id, order=order)
+        return target
+
+    def set_text(self, row, text):
+        super().set_text(row, text)
+        self.append('text', id=self._tasks[row].id, text=text)
+
+    def set_due(self, row, due_at):
+        super().set_due(row, due_at)
+        self.append('due', id=self._tasks[row].id, due=due_at)
+
+    def set_status_many(self, rows, status):
+        ids = [self._tasks[row].id for row in rows]
+        now = finish_time(status)  # 日志和内存中记录同一个完成时间
+        self._touch()
+        self._tasks.set_status_many(rows, status, now)
+        self.append('status_many', ids=ids, status=status, at=now)
+
+    def remove_many(self, rows):
+        removed = super().remove_many(rows)
+        self.append('delete_many', ids=[task.id for task in removed])
+        return removed
+
+    def reorder(self):
+        super().reorder()
+        self.append('reorder')
+
+    def clear(self):
+        super().clear()
+        self.append('clear')
+
+
+class BinaryTaskStore(JsonTaskStore):
+    """二进制快照：启动时只映射文件，显示和统计只解码用到的行
+
+    只查看时内存中只有映射；第一次修改时才把快照整体解码为 TaskList，
+    之后与 JSON 模式相同，保存时整体写回二进制快照。
+    """
+
+    def __init__(self, path, import_path=None):
+        super().__init__(path)
+        self.import_path = import_path
+        self._mapped = None
+        self._filter = None
+
+    def load(self):
+        """映射快照文件；首次使用时从 JSON 文件转换"""
+        self._unmap()
+        with self.lock:
+            if not os.path.exists(self.path) and self.import_path and os.path.exists(self.import_path):
+                seq, tasks = read_snapshot(self.import_path)
+                os.replace(write_binary_temp(self.path, TaskList(tasks).snapshot(), seq), self.path)
+            if os.path.exists(self.path):
+                self._mapped = self._tasks = BinarySnapshot(self.path)
+            else:
+                self._tasks = TaskList()
+            self._synced = (self._disk_stamp(), None)
+        self._tasks.set_filter(self._filter)
+        self._dirty = False
+
+    def iter_load(self, batch_size, first_batch_size=None):
+        # 映射文件几乎不耗时，不需要分批
+        self.load()
+        return iter(())
+
+    def _unmap(self):
+        if self._mapped is not None:
+            if self._tasks is self._mapped:
+                self._tasks = TaskList()  # 不再指向已关闭的映射
+            self._mapped.close()
+            self._mapped = None
+
+    def _materialize(self):
+        """修改前把映射的快照整体解码为 TaskList，并释放映射"""
+        if self._mapped is None:
+            return
+        tasks = list(self._mapped)
+        stamp, base = self._synced
+        if base is None:
+            # 内存与磁盘一致：解码结果直接作为合并基准，_touch 不必再遍历一遍
+            self._synced = (stamp, {task.id: _fields(task) for task in tasks})
+        self._tasks = TaskList.from_tasks(tasks)
+        self._tasks.set_filter(self._filter)
+        self._mapped.close()
+        self._mapped = None
+
+    def set_filter(self, predicate, matched=None):
+        self._filter = predicate  # 解码为 TaskList 后沿用
+        super().set_filter(predicate, matched)
+
+    def due_tasks(self):
+        if self._mapped is not None:
+            return self._mapped.due_tasks()  # 只扫描提醒时间列和状态列
+        return super().due_tasks()
+
+    def expired_tasks(self, cutoff):
+        if self._mapped is not None:
+            return self._mapped.expired_tasks(cutoff)  # 只扫描已结束分组的完成时间列
+        return super().expired_tasks(cutoff)
+
+    def _write_temp(self, tasks):
+        return write_binary_temp(self.path, tasks)
+
+    def _read_disk(self):
+        if not os.path.exists(self.path):
+            return {}
+        snapshot = BinarySnapshot(self.path)
+        try:
+            return {task.id: _fields(task) for task in snapshot}
+        finally:
+            snapshot.close()
+
+    def apply_change(self, task_id, task):
+        self._materialize()
+        super().apply_change(task_id, task)
+
+    def close(self):
+        self.save()
+        self._unmap()
+
+    def add(self, text, status="todo", due_at=None):
+        self._materialize()
+        return super().add(text, status, due_at)
+
+    def add_many(self, records):
+        self._materialize()
+        return super().add_many(records)
+
+    def remove(self, row):
+        self._materialize()
+        return super().remove(row)
+
+    def set_status(self, row, status):
+        self._materialize()
+        return super().set_status(row, status)
+
+    def set_order(self, row, order):
+        self._materialize()
+        return super().set_order(row, order)
+
+    def set_text(self, row, text):
+        self._materialize()
+        super().set_text(row, text)
+
+    def set_due(self, row, due_at):
+        self._materialize()
+        super().set_due(row, due_at)
+
+    def set_status_many(self, rows, status):
+        self._materialize()
+        super().set_status_many(rows, status)
+
+    def remove_many(self, rows):
+        self._materialize()
+        return super().remove_many(rows)
+
+    def reorder(self):
+        self._materialize()
+        super().reorder()
+
+    def clear(self):
+        self._materialize()
+        super().clear()
+
+
+_COLUMNS = "id, text, status, ord, done_at, due_at"
+_INSERT = "INSERT INTO tasks (id, text, status, finished, ord, done_at, due_at) VALUES (?, ?, ?, ?, ?, ?, ?)"
+
+
+def _task(row):
+    """把按 _COLUMNS 查询出的一行转换为任务记录"""
+    id_, text, status, order, done_at, due_at = row
+    return Task(text, status, order, id_, done_at, due_at)
+
+
+class SqliteTaskStore(TaskStore):
+    """SQLite 存储：按 (是否已结束, 顺序键, id) 建索引，只读取正在显示的行
+
+    内存中只按显示顺序保存各任务的顺序键和 id（每条 16 字节）：行号与 id 互查都是二分查找，
+    不必在数据库里计数；显示时按页读取，从该页第一行的键起沿索引查找，不用 OFFSET 逐行跳过。
+    """
+    PAGE_SIZE = 256
+    MAX_PAGES = 16
+    RELOAD_KEYS_THRESHOLD = 1000  # 批量修改超过此数量时重新读入键列，而不是逐个移动
+
+    def __init__(self, path, import_path=None):
+        self.path = path
+        self.import_path = import_path
+        self._conn = None
+        self._orders = array('d')  # 按显示顺序的顺序键，前 待办数 行为待办分组
+        self._ids = array('q')  # 与 _orders 逐行对应的 id
+        self._next_order = 0
+        self._next_id = 1  # 与 TaskList 一致：运行期间不复用已删除任务的 id
+        self._counts = TaskCounts()
+        self._pages = OrderedDict()  # 页号 -> 任务列表
+        self._index = None  # 数据库 id 的文本索引，第一次搜索时才建立
+        self._data_version = None  # 其他连接提交修改后会变化
+
+    def load(self):
+        """打开数据库；首次使用时从 JSON 文件导入"""
+        import sqlite3  # 导入较慢，只在使用该模式时导入，命令行工具可以更快启动
+        self._conn = sqlite3.connect(self.path)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            # 顺序键是浮点数（拖动排序取中点）；旧版声明为 INTEGER 的表中，小数键仍按 REAL 原样保存
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS tasks (
+                    id INTEGER PRIMARY KEY,
+                    text TEXT NOT NULL,
+                    status TEXT NOT NULL,
+                    finished INTEGER NOT NULL,
+                    ord REAL NOT NULL,
+                    done_at INTEGER,
+                    due_at INTEGER
+                )
+            """)
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(tasks)")]
+            if 'done_at' not in columns:  # 旧版数据库没有完成时间
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN done_at INTEGER")
+            if 'due_at' not in columns:  # 旧版数据库没有提醒时间
+                self._conn.execute("ALTER TABLE tasks ADD COLUMN due_at INTEGER")
+            # 顺序键可能在两个分组间重复，状态改变后并列，按 id 区分；旧版的索引没有 id 列
+            self._conn.execute("DROP INDEX IF EXISTS idx_tasks_order")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_order_id ON tasks (finished, ord, id)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)")
+            # user_version 标记是否已导入过，避免清空后再次导入
+            if self._conn.execute("PRAGMA user_version").fetchone()[0] == 0:
+                if self.import_path and os.path.exists(self.import_path):
+                    _, tasks = read_snapshot(self.import_path)
+                    self._conn.executemany(_INSERT, (
+                        (t.get('id'), t['text'], t['status'], t['status'] in FINISHED_STATUSES,
+                         t.get('order', i), t.get('done_at'), t.get('due_at'))
+                        for i, t in enumerate(tasks)))
+                self._conn.execute("PRAGMA user_version = 1")
+            # 没有完成时间的已结束任务从此刻开始计时
+            self._conn.execute("UPDATE tasks SET done_at = ? WHERE finished AND done_at IS NULL",
+                               (int(time.time()),))
+        self._reload_counts()
+
+    def _reload_counts(self):
+        """按数据库重新统计并读入键列（载入或其他程序修改后）"""
+        self._data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        counter = StatusCounter()
+        for status, n in self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status"):
+            counter.add(status, n)
+        self._next_order, self._next_id = self._conn.execute(
+            "SELECT COALESCE(MAX(ord), -1), COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()
+        self._next_order = next_order_after(self._next_order)
+        self._counts.reset(self._iter_tasks(), counter)
+        self._load_keys()
+        self._pages.clear()
+        self._index = None
+
+    def _load_keys(self):
+        """按显示顺序读入全部任务的顺序键和 id（只扫描索引，不读取文本）"""
+        self._orders, self._ids = array('d'), array('q')
+        cursor = self._conn.execute("SELECT ord, id FROM tasks ORDER BY finished, ord, id")
+        for rows in iter(lambda: cursor.fetchmany(1 << 16), []):
+            orders, ids = zip(*rows)
+            self._orders.extend(orders)
+            self._ids.extend(ids)
+
+    def _iter_tasks(self):
+        for row in self._conn.execute(f"SELECT {_COLUMNS} FROM tasks ORDER BY finished, ord, id"):
+            yield _task(row)
+
+    def save(self):
+        self._conn.commit()
+
+    def close(self):
+        self._conn.commit()
+        self._conn.close()
+
+    def watched_paths(self):
+        return [self.path, self.path + '-wal']
+
+    def sync(self, disk=None):
+        """数据库自带多进程并发控制；其他程序提交修改后重新统计，由界面整体刷新"""
+        if self._conn.execute("PRAGMA data_version").fetchone()[0] == self._data_version:
+            return []
+        self._reload_counts()
+        return None
+
+    def _claim_ids(self):
+        """新任务的 id 从数据库当前最大 id 之后开始，不与其他程序新建的任务冲突"""
+        self._next_id = max(self._next_id,
+                            self._conn.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM tasks").fetchone()[0])
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, row):
+        """返回指定行的任务，按页缓存"""
+        if not 0 <= row < len(self._ids):
+            raise IndexError(row)
+        page_no, offset = divmod(row, self.PAGE_SIZE)
+        page = self._pages.get(page_no)
+        if page is None:
+            start = page_no * self.PAGE_SIZE
+            # 从该页第一行的键起沿索引读取，不必像 OFFSET 那样逐行跳过前面的行
+            page = [_task(row) for row in self._conn.execute(
+                f"SELECT {_COLUMNS} FROM tasks WHERE (finished, ord, id) >= (?, ?, ?) "
+                "ORDER BY finished, ord, id LIMIT ?",
+                (start >= self._todo(), self._orders[start], self._ids[start], self.PAGE_SIZE))]
+            self._pages[page_no] = page
+            if len(self._pages) > self.MAX_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(page_no)
+        return page[offset]
+
+    def _task_at(self, row):
+        """修改前读取指定行的任务：在缓存的页中时直接取，否则按 id 只读这一条"""
+        if not 0 <= row < len(self._ids):
+            raise IndexError(row)
+        page = self._pages.get(row // self.PAGE_SIZE)
+        if page is not None:
+            return page[row % self.PAGE_SIZE]
+        return self.get(self._ids[row])
+
+    def _todo(self):
+        """待办任务数，即已结束分组的起始行号"""
+        return self._counts.counter['todo']
+
+    def _drop(self, row, task):
+        """从键列和计数中去掉该行的任务"""
+        del self._orders[row]
+        del self._ids[row]
+        self._counts.remove(task)
+
+    def _place(self, task):
+        """按任务的状态、顺序键和 id 把它加入键列和计数，返回所在行号"""
+        row = self.position(task.status, task.order, task.id)
+        self._orders.insert(row, task.order)
+        self._ids.insert(row, task.id)
+        self._counts.add(task)
+        return row
+
+    def _update_keys(self, removed, added=()):
+        """从键列和计数中去掉 removed 中的任务，再加入 added 中的任务（数据库已修改）；
+        数量多时不逐个移动，整体重新读入键列
+        """
+        if len(removed) + len(added) > self.RELOAD_KEYS_THRESHOLD:
+            for task in removed:
+                self._counts.remove(task)
+            for task in added:
+                self._counts.add(task)
+            self._load_keys()
+            return
+        for task in removed:
+            self._drop(self.position(task.status, task.order, task.id), task)
+        for task in added:
+            self._place(task)
+
+    def counts(self, filtered=False):
+        return self._counts.counts(filtered)
+
+    def set_filter(self, predicate, matched=None):
+        self._counts.set_filter(predicate, self._iter_tasks() if matched is None else matched)
+
+    def prepare_search(self, limit=None):
+        if self._index is None:
+            self._index = SearchIndex(self._iter_texts(), build=False)
+        return self._index.build(limit)
+
+    def _iter_texts(self):
+        """按 id 分页读取 (id, 文本)：分批建立索引期间还会修改数据库，不让一个游标跨越修改"""
+        last = 0
+        while True:
+            rows = self._conn.execute("SELECT id, text FROM tasks WHERE id > ? ORDER BY id LIMIT ?",
+                                      (last, self.PAGE_SIZE)).fetchall()
+            if not rows:
+                return
+            yield from rows
+            last = rows[-1][0]
+
+    def search(self, query):
+        self.prepare_search()
+        candidates, exact = self._index.candidates(query)
+        if not candidates:
+            return []
+        # 候选 id 写入临时表，由 (finished, ord, id) 索引排出显示顺序
+        with self._conn:
+            self._conn.execute("CREATE TEMP TABLE IF NOT EXISTS search_ids (id INTEGER PRIMARY KEY)")
+            self._conn.execute("DELETE FROM search_ids")
+            self._conn.executemany("INSERT INTO search_ids (id) VALUES (?)",
+                                   ((id_,) for id_ in candidates))
+        found = [_task(row) for row in self._conn.execute(
+            f"SELECT {_COLUMNS} FROM tasks WHERE id IN search_ids ORDER BY finished, ord, id")]
+        if exact:
+            return found
+        return [t for t in found if matches(query, t.text)]
+
+    def tasks(self):
+        return [t.to_dict() for t in self._iter_tasks()]
+
+    def iter_tasks(self):
+        return self._iter_tasks()
+
+    def snapshot(self):
+        return [t.to_dict(with_order=True) for t in self._iter_tasks()]
+
+    def due_tasks(self):
+        return self._conn.execute(
+            "SELECT id, due_at FROM tasks WHERE due_at IS NOT NULL AND NOT finished").fetchall()
+
+    def expired_tasks(self, cutoff):
+        return [_task(row) for row in self._conn.execute(
+            f"SELECT {_COLUMNS} FROM tasks WHERE finished AND done_at < ? ORDER BY ord, id", (cutoff,))]
+
+    def get(self, task_id):
+        row = self._conn.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (task_id,)).fetchone()
+        return None if row is None else _task(row)
+
+    def row_of(self, task_id):
+        task = self.get(task_id)
+        return None if task is None else self.position(task.status, task.order, task_id)
+
+    def position(self, status, order, task_id=None):
+        """具有该状态、顺序键和 id 的任务应处的行号（在键列的所在分组中二分查找）"""
+        todo = self._todo()
+        lo, hi = (todo, len(self._ids)) if status in FINISHED_STATUSES else (0, todo)
+        lo = bisect.bisect_left(self._orders, order, lo, hi)
+        if task_id is None:
+            return lo
+        # 顺序键相同的任务按 id 排列
+        return bisect.bisect_left(self._ids, task_id, lo, bisect.bisect_right(self._orders, order, lo, hi))
+
+    def add(self, text, status="todo", due_at=None):
+        self._claim_ids()
+        task = Task(text, status, self._next_order, self._next_id, finish_time(status), due_at)
+        self._next_order += 1
+        self._next_id += 1
+        with self._conn:
+            self._conn.execute(
+                _INSERT, (task.id, text, status, status in FINISHED_STATUSES, task.order, task.done_at, due_at))
+        if self._index is not None:
+            self._index.add(task.id, text)
+        self._pages.clear()
+        return self._place(task)
+
+    def add_many(self, records):
+        ids = []
+        todo, finished = (array('d'), array('q')), (array('d'), array('q'))  # 新任务的键
+
+        def rows():
+            # 边读边插入，不在内存中保留整批任务
+            for data in records:
+                task = Task(data['text'], data.get('status', "todo"), self._next_order, self._next_id,
+                            data.get('done_at'), data.get('due_at'))
+                if task.done_at is None:
+                    task.done_at = finish_time(task.status)
+                self._next_order += 1
+                self._next_id += 1
+                self._counts.add(task)
+                ids.append(task.id)
+                orders, task_ids = finished if task.status in FINISHED_STATUSES else todo
+                orders.append(task.order)
+                task_ids.append(task.id)
+                if self._index is not None:
+                    self._index.add(task.id, task.text)
+                yield (task.id, task.text, task.status, task.status in FINISHED_STATUSES, task.order,
+                       task.done_at, task.due_at)
+        self._claim_ids()
+        split = self._todo()
+        try:
+            with self._conn:
+                self._conn.executemany(_INSERT, rows())
+        except Exception:
+            self._reload_counts()  # 事务已回滚，计数、键列和索引按数据库重建
+            raise
+        # 新任务的顺序键大于已有任务，待办接在待办分组末尾，已结束的接在最后
+        self._orders[split:split] = todo[0]
+        self._ids[split:split] = todo[1]
+        self._orders.extend(finished[0])
+        self._ids.extend(finished[1])
+        self._pages.clear()
+        return ids
+
+    def remove(self, row):
+        task = self._task_at(row)
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks WHERE id = ?", (task.id,))
+        if self._index is not None:
+            self._index.remove(task.id)
+        self._drop(row, task)
+        self._pages.clear()
+        return task
+
+    def move_target(self, row, status):
+        task = self._task_at(row)
+        target = self.position(status, task.order, task.id)
+        return target - 1 if target > row else target
+
+    def set_status(self, row, status):
+        task = self._task_at(row)
+        done_at = done_time(task, status)
+        with self._conn:
+            self._conn.execute("UPDATE tasks SET status = ?, finished = ?, done_at = ? WHERE id = ?",
+                               (status, status in FINISHED_STATUSES, done_at, task.id))
+        self._drop(row, task)
+        self._pages.clear()
+        return self._place(Task(task.text, status, task.order, task.id, done_at, task.due_at))
+
+    def set_order(self, row, order):
+        task = self._task_at(row)
+        with self._conn:
+            self._conn.execute("UPDATE tasks SET ord = ? WHERE id = ?", (order, task.id))
+        self._next_order = max(self._next_order, next_order_after(order))
+        self._drop(row, task)
+        self._pages.clear()
+        return self._place(Task(task.text, task.status, order, task.id, task.done_at, task.due_at))
+
+    def set_text(self, row, text):
+        task = self._task_at(row)
+        with self._conn:
+            self._conn.execute("UPDATE tasks SET text = ? WHERE id = ?", (text, task.id))
+        self._counts.remove(task)
+        self._counts.add(Task(text, task.status, task.order, task.id, task.done_at, task.due_at))
+        if self._index is not None:
+            self._index.update(task.id, text)
+        self._pages.clear()
+
+    def set_due(self, row, due_at):
+        task = self._task_at(row)
+        with self._conn:
+            self._conn.execute("UPDATE tasks SET due_at = ? WHERE id = ?", (due_at, task.id))
+        self._pages.clear()
+
+    def set_status_many(self, rows, status):
+        items = [task for task in map(self._task_at, rows) if task.status != status]
+        done_at = finish_time(status)
+        with self._conn:
+            self._conn.executemany("UPDATE tasks SET status = ?, finished = ?, done_at = ? WHERE id = ?",
+                                   ((status, status in FINISHED_STATUSES, done_at, t.id) for t in items))
+        self._update_keys(items, [Task(t.text, status, t.order, t.id, done_at, t.due_at) for t in items])
+        self._pages.clear()
+
+    def remove_many(self, rows):
+        items = [self._task_at(row) for row in rows]
+        with self._conn:
+            self._conn.executemany("DELETE FROM tasks WHERE id = ?", ((t.id,) for t in items))
+        if self._index is not None:
+            for task in items:
+                self._index.remove(task.id)
+        self._update_keys(items)
+        self._pages.clear()
+        return items
+
+    def reorder(self):
+        with self._conn:
+            self._conn.execute("""
+                UPDATE tasks SET ord = ranked.n
+                FROM (SELECT id, ROW_NUMBER() OVER (ORDER BY finished, ord, id) - 1 AS n FROM tasks) AS ranked
+                WHERE tasks.id = ranked.id
+            """)
+        self._orders = array('d', range(len(self._ids)))
+        self._next_order = len(self._ids)
+        self._pages.clear()
+
+    def clear(self):
+        with self._conn:
+            self._conn.execute("DELETE FROM tasks")
+        self._reload_counts()
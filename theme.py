@@ -0,0 +1,218 @@
+"""应用主题：整个窗口共用一份样式表，任务行由委托按这里的颜色绘制"""
+from PySide6.QtCore import QPoint
+from PySide6.QtGui import QColor
+
+# 任务行颜色（TaskItemDelegate 绘制时使用）
+STATUS_COLORS = {
+    "todo": QColor(255, 255, 0, 51),
+    "complete": QColor(0, 255, 0, 51),
+    "cancel": QColor(255, 0, 0, 51),
+}
+CARD_COLOR = QColor(60, 60, 60, 178)
+CARD_HOVER_COLOR = QColor(70, 70, 70, 204)
+CARD_SELECTED_COLOR = QColor(70, 85, 110, 204)
+SELECTED_BORDER_COLOR = QColor(120, 170, 255, 200)
+BUTTON_HOVER_COLOR = QColor(255, 255, 255, 25)
+TEXT_COLOR = QColor(255, 255, 255)
+DUE_TEXT_COLOR = QColor(255, 255, 255, 160)
+DUE_ALERT_COLOR = QColor(255, 150, 60)  # 提醒已到期的待办：卡片边框和提醒时间
+FONT_FAMILY = "Microsoft YaHei"
+
+# 面板（标题栏、输入框、列表等）下方的阴影（glass.GlassBackground 绘制）
+PANEL_RADIUS = 10
+SHADOW_BLUR = 20
+SHADOW_COLOR = QColor(0, 0, 0, 100)
+SHADOW_OFFSET = QPoint(0, 5)
+
+# 窗口样式表：只在窗口上设置一次，控件通过 objectName 和动态属性匹配
+STYLESHEET = """
+#titleBar, #titleLeft {
+    background: rgba(60, 60, 60, 0.5);
+    border-radius: 10px;
+}
+#statsLabel {
+    background: transparent;
+    border: none;
+    color: white;
+    font-size: 14px;
+    font-family: "Microsoft YaHei";
+}
+#statsLabel[loading="true"] {
+    color: rgba(255, 255, 255, 0.6);
+}
+#toggleButton, #perfButton, #archiveButton {
+    background: transparent;
+    color: white;
+    font-size: 16px;
+    border: none;
+}
+#toggleButton:hover, #perfButton:hover, #archiveButton:hover {
+    background: rgba(100, 100, 100, 0.5);
+    border-radius: 15px;
+}
+#toggleButton:pressed, #perfButton:pressed, #archiveButton:pressed {
+    background: rgba(80, 80, 80, 0.7);
+}
+#closeButton {
+    background: transparent;
+    color: white;
+    font-size: 24px;
+    border: none;
+}
+#closeButton:hover {
+    background: rgba(255, 80, 80, 0.7);
+    border-radius: 15px;
+}
+#closeButton:pressed {
+    background: rgba(255, 50, 50, 0.9);
+}
+#inputField, #searchField {
+    background: rgba(50, 50, 50, 0.7);
+    border: 1px solid rgba(255, 255, 255, 0.3);
+    border-radius: 10px;
+    color: white;
+    padding: 10px 15px;
+    font-size: 16px;
+}
+#addButton, #clearButton {
+    border: none;
+    border-radius: 10px;
+    color: white;
+    font-size: 15px;
+}
+#addButton {
+    background: rgba(80, 160, 80, 0.7);
+}
+#addButton:hover {
+    background: rgba(100, 180, 100, 0.8);
+}
+#addButton:pressed {
+    background: rgba(60, 140, 60, 0.9);
+}
+#clearButton {
+    background: rgba(200, 60, 60, 0.7);
+}
+#clearButton:hover {
+    background: rgba(220, 70, 70, 0.8);
+}
+#clearButton:pressed {
+    background: rgba(180, 50, 50, 0.9);
+}
+#batchBar {
+    background: rgba(60, 60, 60, 0.5);
+    border-radius: 10px;
+}
+#batchLabel {
+    color: white;
+    font-size: 14px;
+}
+#batchBar QPushButton {
+    background: rgba(70, 70, 70, 0.7);
+    border: none;
+    border-radius: 8px;
+    color: white;
+    font-size: 13px;
+    padding: 6px 10px;
+}
+#batchBar QPushButton:hover {
+    background: rgba(90, 90, 90, 0.8);
+}
+#batchBar QPushButton:disabled {
+    color: rgba(255, 255, 255, 0.4);
+}
+#memoList {
+    background: rgba(40, 40, 40, 0.8);
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    border-radius: 12px;
+    color: white;
+    font-size: 16px;
+    padding: 10px;
+    selection-background-color: transparent;
+}
+#archiveList {
+    background: rgba(40, 40, 40, 0.8);
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    border-radius: 12px;
+    color: rgba(255, 255, 255, 0.75);
+    font-size: 14px;
+    padding: 10px;
+}
+#archiveList::item {
+    padding: 6px 4px;
+    border-bottom: 1px solid rgba(255, 255, 255, 0.08);
+}
+#reminderBanner {
+    background: rgba(255, 150, 60, 0.75);
+    border: none;
+    border-radius: 10px;
+    color: white;
+    font-size: 14px;
+    padding: 8px 12px;
+    text-align: left;
+}
+#reminderBanner:hover {
+    background: rgba(255, 165, 80, 0.85);
+}
+QMenu {
+    background: rgba(50, 50, 50, 0.95);
+    border: 1px solid rgba(255, 255, 255, 0.2);
+    color: white;
+    font-size: 14px;
+    padding: 4px;
+}
+QMenu::item {
+    padding: 6px 18px;
+    border-radius: 4px;
+}
+QMenu::item:selected {
+    background: rgba(90, 90, 90, 0.8);
+}
+#perfOverlay {
+    background: rgba(20, 20, 20, 0.85);
+    border-radius: 8px;
+    color: rgb(160, 255, 160);
+    font-family: Consolas, "Courier New", monospace;
+    font-size: 12px;
+    padding: 8px;
+}
+QMessageBox, QInputDialog {
+    background: rgba(50, 50, 50, 0.9);
+    border-radius: 10px;
+}
+QInputDialog QLineEdit {
+    background: rgba(70, 70, 70, 0.7);
+    border: 1px solid rgba(255, 255, 255, 0.3);
+    border-radius: 6px;
+    color: white;
+    padding: 6px;
+    font-size: 14px;
+}
+QMessageBox QLabel, QInputDialog QLabel {
+    color: white;
+    font-size: 14px;
+    padding: 10px;
+}
+QMessageBox QPushButton, QInputDialog QPushButton {
+    width: 60px;
+    padding: 8px 15px;
+    margin: 5px;
+    border-radius: 8px;
+    color: white;
+    font-size: 14px;
+    background: rgba(70, 70, 70, 0.7);
+    border: none;
+}
+QMessageBox QPushButton:hover, QInputDialog QPushButton:hover {
+    background: rgba(90, 90, 90, 0.8);
+}
+"""
+
+
+def set_style_property(widget, name, value):
+    """切换动态属性，只重新应用这一个控件的样式，不重新解析样式表"""
+    if widget.property(name) == value:
+        return
+    widget.setProperty(name, value)
+    style = widget.style()
+    style.unpolish(widget)
+    style.polish(widget)